@@ -0,0 +1,51 @@
+import logging
+import os
+
+from maxo import Bot, Dispatcher
+from maxo.enums import TextFormat
+from maxo.routing.updates import MessageCreated
+from maxo.routing.utils import collect_used_updates
+from maxo.transport.webhook.adapters.asgi import AsgiApp, AsgiWebAdapter
+from maxo.transport.webhook.engines import SimpleEngine, WebhookEngine
+from maxo.transport.webhook.routing import StaticRouting
+from maxo.transport.webhook.security import Security, StaticSecretToken
+from maxo.utils.facades import MessageCreatedFacade
+
+dp = Dispatcher()
+bot = Bot(os.environ["TOKEN"])
+
+
+@dp.message_created()
+async def echo_handler(message: MessageCreated, facade: MessageCreatedFacade) -> None:
+    await facade.answer_text(
+        text=message.message.body.html_text,
+        format=TextFormat.HTML,
+    )
+
+
+@dp.after_startup()
+async def on_startup(dispatcher: Dispatcher, webhook_engine: WebhookEngine) -> None:
+    await webhook_engine.set_webhook(update_types=collect_used_updates(dispatcher))
+
+
+def main() -> AsgiApp:
+    engine = SimpleEngine(
+        dp,
+        bot,
+        web_adapter=AsgiWebAdapter(),
+        # Укажите путь, по которому к вам будут приходить апдейты из Макса
+        routing=StaticRouting(url="https://example.com/webhook"),
+        # security можно оставить None, если не используете секретный токен
+        security=Security(secret_token=StaticSecretToken("pepapig")),
+    )
+    app = AsgiApp()
+    # engine.on_startup и engine.on_shutdown вызываются через ASGI lifespan
+    engine.register(app)
+    return app
+
+
+logging.basicConfig(level=logging.DEBUG)
+app = main()
+
+# TOKEN=f9LHod uvicorn examples.webhook_asgi:app
+# TOKEN=f9LHod granian --interface asgi examples.webhook_asgi:app
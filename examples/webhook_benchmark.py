@@ -0,0 +1,192 @@
+# ruff: noqa: PLC0415
+"""
+Сравнение накладных расходов вебхук-адаптеров.
+
+Запросы передаются в приложение напрямую, без сети и HTTP-парсера сервера,
+поэтому разница во времени - это стоимость маршрутизации, объектов запроса
+и сборки ответа в каждом адаптере.
+
+    python examples/webhook_benchmark.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest.mock import Mock
+
+from maxo import Bot, Dispatcher
+from maxo.routing.signals import BeforeStartup
+from maxo.routing.updates import MessageCreated
+from maxo.transport.webhook.adapters.base_adapter import WebAdapter
+from maxo.transport.webhook.engines import SimpleEngine
+from maxo.transport.webhook.routing import StaticRouting
+
+PATH = "/webhook"
+BODY = json.dumps(
+    {
+        "update_type": "message_created",
+        "timestamp": 1735689600000,
+        "message": {
+            "recipient": {"chat_id": 10, "chat_type": "chat"},
+            "sender": {
+                "user_id": 20,
+                "first_name": "Bench",
+                "is_bot": False,
+                "last_activity_time": 1735689600000,
+            },
+            "body": {"mid": "mid.1", "seq": 1, "text": "hello"},
+            "timestamp": 1735689600000,
+        },
+    },
+).encode()
+HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(BODY)).encode()),
+]
+
+Call = Callable[[], Awaitable[Any]]
+
+
+async def make_engine(web_adapter: WebAdapter) -> SimpleEngine:
+    dp = Dispatcher()
+
+    @dp.message_created()
+    async def handler(_: MessageCreated) -> None:
+        pass
+
+    await dp.feed_signal(BeforeStartup())
+    return SimpleEngine(
+        dp,
+        Bot("0:bench"),
+        web_adapter=web_adapter,
+        routing=StaticRouting(url=f"https://example.com{PATH}"),
+        handle_in_background=False,
+    )
+
+
+def asgi_call(app: Any) -> Call:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "https",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": HEADERS,
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 443),
+    }
+
+    async def send(_: dict[str, Any]) -> None:
+        pass
+
+    async def call() -> None:
+        async def receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": BODY, "more_body": False}
+
+        await app(dict(scope), receive, send)
+
+    return call
+
+
+async def setup_asgi() -> Call:
+    from maxo.transport.webhook.adapters.asgi import AsgiApp, AsgiWebAdapter
+
+    engine = await make_engine(AsgiWebAdapter())
+    app = AsgiApp()
+    engine.register(app)
+    return asgi_call(app)
+
+
+async def setup_fastapi() -> Call:
+    from fastapi import FastAPI
+
+    from maxo.transport.webhook.adapters.fastapi import FastApiWebAdapter
+
+    engine = await make_engine(FastApiWebAdapter())
+    app = FastAPI()
+    engine.register(app)
+    return asgi_call(app)
+
+
+async def setup_aiohttp() -> Call:
+    from aiohttp import web
+    from aiohttp.streams import StreamReader
+    from aiohttp.test_utils import make_mocked_request
+
+    from maxo.transport.webhook.adapters.aiohttp import AiohttpWebAdapter
+
+    engine = await make_engine(AiohttpWebAdapter())
+    app = web.Application()
+    engine.register(app)
+    loop = asyncio.get_running_loop()
+    headers = {name.decode(): value.decode() for name, value in HEADERS}
+
+    async def call() -> None:
+        payload = StreamReader(Mock(), 2**16, loop=loop)
+        payload.feed_data(BODY)
+        payload.feed_eof()
+        request = make_mocked_request(
+            "POST",
+            PATH,
+            headers=headers,
+            payload=payload,
+            app=app,
+        )
+        match_info = await app.router.resolve(request)
+        await match_info.handler(request)
+
+    return call
+
+
+SETUPS: dict[str, Callable[[], Awaitable[Call]]] = {
+    "asgi": setup_asgi,
+    "fastapi": setup_fastapi,
+    "aiohttp": setup_aiohttp,
+}
+
+
+async def measure(call: Call, requests: int) -> float:
+    for _ in range(min(requests, 1000)):
+        await call()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return time.perf_counter() - start
+
+
+async def main(requests: int, adapters: list[str]) -> None:
+    print(f"{'adapter':<10}{'us/request':>12}{'requests/s':>14}")
+    for name in adapters:
+        try:
+            call = await SETUPS[name]()
+        except ImportError as e:
+            print(f"{name:<10}  skipped: {e}")
+            continue
+
+        elapsed = await measure(call, requests)
+        print(
+            f"{name:<10}"
+            f"{elapsed / requests * 1_000_000:>12.1f}"
+            f"{requests / elapsed:>14.0f}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument(
+        "--adapters",
+        nargs="+",
+        choices=list(SETUPS),
+        default=list(SETUPS),
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.adapters))
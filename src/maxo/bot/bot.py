@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from typing import Any, BinaryIO, Self, TypeVar
 
 from adaptix import Retort
-from aiohttp import ClientTimeout
+from aiohttp import BaseConnector, ClientSession, ClientTimeout
 from unihttp.bind_method import bind_method
 from unihttp.middlewares import AsyncMiddleware
 
@@ -55,6 +55,7 @@ from maxo.bot.state import (
     RunningBotState,
 )
 from maxo.errors import MaxBotApiError
+from maxo.instrumentation.base import Instrumentation, Span, Stage
 from maxo.serialization import create_retort
 from maxo.types import AttachmentPayload, MaxoType
 
@@ -63,7 +64,9 @@ _MethodResultT = TypeVar("_MethodResultT", bound=MaxoType)
 
 class Bot:
     __slots__ = (
+        "_connector",
         "_defaults",
+        "_instrumentation",
         "_json_dumps",
         "_json_loads",
         "_middleware",
@@ -82,15 +85,32 @@ class Bot:
         middleware: list[AsyncMiddleware] | None = None,
         json_dumps: Callable[[Any], str] = json.dumps,
         json_loads: Callable[[str | bytes | bytearray], Any] = json.loads,
+        retort: Retort | None = None,
+        connector: BaseConnector | None = None,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
+        """
+        Клиент MAX Bot API.
+
+        :param retort: Готовый Retort, общий для нескольких ботов. Должен быть создан
+            через `create_retort` с теми же `defaults`.
+        :param connector: Общий aiohttp-коннектор. Бот не закрывает его при
+            остановке - за это отвечает владелец коннектора.
+        :param instrumentation: Шина измерений, в которую отправляется
+            длительность каждого вызова метода API.
+        """
         self._defaults = defaults or BotDefaults()
         self._token = token
         self._warming_up = warming_up
         self._middleware = middleware
         self._json_dumps = json_dumps
         self._json_loads = json_loads
+        self._connector = connector
+        self._instrumentation = instrumentation
 
-        self._retort = create_retort(defaults=self._defaults, warming_up=warming_up)
+        if retort is None:
+            retort = create_retort(defaults=self._defaults, warming_up=warming_up)
+        self._retort = retort
 
         self._state = EmptyBotState()
 
@@ -106,19 +126,32 @@ class Bot:
     def defaults(self) -> BotDefaults:
         return self._defaults
 
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self._instrumentation
+
     @property
     def token(self) -> str:
         return self._token
 
+    @property
+    def json_loads(self) -> Callable[[str | bytes | bytearray], Any]:
+        return self._json_loads
+
     async def start(self) -> None:
         if self.state.started:
             return
 
+        session = None
+        if self._connector is not None:
+            session = ClientSession(connector=self._connector, connector_owner=False)
+
         api_client = MaxApiClient(
             token=self._token,
             request_dumper=self._retort,
             response_loader=self._retort,
             middleware=self._middleware,
+            session=session,
             json_dumps=self._json_dumps,
             json_loads=self._json_loads,
         )
@@ -140,7 +173,27 @@ class Bot:
         self,
         method: MaxoMethod[_MethodResultT],
     ) -> _MethodResultT:
-        return await self.state.api_client.call_method(method)
+        if self._instrumentation is None:
+            return await self.state.api_client.call_method(method)
+
+        clock = self._instrumentation.clock
+        error = None
+        started_at = clock()
+        try:
+            return await self.state.api_client.call_method(method)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._instrumentation.emit(
+                Span(
+                    Stage.API_CALL,
+                    method.__class__.__name__,
+                    None,
+                    clock() - started_at,
+                    error,
+                ),
+            )
 
     async def silent_call_method(self, method: MaxoMethod[_MethodResultT]) -> None:
         try:
@@ -12,8 +12,9 @@ from maxo.errors.api import (
     RetvalReturnedServerException,
 )
 from maxo.errors.base import MaxoError
-from maxo.errors.routing import CycleRoutersError
+from maxo.errors.routing import CycleRoutersError, UnknownExecutorError
 from maxo.errors.types import AttributeIsEmptyError
+from maxo.errors.webhook import PayloadTooLargeError
 
 __all__ = (
     "AttributeIsEmptyError",
@@ -29,5 +30,7 @@ __all__ = (
     "MaxBotUnknownServerError",
     "MaxBotUnsupportedMediaTypeError",
     "MaxoError",
+    "PayloadTooLargeError",
     "RetvalReturnedServerException",
+    "UnknownExecutorError",
 )
@@ -31,3 +31,15 @@ class CycleRoutersError(MaxoError):
         details += "╰─<─╯"
 
         return details
+
+
+class UnknownExecutorError(MaxoError):
+    name: str
+    available: Sequence[str]
+
+    def __str__(self) -> str:
+        available = ", ".join(map(repr, self.available)) or "none"
+        return (
+            f"Executor {self.name!r} is not registered in the dispatcher. "
+            f"Available executors: {available}"
+        )
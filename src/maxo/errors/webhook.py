@@ -0,0 +1,9 @@
+from maxo.errors.base import MaxoError
+
+
+class PayloadTooLargeError(MaxoError):
+    size: int
+    max_size: int
+
+    def __str__(self) -> str:
+        return f"Request body is too large: {self.size} > {self.max_size} bytes"
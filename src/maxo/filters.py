@@ -26,6 +26,7 @@ from maxo.routing.filters.logic import (
     or_f,
 )
 from maxo.routing.filters.payload import Payload
+from maxo.routing.filters.pure import PureFilter, pure_f
 
 __all__ = (
     "AlwaysFalseFilter",
@@ -41,7 +42,9 @@ __all__ = (
     "InvertFilter",
     "OrFilter",
     "Payload",
+    "PureFilter",
     "and_f",
     "invert_f",
     "or_f",
+    "pure_f",
 )
@@ -0,0 +1,18 @@
+from maxo.instrumentation.base import Instrumentation, Span, SpanListener, Stage
+from maxo.instrumentation.histogram import Histogram
+from maxo.instrumentation.metrics import StageMetrics
+from maxo.instrumentation.prometheus import (
+    PROMETHEUS_CONTENT_TYPE,
+    render_prometheus,
+)
+
+__all__ = (
+    "PROMETHEUS_CONTENT_TYPE",
+    "Histogram",
+    "Instrumentation",
+    "Span",
+    "SpanListener",
+    "Stage",
+    "StageMetrics",
+    "render_prometheus",
+)
@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from enum import StrEnum
+from time import perf_counter
+from typing import NamedTuple
+
+from maxo import loggers
+
+
+class Stage(StrEnum):
+    """Этап обработки, длительность которого измеряется."""
+
+    UPDATE = "update"
+    OUTER_MIDDLEWARE = "outer_middleware"
+    INNER_MIDDLEWARE = "inner_middleware"
+    FILTER = "filter"
+    HANDLER = "handler"
+    API_CALL = "api_call"
+
+
+class Span(NamedTuple):
+    """
+    Измерение одного этапа обработки.
+
+    :param stage: Этап обработки.
+    :param name: Имя мидлвари, хендлера (фильтра хендлера), метода API
+        или тип апдейта для :attr:`Stage.UPDATE`.
+    :param router: Имя роутера, в котором выполнялся этап.
+    :param duration: Длительность в секундах. Для мидлварей - без времени
+        следующих за ними мидлварей и хендлеров.
+    :param error: Исключение, с которым завершился этап.
+    """
+
+    stage: Stage
+    name: str
+    router: str | None
+    duration: float
+    error: BaseException | None = None
+
+
+SpanListener = Callable[[Span], None]
+
+
+class Instrumentation:
+    """
+    Шина измерений диспетчера и бота.
+
+    Передаётся в ``Dispatcher(instrumentation=...)`` и ``Bot(instrumentation=...)``
+    и рассылает подписчикам :class:`Span` каждого этапа обработки. Подписчики
+    вызываются синхронно в event loop, поэтому должны быть быстрыми.
+
+    Без инструментации диспетчер не оборачивает мидлвари и хендлеры,
+    и обработка апдейтов не замедляется.
+    """
+
+    __slots__ = ("_listeners",)
+
+    clock = staticmethod(perf_counter)
+
+    def __init__(self, *listeners: SpanListener) -> None:
+        self._listeners: list[SpanListener] = list(listeners)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(listeners={self._listeners!r})"
+
+    @property
+    def listeners(self) -> tuple[SpanListener, ...]:
+        return tuple(self._listeners)
+
+    def subscribe(self, listener: SpanListener) -> SpanListener:
+        """Подписать слушателя на измерения. Можно использовать как декоратор."""
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: SpanListener) -> None:
+        self._listeners.remove(listener)
+
+    def emit(self, span: Span) -> None:
+        for listener in self._listeners:
+            try:
+                listener(span)
+            except Exception:  # noqa: BLE001
+                loggers.instrumentation.exception(
+                    "Instrumentation listener %r failed",
+                    listener,
+                )
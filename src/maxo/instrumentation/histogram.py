@@ -0,0 +1,137 @@
+from collections.abc import Iterable, Iterator
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с логарифмически-линейными корзинами, как в HDR.
+
+    Значения хранятся в целых микросекундах. Каждая степень двойки разбита
+    на ``2 ** (precision - 1)`` равных корзин, поэтому относительная
+    погрешность не больше ``2 ** (1 - precision)``, а запись значения -
+    это несколько битовых операций и инкремент в списке.
+
+    :param precision: Количество значащих бит корзины, от 2 до 10.
+    """
+
+    __slots__ = (
+        "_counts",
+        "_half",
+        "_max",
+        "_precision",
+        "_size",
+        "_sum",
+        "_total",
+    )
+
+    def __init__(self, precision: int = 4) -> None:
+        if not 2 <= precision <= 10:  # noqa: PLR2004
+            raise ValueError("`precision` should be between 2 and 10")
+
+        self._precision = precision
+        self._size = 1 << precision
+        self._half = self._size >> 1
+        self._counts: list[int] = [0] * self._size
+        self._total = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(count={self._total}, "
+            f"p50={self.percentile(50)}, "
+            f"p99={self.percentile(99)}, "
+            f"max={self._max})"
+        )
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    @property
+    def sum(self) -> float:
+        """Сумма записанных значений в секундах."""
+        return self._sum
+
+    @property
+    def max(self) -> float:
+        """Максимальное записанное значение в секундах."""
+        return self._max
+
+    def record(self, value: float) -> None:
+        """Записать длительность в секундах."""
+        micros = int(value * 1_000_000) if value > 0 else 0
+        if micros < self._size:
+            index = micros
+        else:
+            shift = micros.bit_length() - self._precision
+            index = (
+                self._size + (shift - 1) * self._half + (micros >> shift) - self._half
+            )
+
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+
+        self._total += 1
+        self._sum += value
+        if value > self._max:  # noqa: PLR1730
+            self._max = value
+
+    def percentile(self, percent: float) -> float:
+        """
+        Значение, не меньше которого ``percent`` процентов записей, в секундах.
+
+        Возвращается верхняя граница корзины, но не больше максимума.
+        """
+        if not self._total:
+            return 0.0
+
+        rank = max(1, round(self._total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper_bound(index) / 1_000_000, self._max)
+        return self._max
+
+    def cumulative(self, bounds: Iterable[float]) -> Iterator[tuple[float, int]]:
+        """
+        Количество значений, не больших каждой из границ в секундах.
+
+        Как и ``le`` в Prometheus, значение на самой границе учитывается.
+        Границы должны идти по возрастанию. Корзина, в которую попадает
+        граница, считается целиком, поэтому результат точен, если граница
+        меньше ``2 ** precision`` микросекунд или в её корзине нет значений
+        больше неё, а иначе - с погрешностью корзины.
+        """
+        counts = self._counts
+        index = 0
+        seen = 0
+        for bound in bounds:
+            stop = min(self._index(round(bound * 1_000_000)) + 1, len(counts))
+            while index < stop:
+                seen += counts[index]
+                index += 1
+            yield bound, seen
+
+    def reset(self) -> None:
+        self._counts = [0] * self._size
+        self._total = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def _index(self, value: int) -> int:
+        if value < self._size:
+            return value
+
+        shift = value.bit_length() - self._precision
+        return self._size + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self._size:
+            return index + 1
+
+        shift, sub = divmod(index - self._size, self._half)
+        return (self._half + sub + 1) << (shift + 1)
@@ -0,0 +1,54 @@
+from collections.abc import Mapping
+
+from maxo.instrumentation.base import Span, Stage
+from maxo.instrumentation.histogram import Histogram
+
+MetricKey = tuple[Stage, str | None, str]
+
+
+class StageMetrics:
+    """
+    Слушатель :class:`Instrumentation`, собирающий гистограммы длительностей.
+
+    Гистограммы ведутся отдельно для каждой тройки
+    ``(этап, роутер, имя)``, ошибки считаются по тем же ключам.
+
+    :param precision: Точность гистограмм, см. :class:`Histogram`.
+    """
+
+    __slots__ = ("_errors", "_histograms", "_precision")
+
+    def __init__(self, precision: int = 4) -> None:
+        self._precision = precision
+        self._histograms: dict[MetricKey, Histogram] = {}
+        self._errors: dict[MetricKey, int] = {}
+
+    def __call__(self, span: Span) -> None:
+        key: MetricKey = (span.stage, span.router, span.name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self._precision)
+        histogram.record(span.duration)
+
+        if span.error is not None:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    @property
+    def histograms(self) -> Mapping[MetricKey, Histogram]:
+        return self._histograms
+
+    @property
+    def errors(self) -> Mapping[MetricKey, int]:
+        return self._errors
+
+    def histogram(
+        self,
+        stage: Stage,
+        name: str,
+        router: str | None = None,
+    ) -> Histogram | None:
+        return self._histograms.get((stage, router, name))
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._errors.clear()
@@ -0,0 +1,62 @@
+from collections.abc import Sequence
+
+from maxo.instrumentation.metrics import MetricKey, StageMetrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Степени двойки микросекунд от 16 мкс до ~33 с: на этих границах
+# корзины гистограмм совпадают с корзинами Prometheus без погрешности
+DEFAULT_BOUNDS: tuple[float, ...] = tuple(2**i / 1_000_000 for i in range(4, 26))
+
+
+def render_prometheus(
+    metrics: StageMetrics,
+    *,
+    prefix: str = "maxo",
+    bounds: Sequence[float] = DEFAULT_BOUNDS,
+) -> str:
+    """
+    Отрисовать метрики в текстовом формате Prometheus.
+
+    Результат можно отдавать как есть с заголовком
+    ``Content-Type: PROMETHEUS_CONTENT_TYPE``.
+    """
+    duration = f"{prefix}_stage_duration_seconds"
+    errors = f"{prefix}_stage_errors_total"
+
+    lines = [
+        f"# HELP {duration} Duration of update processing stages.",
+        f"# TYPE {duration} histogram",
+    ]
+    for key, histogram in sorted(metrics.histograms.items(), key=_sort_key):
+        labels = _labels(key)
+        for bound, count in histogram.cumulative(bounds):
+            lines.append(f'{duration}_bucket{{{labels},le="{bound!r}"}} {count}')
+        lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{duration}_sum{{{labels}}} {histogram.sum!r}")
+        lines.append(f"{duration}_count{{{labels}}} {histogram.count}")
+
+    lines.append(f"# HELP {errors} Update processing stages failed with an error.")
+    lines.append(f"# TYPE {errors} counter")
+    for key, count in sorted(metrics.errors.items(), key=_sort_key):
+        lines.append(f"{errors}{{{_labels(key)}}} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _sort_key(item: tuple[MetricKey, object]) -> tuple[str, str, str]:
+    stage, router, name = item[0]
+    return stage, router or "", name
+
+
+def _labels(key: MetricKey) -> str:
+    stage, router, name = key
+    return (
+        f'stage="{_escape(stage)}",'
+        f'router="{_escape(router or "")}",'
+        f'name="{_escape(name)}"'
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
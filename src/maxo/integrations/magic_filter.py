@@ -1,5 +1,6 @@
 try:
     from magic_filter import AttrDict, MagicFilter as OriginMagicFilter
+    from magic_filter.operations import GetAttributeOperation, GetItemOperation
 except ImportError as e:
     e.add_note(" * Please run `pip install maxo[magic_filter]`")
     raise
@@ -12,7 +13,7 @@ from maxo.routing.filters.base import BaseFilter
 
 @final
 class MagicData(BaseFilter[Any]):
-    __slots__ = ("_magic_filter", "_result_key")
+    __slots__ = ("_ctx_keys", "_magic_filter", "_result_key")
 
     def __init__(
         self,
@@ -21,8 +22,11 @@ class MagicData(BaseFilter[Any]):
     ) -> None:
         self._magic_filter = magic_filter
         self._result_key = result_key
+        self._ctx_keys = _ctx_keys(magic_filter)
 
     async def __call__(self, update: Any, ctx: Ctx) -> bool:
+        if isinstance(ctx, Ctx):
+            await ctx.resolve(self._ctx_keys)
         result = self._magic_filter.resolve(AttrDict({"update": update, **ctx}))
         if not result:
             return False
@@ -35,7 +39,7 @@ class MagicData(BaseFilter[Any]):
 
 @final
 class MagicFilter(BaseFilter[Any]):
-    __slots__ = ("_magic_filter", "_result_key")
+    __slots__ = ("_magic_filter", "_result_key", "side_effect_free")
 
     def __init__(
         self,
@@ -44,6 +48,8 @@ class MagicFilter(BaseFilter[Any]):
     ) -> None:
         self._magic_filter = magic_filter
         self._result_key = result_key
+        # Без result_key фильтр не пишет в контекст
+        self.side_effect_free = result_key is None
 
     async def __call__(self, update: Any, ctx: Ctx) -> bool:
         result = self._magic_filter.resolve(update)
@@ -54,3 +60,39 @@ class MagicFilter(BaseFilter[Any]):
             ctx[self._result_key] = result
 
         return True
+
+
+def _ctx_keys(magic_filter: OriginMagicFilter) -> tuple[str, ...] | None:
+    """
+    Ключи контекста, которые читает фильтр.
+
+    ``None``, если фильтр обращается к контексту целиком.
+    """
+    keys: set[str] = set()
+    filters = [magic_filter]
+    while filters:
+        operations = filters.pop()._operations  # noqa: SLF001
+        if not operations:
+            return None
+
+        first = operations[0]
+        if isinstance(first, GetAttributeOperation):
+            keys.add(first.name)
+        elif isinstance(first, GetItemOperation) and isinstance(first.key, str):
+            keys.add(first.key)
+        else:
+            return None
+
+        # Вложенные фильтры сравнений и комбинаций вычисляются от корня,
+        # фильтры select/extract - от элементов, контекст им не виден
+        for operation in operations:
+            nested = [
+                getattr(operation, "right", None),
+                getattr(operation, "left", None),
+                *getattr(operation, "args", ()),
+                *getattr(operation, "kwargs", {}).values(),
+            ]
+            filters.extend(
+                value for value in nested if isinstance(value, OriginMagicFilter)
+            )
+    return tuple(sorted(keys))
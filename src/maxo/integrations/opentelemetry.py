@@ -0,0 +1,255 @@
+__all__ = (
+    "TracingApiMiddleware",
+    "TracingMiddleware",
+    "TracingStorage",
+    "setup_tracing",
+)
+
+import re
+from collections.abc import AsyncIterator, MutableMapping
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import cache
+from typing import Any
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Tracer
+except ImportError as e:
+    e.add_note(" * Please run `pip install maxo[opentelemetry]`")
+    raise
+
+from unihttp.http.request import HTTPRequest
+from unihttp.http.response import HTTPResponse
+from unihttp.middlewares.base import AsyncHandler, AsyncMiddleware
+
+from maxo.__meta__ import __version__
+from maxo.bot import methods
+from maxo.bot.methods.base import MaxoMethod
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.state import State
+from maxo.fsm.storages.base import BaseStorage
+from maxo.instrumentation.base import Instrumentation, Span, Stage
+from maxo.omit import is_defined
+from maxo.routing.ctx import Ctx
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.interfaces.middleware import BaseMiddleware, NextMiddleware
+from maxo.routing.middlewares.update_context import UPDATE_CONTEXT_KEY
+from maxo.routing.sentinels import UNHANDLED
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.types.update_context import UpdateContext
+
+# Запрос и номер попытки последнего вызова API в текущем контексте
+_last_attempt: ContextVar[tuple[HTTPRequest, int] | None] = ContextVar(
+    "maxo_last_api_attempt",
+    default=None,
+)
+
+
+def _get_tracer(tracer: Tracer | None) -> Tracer:
+    if tracer is None:
+        return trace.get_tracer("maxo", __version__)
+    return tracer
+
+
+def setup_tracing(dispatcher: Dispatcher, tracer: Tracer | None = None) -> None:
+    """
+    Включить трассировку апдейтов диспетчера.
+
+    Для каждого апдейта создаётся span с типом апдейта, чатом, пользователем
+    и именем сработавшего хендлера. Вызовы API и операции хранилища внутри
+    обработки становятся его дочерними span'ами, если бот и хранилище
+    используют :class:`TracingApiMiddleware` и :class:`TracingStorage`.
+    """
+    tracer = _get_tracer(tracer)
+    dispatcher.update.middleware.outer(TracingMiddleware(tracer))
+
+    # Имя хендлера известно только инструментации диспетчера
+    instrumentation = dispatcher.instrumentation
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+        dispatcher.instrument(instrumentation)
+    instrumentation.subscribe(_record_handler)
+
+
+def _record_handler(span: Span) -> None:
+    if span.stage is not Stage.HANDLER:
+        return
+
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attribute("maxo.handler", span.name)
+        if span.router is not None:
+            current.set_attribute("maxo.router", span.router)
+
+
+class TracingMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
+    """Outer-мидлварь диспетчера, открывающая span на обработку апдейта."""
+
+    __slots__ = ("_tracer",)
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        self._tracer = _get_tracer(tracer)
+
+    async def __call__(
+        self,
+        update: MaxoUpdate[Any],
+        ctx: Ctx,
+        next: NextMiddleware[MaxoUpdate[Any]],
+    ) -> Any:
+        update_type = update.update.__class__.__name__
+        attributes: dict[str, Any] = {"maxo.update.type": update_type}
+        if is_defined(update.marker) and update.marker is not None:
+            attributes["maxo.update.marker"] = update.marker
+
+        update_context = ctx.get(UPDATE_CONTEXT_KEY)
+        if isinstance(update_context, UpdateContext):
+            if update_context.chat_id is not None:
+                attributes["maxo.chat.id"] = update_context.chat_id
+            if update_context.user_id is not None:
+                attributes["maxo.user.id"] = update_context.user_id
+
+        with self._tracer.start_as_current_span(
+            f"update {update_type}",
+            kind=SpanKind.CONSUMER,
+            attributes=attributes,
+        ) as span:
+            result = await next(ctx)
+            span.set_attribute("maxo.handled", result is not UNHANDLED)
+            return result
+
+
+class TracingApiMiddleware(AsyncMiddleware):
+    """
+    Мидлварь unihttp, открывающая span на каждый запрос к Bot API.
+
+    Передаётся в ``Bot(middleware=[...])``. Чтобы в span'ах был номер повтора
+    (``http.request.resend_count``), её нужно поставить после мидлвари повторов.
+    """
+
+    __slots__ = ("_tracer",)
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        self._tracer = _get_tracer(tracer)
+
+    async def handle(
+        self,
+        request: HTTPRequest,
+        next_handler: AsyncHandler,
+    ) -> HTTPResponse:
+        # Мидлварь повторов передаёт дальше тот же объект запроса
+        last_attempt = _last_attempt.get()
+        attempt = 0
+        if last_attempt is not None and last_attempt[0] is request:
+            attempt = last_attempt[1] + 1
+        _last_attempt.set((request, attempt))
+
+        template, method_name = _resolve_method(request)
+        attributes: dict[str, Any] = {
+            "maxo.method": method_name,
+            "http.request.method": request.method.upper(),
+            "url.template": template,
+        }
+        if attempt:
+            attributes["http.request.resend_count"] = attempt
+
+        with self._tracer.start_as_current_span(
+            f"api {method_name}",
+            kind=SpanKind.CLIENT,
+            attributes=attributes,
+        ) as span:
+            response = await next_handler(request)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+
+@cache
+def _method_templates() -> dict[tuple[str, frozenset[str]], list[tuple[str, str]]]:
+    templates: dict[tuple[str, frozenset[str]], list[tuple[str, str]]] = {}
+    for name in methods.__all__:
+        method = getattr(methods, name)
+        if not isinstance(method, type) or not issubclass(method, MaxoMethod):
+            continue
+
+        url = method.__url__
+        key = (method.__method__.upper(), frozenset(re.findall(r"{(\w+)}", url)))
+        snake_name = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+        templates.setdefault(key, []).append((url, snake_name))
+    return templates
+
+
+def _resolve_method(request: HTTPRequest) -> tuple[str, str]:
+    """Шаблон URL и имя метода API (``send_message``) по запросу."""
+    key = (request.method.upper(), frozenset(request.path))
+    for template, name in _method_templates().get(key, ()):
+        if template.format(**request.path) == request.url:
+            return template, name
+    return request.url, request.method.upper()
+
+
+class TracingStorage(BaseStorage):
+    """Хранилище FSM, открывающее span на каждую операцию вложенного хранилища."""
+
+    __slots__ = ("_storage", "_tracer")
+
+    def __init__(self, storage: BaseStorage, tracer: Tracer | None = None) -> None:
+        self._storage = storage
+        self._tracer = _get_tracer(tracer)
+
+    @property
+    def storage(self) -> BaseStorage:
+        return self._storage
+
+    async def set_state(self, key: StorageKey, state: State | None = None) -> None:
+        async with self._span("set_state", key):
+            await self._storage.set_state(key, state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        async with self._span("get_state", key):
+            return await self._storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: MutableMapping[str, Any]) -> None:
+        async with self._span("set_data", key):
+            await self._storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> MutableMapping[str, Any]:
+        async with self._span("get_data", key):
+            return await self._storage.get_data(key)
+
+    async def get_value(
+        self,
+        storage_key: StorageKey,
+        value_key: str,
+        default: Any | None = None,
+    ) -> Any | None:
+        async with self._span("get_value", storage_key):
+            return await self._storage.get_value(storage_key, value_key, default)
+
+    async def update_data(
+        self,
+        key: StorageKey,
+        data: MutableMapping[str, Any],
+    ) -> MutableMapping[str, Any]:
+        async with self._span("update_data", key):
+            return await self._storage.update_data(key, data)
+
+    async def close(self) -> None:
+        await self._storage.close()
+
+    @asynccontextmanager
+    async def _span(self, operation: str, key: StorageKey) -> AsyncIterator[None]:
+        attributes: dict[str, Any] = {
+            "maxo.storage.operation": operation,
+            "maxo.storage.destiny": key.destiny,
+        }
+        if key.chat_id is not None:
+            attributes["maxo.chat.id"] = key.chat_id
+        if key.user_id is not None:
+            attributes["maxo.user.id"] = key.user_id
+
+        with self._tracer.start_as_current_span(
+            f"storage {operation}",
+            kind=SpanKind.CLIENT,
+            attributes=attributes,
+        ):
+            yield
@@ -2,8 +2,11 @@ from logging import getLogger
 
 dispatcher = getLogger("maxo.dispatcher")
 long_polling = getLogger("maxo.long_polling")
+webhook = getLogger("maxo.webhook")
+workers = getLogger("maxo.workers")
 update_context = getLogger("maxo.routing.update_context")
 utils = getLogger("maxo.utils")
 bot = getLogger("maxo.bot")
 bot_session = getLogger("maxo.bot.session")
 methods = getLogger("maxo.methods")
+instrumentation = getLogger("maxo.instrumentation")
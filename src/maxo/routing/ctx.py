@@ -1,4 +1,280 @@
-from collections.abc import MutableMapping
-from typing import Any, NewType
+# ruff: noqa: SLF001
 
-Ctx = NewType("Ctx", MutableMapping[str, Any])
+import inspect
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+from reprlib import recursive_repr
+from types import MappingProxyType
+from typing import Any, Self, cast
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class _LazyValue:
+    """Значение контекста, которое вычисляется при первом обращении."""
+
+    __slots__ = ("factory", "is_async", "ready", "value")
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self.factory: Callable[[], Any] | None = factory
+        self.is_async = inspect.iscoroutinefunction(factory)
+        self.ready = False
+        self.value: Any = None
+
+    @property
+    def pending(self) -> bool:
+        """Асинхронное значение, которое ещё не загружено через `Ctx.resolve`."""
+        return self.is_async and not self.ready
+
+    def get(self, key: str) -> Any:
+        if not self.ready:
+            # Незагруженное асинхронное значение ведёт себя как отсутствующий ключ
+            if self.is_async:
+                raise KeyError(key)
+            self._set(cast(Callable[[], Any], self.factory)())
+        return self.value
+
+    async def load(self) -> Any:
+        if not self.ready:
+            factory = cast(Callable[[], Any], self.factory)
+            value = factory()
+            if self.is_async:
+                value = await cast(Awaitable[Any], value)
+            # Пока ждали, значение могла загрузить другая копия контекста
+            if not self.ready:
+                self._set(value)
+        return self.value
+
+    def _set(self, value: Any) -> None:
+        self.value = value
+        self.ready = True
+        self.factory = None
+
+
+class Ctx(MutableMapping[str, Any]):
+    """
+    Контекст обработки апдейта.
+
+    Хранит изменения в своём слое поверх общей базы (обычно ``workflow_data``
+    диспетчера), которую никогда не изменяет. Поэтому создание контекста
+    и :meth:`copy` стоят столько, сколько ключей изменено, а не сколько
+    их всего.
+
+    Контекст поверх другого контекста и копии контекста разделяют с ним
+    :attr:`memo` и ленивые значения (:meth:`set_lazy`).
+    """
+
+    __slots__ = ("_base", "_data", "_deleted", "_lazy", "_memo")
+
+    def __init__(
+        self,
+        data: Mapping[str, Any] | None = None,
+        /,
+        *,
+        base: Mapping[str, Any] | None = None,
+    ) -> None:
+        self._data: dict[str, Any] = dict(data) if data else {}
+        self._base = _EMPTY if base is None else base
+        # Ключи базы, удалённые в этом слое
+        self._deleted: set[str] = set()
+        self._memo: dict[Any, Any] = base._memo if isinstance(base, Ctx) else {}
+        # Есть ли в слое ленивые значения
+        self._lazy = False
+
+    @property
+    def base(self) -> Mapping[str, Any]:
+        return self._base
+
+    @property
+    def memo(self) -> dict[Any, Any]:
+        """Служебный кэш на время обработки апдейта, не виден как ключи."""
+        return self._memo
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            if key in self._deleted:
+                raise
+            return self._base[key]
+
+        if self._lazy and type(value) is _LazyValue:
+            value = self._data[key] = value.get(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        if self._deleted:
+            self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        in_base = key in self._base and key not in self._deleted
+        if key in self._data:
+            del self._data[key]
+        elif not in_base:
+            raise KeyError(key)
+
+        if in_base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._data:
+            return not self._lazy or not _is_pending(self._data[key])  # type: ignore[index]
+        return key in self._base and key not in self._deleted
+
+    def __iter__(self) -> Iterator[str]:
+        if self._lazy:
+            yield from (
+                key for key, value in self._data.items() if not _is_pending(value)
+            )
+        else:
+            yield from self._data
+        for key in self._base:
+            if key not in self._data and key not in self._deleted:
+                yield key
+
+    def __len__(self) -> int:
+        size = len(self._data)
+        if self._lazy:
+            size -= sum(1 for value in self._data.values() if _is_pending(value))
+        return size + sum(
+            1
+            for key in self._base
+            if key not in self._data and key not in self._deleted
+        )
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self) -> "Ctx":
+        """Независимая копия, разделяющая с исходным контекстом базу."""
+        ctx = Ctx.__new__(Ctx)
+        ctx._data = self._data.copy()
+        ctx._base = self._base
+        ctx._deleted = self._deleted.copy()
+        ctx._memo = self._memo
+        ctx._lazy = self._lazy
+        return ctx
+
+    __copy__ = copy
+
+    def set_lazy(self, key: str, factory: Callable[[], Any]) -> None:
+        """
+        Записать значение, которое будет вычислено при первом обращении.
+
+        Синхронная ``factory`` вызывается при чтении ключа. Асинхронная -
+        в :meth:`resolve`, а до этого ключа в контексте как будто нет:
+        он не виден в итерации и ``in``, чтение вызывает :class:`KeyError`,
+        а :meth:`get` возвращает значение по умолчанию.
+        Значение вычисляется один раз для всех копий контекста.
+        """
+        self[key] = _LazyValue(factory)
+        self._lazy = True
+
+    async def resolve(self, keys: Iterable[str] | None = None) -> None:
+        """Загрузить асинхронные ленивые значения ``keys``, по умолчанию - все."""
+        if isinstance(self._base, Ctx):
+            await self._base.resolve(keys)
+        if not self._lazy:
+            return
+
+        data = self._data
+        for key in list(data) if keys is None else keys:
+            value = data.get(key)
+            if type(value) is _LazyValue:
+                data[key] = await value.load()
+
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        if isinstance(other, Ctx) and other._base is self._base:
+            self._merge(other)
+        else:
+            super().update(other)
+        if kwargs:
+            super().update(kwargs)
+
+    def _merge(self, other: "Ctx") -> None:
+        # То же, что `self[key] = other[key]` для каждого ключа `other`,
+        # но без обхода общей базы
+        base = self._base
+        other_data = other._data
+        other_deleted = other._deleted
+
+        for key in list(self._data):
+            if key in base and key not in other_data and key not in other_deleted:
+                del self._data[key]
+        if self._deleted:
+            self._deleted &= other_deleted
+        self._data.update(other_data)
+        self._deleted.difference_update(other_data)
+        self._lazy = self._lazy or other._lazy
+
+
+class WorkflowData(dict[str, Any]):
+    """
+    Общие данные диспетчера, поверх которых строится контекст апдейта.
+
+    Контекст видит снимок данных на момент начала обработки апдейта, как если бы
+    они копировались в каждый контекст. Снимок создаётся заново только после
+    изменения данных, поэтому между изменениями апдейты его разделяют.
+    """
+
+    __slots__ = ("_snapshot",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._snapshot: Mapping[str, Any] | None = None
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Неизменяемая копия текущих данных."""
+        if self._snapshot is None:
+            self._snapshot = MappingProxyType(dict(self))
+        return self._snapshot
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._snapshot = None
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._snapshot = None
+
+    def __ior__(self, other: Any) -> Self:  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        super().update(other, **kwargs)
+        self._snapshot = None
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._snapshot = None
+        return super().setdefault(key, default)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        self._snapshot = None
+        return super().pop(key, *args)
+
+    def popitem(self) -> tuple[str, Any]:
+        self._snapshot = None
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self._snapshot = None
+
+
+def _is_pending(value: Any) -> bool:
+    return type(value) is _LazyValue and value.pending
@@ -0,0 +1,15 @@
+# `RedisDeduplicator` in maxo.routing.deduplication.redis
+
+from maxo.routing.deduplication.base import (
+    BaseDeduplicator,
+    UpdateIdentity,
+    update_identity,
+)
+from maxo.routing.deduplication.memory import MemoryDeduplicator
+
+__all__ = (
+    "BaseDeduplicator",
+    "MemoryDeduplicator",
+    "UpdateIdentity",
+    "update_identity",
+)
@@ -0,0 +1,97 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from maxo.bot.bot import Bot
+from maxo.routing.middlewares.update_context import resolve_update_context
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.base import MaxUpdate
+from maxo.routing.updates.message_callback import MessageCallback
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.routing.updates.message_edited import MessageEdited
+from maxo.routing.updates.message_removed import MessageRemoved
+
+UpdateIdentity = Callable[[MaxUpdate], str | None]
+
+
+def update_identity(update: MaxUpdate) -> str | None:
+    """
+    Ключ апдейта по умолчанию: тип, id сообщения или колбэка и время апдейта.
+
+    Для апдейтов без сообщения вместо id используются `chat_id` и `user_id`.
+    """
+    match update:
+        case MessageCreated() | MessageEdited():
+            object_id = update.message.body.mid
+        case MessageCallback():
+            object_id = update.callback.callback_id
+        case MessageRemoved():
+            object_id = update.message_id
+        case _:
+            update_context = resolve_update_context(update)
+            object_id = f"{update_context.chat_id}:{update_context.user_id}"
+
+    timestamp = int(update.timestamp.timestamp() * 1000)
+    return f"{update.type}:{object_id}:{timestamp}"
+
+
+class BaseDeduplicator(ABC):
+    """
+    Отбрасывает повторно доставленные апдейты.
+
+    MAX повторяет доставку апдейта, если вебхук отвечает слишком долго,
+    и тогда хендлеры выполняются дважды. Дедупликатор запоминает ключи
+    уже принятых апдейтов и проверяет их до запуска мидлварей. Ключ апдейта,
+    обработка которого завершилась ошибкой или была прервана, забывается,
+    чтобы повторная доставка обработала его заново.
+
+    :param key: Функция, возвращающая ключ апдейта, None - не проверять апдейт.
+    """
+
+    __slots__ = ("_key",)
+
+    def __init__(self, key: UpdateIdentity = update_identity) -> None:
+        self._key = key
+
+    async def is_duplicate(self, update: MaxoUpdate[Any], bot: Bot | None) -> bool:
+        key = self._update_key(update, bot)
+        if key is None:
+            return False
+        return not await self.remember(key)
+
+    async def release(self, update: MaxoUpdate[Any], bot: Bot | None) -> None:
+        """Забыть ключ апдейта, который не удалось обработать."""
+        key = self._update_key(update, bot)
+        if key is not None:
+            await self.forget(key)
+
+    def _update_key(self, update: MaxoUpdate[Any], bot: Bot | None) -> str | None:
+        if not isinstance(update.update, MaxUpdate):
+            return None
+
+        key = self._key(update.update)
+        if key is None:
+            return None
+
+        # Один и тот же апдейт из группы приходит каждому боту в ней
+        if bot is not None:
+            key = f"{bot.state.info.user_id}:{key}"
+        return key
+
+    @abstractmethod
+    async def remember(self, key: str) -> bool:
+        """
+        Запомнить ключ апдейта.
+
+        :return: True, если ключ запомнен впервые.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def forget(self, key: str) -> None:
+        """Забыть ключ апдейта."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+
+from maxo.routing.deduplication.base import (
+    BaseDeduplicator,
+    UpdateIdentity,
+    update_identity,
+)
+
+
+class MemoryDeduplicator(BaseDeduplicator):
+    """
+    Дедупликатор в памяти процесса.
+
+    Хранит не больше `max_size` последних ключей и не дольше `ttl` секунд.
+
+    :param max_size: Размер окна - сколько последних ключей хранить.
+    :param ttl: Время хранения ключа в секундах.
+    """
+
+    __slots__ = ("_keys", "_max_size", "_ttl")
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 300.0,
+        key: UpdateIdentity = update_identity,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("`max_size` should be greater than 0")
+
+        super().__init__(key=key)
+        self._max_size = max_size
+        self._ttl = ttl
+        # Ключи упорядочены по времени добавления, а значит и по времени истечения
+        self._keys: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def remember(self, key: str) -> bool:
+        now = time.monotonic()
+        while self._keys:
+            oldest_key, expires_at = next(iter(self._keys.items()))
+            if expires_at > now:
+                break
+            del self._keys[oldest_key]
+
+        if key in self._keys:
+            return False
+
+        self._keys[key] = now + self._ttl
+        if len(self._keys) > self._max_size:
+            self._keys.popitem(last=False)
+        return True
+
+    async def forget(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+    async def close(self) -> None:
+        self._keys.clear()
@@ -0,0 +1,63 @@
+try:
+    from redis.asyncio import ConnectionPool, Redis
+except ImportError as e:
+    e.add_note("* Please run `pip install maxo[redis]`")
+    raise
+
+from typing import Any
+
+from maxo.routing.deduplication.base import (
+    BaseDeduplicator,
+    UpdateIdentity,
+    update_identity,
+)
+
+
+class RedisDeduplicator(BaseDeduplicator):
+    """
+    Дедупликатор в Redis для нескольких экземпляров приложения.
+
+    Ключ записывается атомарно через `SET NX EX`, поэтому апдейт будет обработан
+    только тем экземпляром, который принял его первым.
+
+    :param ttl: Время хранения ключа в секундах.
+    """
+
+    __slots__ = ("prefix", "redis", "ttl")
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = 300,
+        prefix: str = "maxo:dedup",
+        key: UpdateIdentity = update_identity,
+    ) -> None:
+        super().__init__(key=key)
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def build_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def remember(self, key: str) -> bool:
+        return bool(await self.redis.set(self.build_key(key), 1, nx=True, ex=self.ttl))
+
+    async def forget(self, key: str) -> None:
+        await self.redis.delete(self.build_key(key))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        connection_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> "RedisDeduplicator":
+        if connection_kwargs is None:
+            connection_kwargs = {}
+        pool = ConnectionPool.from_url(url, **connection_kwargs)
+        redis = Redis(connection_pool=pool)
+        return cls(redis=redis, **kwargs)
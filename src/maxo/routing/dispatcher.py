@@ -1,12 +1,16 @@
 import asyncio
-from collections.abc import MutableMapping
+import logging
+from collections.abc import Mapping, MutableMapping
 from typing import Any
 
 from maxo import Bot, loggers
 from maxo.fsm.key_builder import BaseKeyBuilder, DefaultKeyBuilder
 from maxo.fsm.storages.base import BaseEventIsolation, BaseStorage
 from maxo.fsm.storages.memory import MemoryStorage, SimpleEventIsolation
-from maxo.routing.ctx import Ctx
+from maxo.instrumentation.base import Instrumentation, Span, Stage
+from maxo.routing.ctx import Ctx, WorkflowData
+from maxo.routing.deduplication.base import BaseDeduplicator
+from maxo.routing.executors.base import BaseExecutor
 from maxo.routing.middlewares.error import ErrorMiddleware
 from maxo.routing.middlewares.fsm_context import FSMContextMiddleware
 from maxo.routing.middlewares.update_context import UpdateContextMiddleware
@@ -16,7 +20,9 @@ from maxo.routing.sentinels import UNHANDLED, SkipHandler
 from maxo.routing.signals.base import BaseSignal
 from maxo.routing.signals.update import MaxoUpdate
 from maxo.routing.updates.base import BaseUpdate
+from maxo.routing.utils._resolving_executors import resolve_executors
 from maxo.routing.utils._resolving_inner_middlewares import resolve_middlewares
+from maxo.routing.utils.dispatch_plan import build_dispatch_plan, format_dispatch_plan
 from maxo.routing.utils.validate_router_graph import validate_router_graph
 from maxo.utils.facades.middleware import FacadeMiddleware
 
@@ -33,10 +39,27 @@ class Dispatcher(Router):
         events_isolation: BaseEventIsolation | None = None,
         key_builder: BaseKeyBuilder | None = None,
         disable_fsm: bool = False,
+        lazy_state: bool = False,
+        # Deduplication of re-delivered updates
+        deduplicator: BaseDeduplicator | None = None,
+        # Executors of synchronous handlers
+        executor: BaseExecutor | str | None = None,
+        executors: Mapping[str, BaseExecutor] | None = None,
+        # Measurement of processing stages
+        instrumentation: Instrumentation | None = None,
     ) -> None:
-        super().__init__(self.__class__.__name__)
+        super().__init__(self.__class__.__name__, executor)
 
-        self.workflow_data = workflow_data or {}
+        self.deduplicator = deduplicator
+
+        # Исполнители по именам, "default" - для всех синхронных хендлеров
+        self.executors = dict(executors or {})
+        self._used_executors: set[BaseExecutor] = set()
+        self.after_shutdown.handler(self._close_executors)
+
+        self._instrumentation = instrumentation
+
+        self.workflow_data = workflow_data or {}  # type: ignore[assignment]
         self.workflow_data["dispatcher"] = self
         self.workflow_data["router"] = self
         self.workflow_data["dp"] = self
@@ -62,7 +85,7 @@ class Dispatcher(Router):
             # the event isolation is also disabled
             # Because the isolation mechanism is a part of the FS
             self.update.middleware.outer(
-                FSMContextMiddleware(storage, events_isolation),
+                FSMContextMiddleware(storage, events_isolation, lazy_state),
             )
 
         # Facade settings
@@ -73,14 +96,39 @@ class Dispatcher(Router):
         update: MaxoUpdate[Any],
         bot: Bot | None = None,
     ) -> Any:
+        remembered = False
+        if self.deduplicator is not None:
+            try:
+                duplicate = await self.deduplicator.is_duplicate(update, bot)
+            except Exception:  # noqa: BLE001
+                # Без дедупликации апдейт может обработаться дважды,
+                # но не теряется
+                loggers.dispatcher.exception(
+                    "Failed to check update for duplicate. Update type=%r marker=%r",
+                    update.update.__class__.__name__,
+                    update.marker,
+                )
+            else:
+                if duplicate:
+                    loggers.dispatcher.debug(
+                        "Duplicate update skipped. Update type=%r marker=%r",
+                        update.update.__class__.__name__,
+                        update.marker,
+                    )
+                    return UNHANDLED
+                remembered = True
+
         loop = asyncio.get_running_loop()
         start_time = loop.time()
 
         result = UNHANDLED
+        completed = False
         try:
             result = await self.feed_update(update, bot)
-        except Exception:  # noqa: BLE001
+            completed = True
+        except Exception as e:  # noqa: BLE001
             duration = (loop.time() - start_time) * 1000
+            self._emit_update_span(update, duration, e)
             loggers.dispatcher.exception(
                 "%s update failed. Update type=%r marker=%r. Duration %d ms",
                 "Handled" if result is not UNHANDLED else "Not handled",
@@ -90,6 +138,7 @@ class Dispatcher(Router):
             )
         else:
             duration = (loop.time() - start_time) * 1000
+            self._emit_update_span(update, duration)
             loggers.dispatcher.info(
                 "%s update completed %r. Update type=%r marker=%r. Duration %d ms",
                 "Handled" if result is not UNHANDLED else "Not handled",
@@ -98,18 +147,76 @@ class Dispatcher(Router):
                 update.marker,
                 duration,
             )
+        finally:
+            # Повторная доставка апдейта, который не обработан, не считается
+            # повтором
+            if remembered and not completed:
+                await self._release_update(update, bot)
         return result
 
+    async def _release_update(self, update: MaxoUpdate[Any], bot: Bot | None) -> None:
+        if self.deduplicator is None:
+            return
+        try:
+            await self.deduplicator.release(update, bot)
+        except Exception:  # noqa: BLE001
+            loggers.dispatcher.exception(
+                "Failed to forget update. Update type=%r marker=%r",
+                update.update.__class__.__name__,
+                update.marker,
+            )
+
+    def instrument(self, instrumentation: Instrumentation | None) -> None:
+        super().instrument(instrumentation)
+        # Хендлер диспетчера передаёт апдейт роутерам, его время - это время
+        # всей обработки, поэтому здесь измеряются только мидлвари
+        self.update.instrument(instrumentation, self.name, handlers=False)
+
+    def _emit_update_span(
+        self,
+        update: MaxoUpdate[Any],
+        duration: float,
+        error: BaseException | None = None,
+    ) -> None:
+        if self._instrumentation is None:
+            return
+
+        self._instrumentation.emit(
+            Span(
+                Stage.UPDATE,
+                update.update.__class__.__name__,
+                self.name,
+                duration / 1000,
+                error,
+            ),
+        )
+
+    @property
+    def workflow_data(self) -> WorkflowData:
+        """
+        Общие данные для всех апдейтов.
+
+        Апдейт видит данные на момент начала своей обработки: изменения
+        ``workflow_data`` видны только апдейтам, начатым после них.
+        """
+        return self._workflow_data
+
+    @workflow_data.setter
+    def workflow_data(self, workflow_data: Mapping[str, Any]) -> None:
+        if not isinstance(workflow_data, WorkflowData):
+            workflow_data = WorkflowData(workflow_data)
+        self._workflow_data = workflow_data
+
     async def feed_signal(self, signal: BaseSignal, bot: Bot | None = None) -> Any:
         return await self.feed_update(signal, bot)
 
     async def feed_update(self, update: BaseUpdate, bot: Bot | None = None) -> Any:
-        ctx = Ctx({**self.workflow_data, "bot": bot, "update": update})
+        ctx = Ctx({"bot": bot, "update": update}, base=self._workflow_data.snapshot())
         ctx["ctx"] = ctx
         return await self.trigger(ctx)
 
     async def _feed_update_handler(self, update: MaxoUpdate[Any], ctx: Ctx) -> Any:
-        ctx_copy = Ctx(dict(ctx))
+        ctx_copy = ctx.copy()
         ctx_copy["ctx"] = ctx_copy
         ctx_copy["update"] = update.update
 
@@ -122,5 +229,23 @@ class Dispatcher(Router):
     async def _emit_before_startup_handler(self) -> None:
         validate_router_graph(self)
         resolve_middlewares(self)
+        self._used_executors = resolve_executors(self, self.executors)
+        self.instrument(self._instrumentation)
+
+        plans = build_dispatch_plan(self)
+        for router, plan in plans.items():
+            if isinstance(router, Router):
+                router.dispatch_plan = plan
+        if loggers.dispatcher.isEnabledFor(logging.DEBUG):
+            loggers.dispatcher.debug(
+                "Dispatch plan:\n%s",
+                format_dispatch_plan(self, plans),
+            )
 
         await super()._emit_before_startup_handler()
+
+    async def _close_executors(self) -> None:
+        executors = {*self.executors.values(), *self._used_executors}
+        self._used_executors = set()
+        for executor in executors:
+            await executor.close()
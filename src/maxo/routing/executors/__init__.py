@@ -0,0 +1,11 @@
+from maxo.routing.executors.base import BaseExecutor
+from maxo.routing.executors.inline import InlineExecutor
+from maxo.routing.executors.process import ProcessExecutor
+from maxo.routing.executors.thread import ThreadExecutor
+
+__all__ = (
+    "BaseExecutor",
+    "InlineExecutor",
+    "ProcessExecutor",
+    "ThreadExecutor",
+)
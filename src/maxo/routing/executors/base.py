@@ -0,0 +1,158 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class BaseExecutor(ABC):
+    """
+    Исполнитель синхронных хендлеров.
+
+    Хендлер, объявленный обычной функцией, нельзя вызвать в event loop,
+    не остановив обработку остальных апдейтов, поэтому он выполняется
+    в исполнителе. Исполнитель ограничивает количество переданных ему вызовов
+    и ведёт счётчики, по которым видно, не стал ли он узким местом.
+
+    :param name: Имя исполнителя в логах и метриках.
+    :param max_pending: Сколько вызовов может одновременно выполняться
+        или ждать в очереди пула. Остальные ждут в :meth:`run`,
+        None - без ограничения.
+    """
+
+    __slots__ = (
+        "_active",
+        "_completed",
+        "_failed",
+        "_max_pending",
+        "_max_wait_time",
+        "_name",
+        "_slots",
+        "_total_run_time",
+        "_total_wait_time",
+        "_waiting",
+    )
+
+    def __init__(self, name: str, max_pending: int | None = None) -> None:
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("`max_pending` should be greater than 0")
+
+        self._name = name
+        self._max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_pending) if max_pending else None
+        self._active = 0
+        self._waiting = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._total_run_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(name={self._name!r}, "
+            f"active={self._active}, "
+            f"waiting={self._waiting}, "
+            f"max_pending={self._max_pending})"
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_pending(self) -> int | None:
+        return self._max_pending
+
+    @property
+    def active(self) -> int:
+        """Количество вызовов, переданных в пул и ещё не завершённых."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Количество вызовов, ждущих места из-за ограничения `max_pending`."""
+        return self._waiting
+
+    @property
+    def completed(self) -> int:
+        """Количество завершённых вызовов, включая завершившиеся ошибкой."""
+        return self._completed
+
+    @property
+    def failed(self) -> int:
+        """Количество вызовов, завершившихся ошибкой."""
+        return self._failed
+
+    @property
+    def wait_time(self) -> float:
+        """Среднее время ожидания места в секундах."""
+        if not self._completed:
+            return 0.0
+        return self._total_wait_time / self._completed
+
+    @property
+    def max_wait_time(self) -> float:
+        """Максимальное время ожидания места в секундах."""
+        return self._max_wait_time
+
+    @property
+    def run_time(self) -> float:
+        """Среднее время выполнения вызова в секундах, включая очередь пула."""
+        if not self._completed:
+            return 0.0
+        return self._total_run_time / self._completed
+
+    async def run(
+        self,
+        fn: Callable[..., _ReturnT],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> _ReturnT:
+        """Выполнить ``fn(*args, **kwargs)`` и вернуть результат."""
+        started_at = time.monotonic()
+        if self._slots is not None:
+            self._waiting += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self._waiting -= 1
+
+        submitted_at = time.monotonic()
+        wait_time = submitted_at - started_at
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+        self._active += 1
+        try:
+            return await self._run(fn, args, kwargs)
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._total_run_time += time.monotonic() - submitted_at
+            if self._slots is not None:
+                self._slots.release()
+
+    @abstractmethod
+    async def _run(
+        self,
+        fn: Callable[..., _ReturnT],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> _ReturnT:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        Дождаться завершения переданных вызовов и освободить ресурсы.
+
+        После закрытия исполнитель можно использовать снова.
+        """
+        return
@@ -0,0 +1,28 @@
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from maxo.routing.executors.base import BaseExecutor
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class InlineExecutor(BaseExecutor):
+    """
+    Вызов хендлера прямо в event loop.
+
+    Подходит для быстрых функций, которым не нужен отдельный поток:
+    пока такой хендлер выполняется, остальные апдейты не обрабатываются.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, name: str = "inline") -> None:
+        super().__init__(name=name)
+
+    async def _run(
+        self,
+        fn: Callable[..., _ReturnT],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> _ReturnT:
+        return fn(*args, **kwargs)
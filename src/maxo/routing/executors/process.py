@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import pickle
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from maxo.routing.executors.base import BaseExecutor
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class ProcessExecutor(BaseExecutor):
+    """
+    Пул процессов для хендлеров, нагружающих процессор.
+
+    Хендлер и его аргументы передаются в процесс через :mod:`pickle`, поэтому
+    хендлер должен быть функцией уровня модуля, а принимать он должен только
+    сериализуемые значения: апдейт, данные из фильтров, свои настройки.
+    Бот, фасады и FSM-контекст в процесс не передаются - хендлер, который их
+    запрашивает, завершится :class:`TypeError` ещё до отправки в пул.
+    Результат хендлера тоже должен быть сериализуемым.
+
+    :param name: Имя исполнителя.
+    :param workers: Количество процессов, по умолчанию - количество ядер.
+    :param max_pending: См. :class:`BaseExecutor`.
+    :param mp_context: Способ запуска процессов, см. :mod:`multiprocessing`.
+    """
+
+    __slots__ = ("_context", "_pool", "_workers")
+
+    def __init__(
+        self,
+        name: str = "maxo-processes",
+        workers: int | None = None,
+        max_pending: int | None = None,
+        mp_context: str = "spawn",
+    ) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        super().__init__(name=name, max_pending=max_pending)
+        self._workers = workers
+        self._context = multiprocessing.get_context(mp_context)
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def _run(
+        self,
+        fn: Callable[..., _ReturnT],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> _ReturnT:
+        payload = _dump_call(fn, args, kwargs)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=self._context,
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _run_call, payload)
+
+    async def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True)
+
+
+def _dump_call(
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> bytes:
+    try:
+        return pickle.dumps((fn, args, kwargs))
+    except Exception as e:
+        names = [
+            name
+            for name, value in (("handler", fn), *kwargs.items())
+            if not _is_picklable(value)
+        ]
+        names.extend(
+            f"args[{index}]"
+            for index, value in enumerate(args)
+            if not _is_picklable(value)
+        )
+        raise TypeError(
+            f"Can not send {fn!r} to a process, not picklable: {', '.join(names) or e}",
+        ) from e
+
+
+def _is_picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+def _run_call(payload: bytes) -> Any:
+    fn, args, kwargs = pickle.loads(payload)  # noqa: S301
+    return fn(*args, **kwargs)
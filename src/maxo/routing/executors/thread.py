@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from maxo.routing.executors.base import BaseExecutor
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class ThreadExecutor(BaseExecutor):
+    """
+    Собственный пул потоков.
+
+    В отличие от исполнителя по умолчанию (``asyncio.to_thread``), не делит
+    потоки с остальным кодом приложения, поэтому медленные хендлеры одного
+    пула не задерживают хендлеры другого.
+
+    :param name: Имя исполнителя, им же называются потоки.
+    :param workers: Количество потоков.
+    :param max_pending: См. :class:`BaseExecutor`.
+    """
+
+    __slots__ = ("_pool", "_workers")
+
+    def __init__(
+        self,
+        name: str = "maxo-threads",
+        workers: int = 4,
+        max_pending: int | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        super().__init__(name=name, max_pending=max_pending)
+        self._workers = workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    async def _run(
+        self,
+        fn: Callable[..., _ReturnT],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> _ReturnT:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._workers,
+                thread_name_prefix=self.name,
+            )
+
+        # Как и asyncio.to_thread, переносим contextvars в поток
+        context = contextvars.copy_context()
+        call = partial(context.run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+
+    async def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True)
@@ -7,6 +7,7 @@ from .deeplink import DeeplinkFilter
 from .exception import ExceptionMessageFilter, ExceptionTypeFilter
 from .logic import AndFilter, InvertFilter, OrFilter, and_f, invert_f, or_f
 from .payload import Payload
+from .pure import PureFilter, pure_f
 
 __all__ = (
     "AlwaysFalseFilter",
@@ -22,7 +23,9 @@ __all__ = (
     "InvertFilter",
     "OrFilter",
     "Payload",
+    "PureFilter",
     "and_f",
     "invert_f",
     "or_f",
+    "pure_f",
 )
@@ -7,6 +7,9 @@ from maxo.routing.filters.base import BaseFilter
 class _AlwaysBooleanFilter(BaseFilter[Any]):
     _boolean: ClassVar[bool]
 
+    side_effect_free = True
+    cost = 0.0
+
     async def __call__(self, update: Any, ctx: Ctx) -> bool:
         return self._boolean
 
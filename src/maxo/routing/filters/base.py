@@ -11,6 +11,13 @@ _UpdateT = TypeVar("_UpdateT", bound=BaseUpdate)
 class BaseFilter(ABC, Filter[_UpdateT], Generic[_UpdateT]):
     __slots__ = ()
 
+    # Ориентировочное время проверки в микросекундах, None - неизвестно.
+    # По нему AndFilter и OrFilter выбирают порядок проверки
+    cost: float | None = None
+    # Фильтр читает только апдейт и не читает и не пишет контекст, поэтому
+    # AndFilter и OrFilter могут проверять его в любом порядке
+    side_effect_free: bool = False
+
     def __and__(self, other: "Filter[_UpdateT] | Any") -> "Filter[_UpdateT]":
         if not isinstance(other, Filter):
             return NotImplemented
@@ -39,6 +39,11 @@ from maxo.types.bot_command import BotCommand
 
 CommandPatternType = str | re.Pattern | BotCommand
 
+# Ключ `Ctx.memo`, под которым хранится разобранная, но ещё не проверенная
+# команда. Текст апдейта разбирается один раз, сколько бы фильтров Command
+# его ни проверяли, а в аргументы хендлеров команда не попадает.
+_RAW_COMMAND = object()
+
 
 class CommandException(Exception):
     pass
@@ -65,8 +70,49 @@ class CommandObject(MaxoType):
         return line
 
 
+def get_command_text(update: MessageCreated) -> str | None:
+    message = update.message
+    return (message.body and message.body.text) or (
+        message.link and message.link.message.text
+    )
+
+
+def extract_command(text: str) -> CommandObject:
+    try:
+        full_command, *args = text.split(maxsplit=1)
+    except ValueError as e:
+        raise CommandException("not enough values to unpack") from e
+
+    prefix, (command, _, mention) = full_command[0], full_command[1:].partition("@")
+    return CommandObject(
+        prefix=prefix,
+        command=command,
+        mention=mention or None,
+        args=args[0] if args else None,
+    )
+
+
+def extract_command_cached(text: str, ctx: Ctx) -> CommandObject:
+    """Разобрать команду, переиспользуя результат из :attr:`Ctx.memo`."""
+    key = (_RAW_COMMAND, text)
+    memo = ctx.memo
+    command = memo.get(key)
+    if command is None:
+        command = memo[key] = extract_command(text)
+    return cast(CommandObject, command)
+
+
 class Command(BaseFilter[MessageCreated]):
-    __slots__ = ("commands", "ignore_case", "ignore_mention", "magic", "prefix")
+    __slots__ = (
+        "_indexable",
+        "commands",
+        "ignore_case",
+        "ignore_mention",
+        "magic",
+        "prefix",
+    )
+
+    cost = 1.0
 
     def __init__(
         self,
@@ -108,6 +154,14 @@ class Command(BaseFilter[MessageCreated]):
         self.ignore_case = ignore_case
         self.ignore_mention = ignore_mention
 
+        cls = type(self)
+        self._indexable = (
+            cls.__call__ is Command.__call__
+            and cls.parse_command is Command.parse_command
+            and cls.extract_command is Command.extract_command
+            and cls.validate_command is Command.validate_command
+        )
+
     def __str__(self) -> str:
         return self._signature_to_string(
             *self.commands,
@@ -124,33 +178,40 @@ class Command(BaseFilter[MessageCreated]):
         if not isinstance(message, MessageCreated):
             return False
 
-        text = (message.message.body and message.message.body.text) or (
-            message.message.link and message.message.link.message.text
-        )
+        text = get_command_text(message)
         if not text:
             return False
 
         try:
-            command = await self.parse_command(text=text, bot=ctx["bot"])
+            if self._indexable:
+                command = await self._validate(
+                    extract_command_cached(text, ctx),
+                    bot=ctx["bot"],
+                )
+            else:
+                command = await self.parse_command(text=text, bot=ctx["bot"])
         except CommandException:
             return False
 
         ctx["command"] = command
         return True
 
+    @property
+    def index_keys(self) -> tuple[str, ...] | None:
+        """
+        Имена команд в нижнем регистре для индекса хендлеров.
+
+        ``None``, если фильтр нельзя индексировать: среди команд есть регулярные
+        выражения или проверка переопределена в наследнике.
+        """
+        if not self._indexable:
+            return None
+        if not all(isinstance(command, str) for command in self.commands):
+            return None
+        return tuple(cast(str, command).casefold() for command in self.commands)
+
     def extract_command(self, text: str) -> CommandObject:
-        try:
-            full_command, *args = text.split(maxsplit=1)
-        except ValueError as e:
-            raise CommandException("not enough values to unpack") from e
-
-        prefix, (command, _, mention) = full_command[0], full_command[1:].partition("@")
-        return CommandObject(
-            prefix=prefix,
-            command=command,
-            mention=mention or None,
-            args=args[0] if args else None,
-        )
+        return extract_command(text)
 
     def validate_prefix(self, command: CommandObject) -> None:
         if command.prefix not in self.prefix:
@@ -178,7 +239,9 @@ class Command(BaseFilter[MessageCreated]):
         raise CommandException("Command did not match pattern")
 
     async def parse_command(self, text: str, bot: Bot) -> CommandObject:
-        command = self.extract_command(text)
+        return await self._validate(self.extract_command(text), bot=bot)
+
+    async def _validate(self, command: CommandObject, bot: Bot) -> CommandObject:
         self.validate_prefix(command=command)
         await self.validate_mention(bot=bot, command=command)
         return self.validate_command(command)
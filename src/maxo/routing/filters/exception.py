@@ -20,6 +20,9 @@ class ExceptionTypeFilter(
 
     __slots__ = ("_handler",)
 
+    side_effect_free = True
+    cost = 1.0
+
     def __init__(self, *errors: type[_ExceptionT], use_subclass: bool = True) -> None:
         if use_subclass:
             self._handler = lambda e: isinstance(e, errors)
@@ -36,6 +39,8 @@ class ExceptionMessageFilter(
 ):
     __slots__ = ("_pattern",)
 
+    cost = 1.0
+
     def __init__(self, pattern: str | re.Pattern[str]) -> None:
         if isinstance(pattern, str):
             pattern = re.compile(pattern)
@@ -1,9 +1,10 @@
 # ruff: noqa: SLF001
 
 from abc import abstractmethod
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from copy import copy
-from typing import Generic, TypeVar, final
+from time import perf_counter
+from typing import Any, ClassVar, Generic, TypeVar, cast, final
 
 from maxo.routing.ctx import Ctx
 from maxo.routing.filters.base import BaseFilter
@@ -38,71 +39,162 @@ class BaseLogicFilter(BaseFilter[_UpdateT], Generic[_UpdateT]):
         raise NotImplementedError
 
 
-@final
-class AndFilter(BaseLogicFilter[_UpdateT], Generic[_UpdateT]):
-    _filters: Sequence[Filter[_UpdateT]]
+# Раз в сколько проверок AndFilter и OrFilter пересматривают порядок фильтров
+_REORDER_EVERY = 64
+# Вес нового замера в скользящих средних времени и доли пропущенных апдейтов
+_SMOOTHING = 0.1
+# Нижняя граница вероятности, что фильтр прервёт проверку
+_MIN_STOP_RATE = 0.01
 
-    def __init__(self, *filters: Filter[_UpdateT]) -> None:
-        self._filters = filters
-        super().__init__()
 
-    async def _reduce(self, update: _UpdateT, ctx: Ctx) -> bool:
-        for filter_ in self._filters:
-            loop_copied_ctx = copy(ctx)
+class _FilterStats:
+    """Замеры фильтра внутри AndFilter или OrFilter."""
 
-            filter_result = await filter_(update, loop_copied_ctx)
-            if not filter_result:
-                return False
+    __slots__ = ("calls", "cost", "filter", "pass_rate")
 
-            ctx.update(loop_copied_ctx)
+    def __init__(self, filter_: Filter[Any]) -> None:
+        self.filter = filter_
+        self.calls = 0
+        # Среднее время проверки в микросекундах, None - ещё не замерено
+        self.cost: float | None = None
+        self.pass_rate = 0.5
 
-        return True
-
-    def _inlining(self) -> None:
-        inlined_filters: list[Filter[_UpdateT]] = []
+    def record(self, elapsed: float, result: bool) -> None:
+        elapsed *= 1_000_000
+        self.calls += 1
+        if self.cost is None:
+            self.cost = elapsed
+        else:
+            self.cost += (elapsed - self.cost) * _SMOOTHING
+        self.pass_rate += (result - self.pass_rate) * _SMOOTHING
 
-        for filter in self._filters:
-            if isinstance(filter, AndFilter):
-                inlined_filters.extend(filter._filters)
-            else:
-                inlined_filters.append(filter)
 
-        self._filters = inlined_filters
+class _ChainLogicFilter(BaseLogicFilter[_UpdateT], Generic[_UpdateT]):
+    """
+    Последовательная проверка фильтров до первого результата `_stop_on`.
 
+    Соседние фильтры, которые не читают и не пишут контекст
+    (``side_effect_free``), проверяются в порядке стоимости: если у всех них
+    есть ``cost``, порядок задаётся один раз по нему, иначе - по замерам
+    времени и того, как часто фильтр прерывает проверку. Остальные фильтры
+    остаются на своих местах, чтобы фильтр, читающий ключ контекста,
+    всегда проверялся после фильтра, который его записывает.
+    """
 
-@final
-class OrFilter(BaseLogicFilter[_UpdateT], Generic[_UpdateT]):
     _filters: Sequence[Filter[_UpdateT]]
+    _stop_on: ClassVar[bool]
 
-    def __init__(
-        self,
-        *filters: Filter[_UpdateT],
-    ) -> None:
+    def __init__(self, *filters: Filter[_UpdateT]) -> None:
         self._filters = filters
         super().__init__()
 
+        self.side_effect_free = all(
+            getattr(filter_, "side_effect_free", False) for filter_ in self._filters
+        )
+        costs = [getattr(filter_, "cost", None) for filter_ in self._filters]
+        self.cost = None if None in costs else sum(costs)
+
+        self._entries = tuple(_FilterStats(filter_) for filter_ in self._filters)
+        self._groups = self._reorderable_groups()
+        self._adaptive = any(
+            costs[index] is None
+            for start, stop in self._groups
+            for index in range(start, stop)
+        )
+        self._calls = 0
+        self._order = self._entries
+        if self._groups and not self._adaptive:
+            self._order = self._sorted_order(self._static_rank)
+
+    @property
+    def filters(self) -> Sequence[Filter[_UpdateT]]:
+        """Фильтры в порядке объявления."""
+        return self._filters
+
+    @property
+    def order(self) -> Sequence[Filter[_UpdateT]]:
+        """Фильтры в порядке, в котором они сейчас проверяются."""
+        return tuple(entry.filter for entry in self._order)
+
     async def _reduce(self, update: _UpdateT, ctx: Ctx) -> bool:
-        for filter_ in self._filters:
+        stop_on = self._stop_on
+        adaptive = self._adaptive
+        if adaptive:
+            self._calls += 1
+            if self._calls % _REORDER_EVERY == 0:
+                self._order = self._sorted_order(self._measured_rank)
+
+        for entry in self._order:
             loop_copied_ctx = copy(ctx)
 
-            filter_result = await filter_(update, loop_copied_ctx)
+            if adaptive:
+                started_at = perf_counter()
+                filter_result = await entry.filter(update, loop_copied_ctx)
+                entry.record(perf_counter() - started_at, bool(filter_result))
+            else:
+                filter_result = await entry.filter(update, loop_copied_ctx)
+
             if filter_result:
                 ctx.update(loop_copied_ctx)
-                return True
+            if bool(filter_result) is stop_on:
+                return stop_on
 
-        return False
+        return not stop_on
 
     def _inlining(self) -> None:
         inlined_filters: list[Filter[_UpdateT]] = []
 
         for filter in self._filters:
-            if isinstance(filter, OrFilter):
+            if type(filter) is type(self):
                 inlined_filters.extend(filter._filters)
             else:
                 inlined_filters.append(filter)
 
         self._filters = inlined_filters
 
+    def _reorderable_groups(self) -> list[tuple[int, int]]:
+        groups: list[tuple[int, int]] = []
+        start = None
+        for index, filter_ in enumerate((*self._filters, None)):
+            if filter_ is not None and getattr(filter_, "side_effect_free", False):
+                if start is None:
+                    start = index
+                continue
+            if start is not None and index - start > 1:
+                groups.append((start, index))
+            start = None
+        return groups
+
+    def _sorted_order(
+        self,
+        rank: Callable[[_FilterStats], float],
+    ) -> tuple[_FilterStats, ...]:
+        order = list(self._entries)
+        for start, stop in self._groups:
+            order[start:stop] = sorted(order[start:stop], key=rank)
+        return tuple(order)
+
+    def _static_rank(self, entry: _FilterStats) -> float:
+        return cast(float, getattr(entry.filter, "cost", None))
+
+    def _measured_rank(self, entry: _FilterStats) -> float:
+        cost = getattr(entry.filter, "cost", None)
+        if cost is None:
+            # Незамеренный фильтр считаем бесплатным, чтобы он получил замеры
+            cost = entry.cost or 0.0
+        stop_rate = entry.pass_rate if self._stop_on else 1 - entry.pass_rate
+        return cost / max(stop_rate, _MIN_STOP_RATE)
+
+
+@final
+class AndFilter(_ChainLogicFilter[_UpdateT], Generic[_UpdateT]):
+    _stop_on = False
+
+
+@final
+class OrFilter(_ChainLogicFilter[_UpdateT], Generic[_UpdateT]):
+    _stop_on = True
+
 
 @final
 class InvertFilter(BaseLogicFilter[_UpdateT], Generic[_UpdateT]):
@@ -115,6 +207,9 @@ class InvertFilter(BaseLogicFilter[_UpdateT], Generic[_UpdateT]):
         self._filter = filter_
         super().__init__()
 
+        self.side_effect_free = getattr(self._filter, "side_effect_free", False)
+        self.cost = getattr(self._filter, "cost", None)
+
     async def _reduce(self, update: _UpdateT, ctx: Ctx) -> bool:
         filter_result = await self._filter(update, ctx)
         if self._inlined:
@@ -28,9 +28,11 @@ OR OTHER DEALINGS IN THE SOFTWARE.
 import dataclasses
 import types
 import typing
+from collections.abc import Callable
 from decimal import Decimal
 from enum import Enum
 from fractions import Fraction
+from functools import partial
 from typing import Any, ClassVar, Self, TypeVar, get_args, get_origin
 from uuid import UUID
 
@@ -55,6 +57,7 @@ class PayloadException(Exception):
 class Payload(MaxoType, slots=False):
     __separator__: ClassVar[str]
     __prefix__: ClassVar[str]
+    __codec__: ClassVar["_PayloadCodec"]
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         if (
@@ -100,10 +103,36 @@ class Payload(MaxoType, slots=False):
         )
         raise ValueError(msg)
 
+    @classmethod
+    def codec(cls) -> "_PayloadCodec":
+        """
+        Скомпилированные для класса поля и декодеры.
+
+        Собираются при первом использовании: в ``__init_subclass__`` класс
+        ещё не превращён в dataclass и полей у него нет.
+        """
+        codec = cls.__dict__.get("__codec__")
+        if codec is None:
+            fields = dataclasses.fields(cls)
+            compiled = (
+                getattr(cls._decode_value, "__func__", None)
+                is Payload._decode_value.__func__  # type: ignore[attr-defined]
+            )
+            codec = cls.__codec__ = _PayloadCodec(
+                fields=fields,
+                decoders=tuple(
+                    _compile_decoder(field, partial(cls._decode_value, field))
+                    if compiled
+                    else partial(cls._decode_value, field)
+                    for field in fields
+                ),
+            )
+        return codec
+
     def pack(self) -> str:
         result = [self.__prefix__]
-        for key, value in dataclasses.asdict(self).items():
-            encoded = self._encode_value(key, value)
+        for key in self.codec().names:
+            encoded = self._encode_value(key, getattr(self, key))
             if self.__separator__ in encoded:
                 msg = (
                     f"Separator symbol {self.__separator__!r} can not be used "
@@ -161,22 +190,27 @@ class Payload(MaxoType, slots=False):
     @classmethod
     def unpack(cls, value: str) -> Self:
         prefix, *parts = value.split(cls.__separator__)
-        fields = dataclasses.fields(cls)
+        codec = cls.codec()
 
         if prefix != cls.__prefix__:
             msg = f"Bad prefix ({prefix!r} != {cls.__prefix__!r})"
             raise ValueError(msg)
-        if len(parts) != len(fields):
+        if len(parts) != len(codec.fields):
             msg = (
-                f"Callback data {cls.__name__!r} takes {len(fields)} arguments "
-                f"but {len(parts)} were given"
+                f"Callback data {cls.__name__!r} takes {len(codec.fields)} "
+                f"arguments but {len(parts)} were given"
             )
             raise TypeError(msg)
 
         payload = {}
-        for field, raw in zip(fields, parts, strict=True):
+        for field, decoder, raw in zip(
+            codec.fields,
+            codec.decoders,
+            parts,
+            strict=True,
+        ):
             try:
-                decoded = cls._decode_value(field, raw)
+                decoded = decoder(raw)
             except Exception as e:
                 raise ValueError(
                     f"Cannot decode {field.name}={raw!r} to {field.type}",
@@ -207,6 +241,7 @@ class MessageCallbackFilter(BaseFilter[MessageCallback]):
     ) -> None:
         self.payload = payload
         self.filter = filter
+        payload.codec()
 
     def __str__(self) -> str:
         return self._signature_to_string(
@@ -214,6 +249,22 @@ class MessageCallbackFilter(BaseFilter[MessageCallback]):
             filter=self.filter,
         )
 
+    @property
+    def index_keys(self) -> tuple[tuple[str, str], ...] | None:
+        """
+        Разделитель и префикс payload для индекса хендлеров.
+
+        ``None``, если проверка переопределена в наследнике фильтра
+        или разбор - в классе payload.
+        """
+        if (
+            type(self).__call__ is not MessageCallbackFilter.__call__
+            or getattr(self.payload.unpack, "__func__", None)
+            is not Payload.unpack.__func__  # type: ignore[attr-defined]
+        ):
+            return None
+        return ((self.payload.__separator__, self.payload.__prefix__),)
+
     async def __call__(
         self,
         update: MessageCallback,
@@ -241,6 +292,71 @@ class MessageCallbackFilter(BaseFilter[MessageCallback]):
         return result
 
 
+class _PayloadCodec:
+    __slots__ = ("decoders", "fields", "names")
+
+    def __init__(
+        self,
+        fields: tuple[dataclasses.Field, ...],
+        decoders: tuple[Callable[[str], Any], ...],
+    ) -> None:
+        self.fields = fields
+        self.names = tuple(field.name for field in fields)
+        self.decoders = decoders
+
+
+def _compile_decoder(
+    field: dataclasses.Field,
+    fallback: Callable[[str], Any],
+) -> Callable[[str], Any]:
+    field_type = field.type
+    origin = get_origin(field_type)
+    args = get_args(field_type)
+
+    if origin in _UNION_TYPES and type(None) in args:
+        non_none_types = [t for t in args if t is not type(None)]
+        field_type = non_none_types[0] if len(non_none_types) == 1 else str
+
+    convert: Callable[[str], Any]
+    if field_type is bool:
+        convert = "1".__eq__
+    elif field_type is UUID:
+        convert = _decode_uuid
+    elif field_type in (int, float, Decimal, Fraction) or (
+        isinstance(field_type, type) and issubclass(field_type, Enum)
+    ):
+        convert = field_type
+    elif isinstance(field_type, type):
+        convert = str
+    else:
+        # Строковые аннотации и generic-типы разбирает медленный путь
+        return fallback
+
+    if not _check_field_is_nullable(field):
+
+        def decode(raw: str) -> Any:
+            if raw == "":
+                raise ValueError(f"Empty value for non-nullable field {field.name}")
+            return convert(raw)
+
+    else:
+
+        def decode(raw: str) -> Any:
+            if raw == "":
+                if field.default is not dataclasses.MISSING:
+                    return field.default
+                if field.default_factory is not dataclasses.MISSING:
+                    return field.default_factory()
+                return None
+            return convert(raw)
+
+    return decode
+
+
+def _decode_uuid(raw: str) -> UUID:
+    return UUID(hex=raw)
+
+
 def _check_field_is_nullable(field: dataclasses.Field) -> bool:
     if (
         field.default is not dataclasses.MISSING
@@ -0,0 +1,71 @@
+# ruff: noqa: SLF001
+
+from typing import Generic, TypeVar, final
+
+from maxo.routing.ctx import Ctx
+from maxo.routing.filters.base import BaseFilter
+from maxo.routing.interfaces.filter import Filter
+from maxo.routing.updates.base import BaseUpdate
+
+_UpdateT = TypeVar("_UpdateT", bound=BaseUpdate)
+
+
+@final
+class PureFilter(BaseFilter[_UpdateT], Generic[_UpdateT]):
+    """
+    Фильтр, результат которого зависит только от апдейта и контекста.
+
+    Обёрнутый фильтр выполняется не больше одного раза на апдейт: повторные
+    проверки, например в других хендлерах или роутерах, возвращают
+    сохранённый результат и повторяют изменения контекста, которые
+    фильтр сделал при первом вызове. Результат хранится в :attr:`Ctx.memo`
+    по объекту фильтра, поэтому один экземпляр нужно использовать
+    во всех местах, где он проверяется.
+
+    :param cost: Ориентировочное время проверки в микросекундах, задаёт
+        место фильтра в ``AndFilter`` и ``OrFilter`` без замеров.
+    """
+
+    __slots__ = ("_filter", "_key", "cost", "side_effect_free")
+
+    def __init__(
+        self,
+        filter_: Filter[_UpdateT],
+        cost: float | None = None,
+    ) -> None:
+        if isinstance(filter_, PureFilter):
+            if cost is None:
+                cost = filter_.cost
+            filter_ = filter_._filter
+
+        self._filter = filter_
+        self._key = (PureFilter, id(filter_))
+        self.cost = getattr(filter_, "cost", None) if cost is None else cost
+        self.side_effect_free = getattr(filter_, "side_effect_free", False)
+
+    def __str__(self) -> str:
+        return self._signature_to_string(self._filter, cost=self.cost)
+
+    @property
+    def filter(self) -> Filter[_UpdateT]:
+        return self._filter
+
+    async def __call__(self, update: _UpdateT, ctx: Ctx) -> bool:
+        memo = ctx.memo
+        cached = memo.get(self._key)
+        if cached is not None and cached[0] is update:
+            _, result, data, deleted = cached
+        else:
+            layer = Ctx(base=ctx)
+            result = await self._filter(update, layer)
+            data, deleted = layer._data, layer._deleted
+            memo[self._key] = (update, result, data, deleted)
+
+        if data:
+            ctx.update(data)
+        for key in deleted:
+            ctx.pop(key, None)
+        return result
+
+
+pure_f = PureFilter
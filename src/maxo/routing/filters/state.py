@@ -8,25 +8,70 @@ from maxo.routing.middlewares.fsm_context import RAW_STATE_KEY
 
 
 class StateFilter(BaseFilter[Any]):
-    __slots__ = ("_states",)
+    __slots__ = ("_any", "_raw_states", "_states")
+
+    cost = 1.0
 
     def __init__(
         self,
         *states: State | StatesGroup | type[StatesGroup] | None | str,
     ) -> None:
         self._states = states
+        # Рассчитываются при первой проверке, когда все группы состояний
+        # уже вложены в родительские и знают полные имена состояний
+        self._any = False
+        self._raw_states: frozenset[str | None] | None = None
+
+    def __str__(self) -> str:
+        return self._signature_to_string(*self._states)
+
+    @property
+    def raw_states(self) -> frozenset[str | None] | None:
+        """
+        Значения ``raw_state``, на которые срабатывает фильтр.
+
+        ``None``, если фильтр срабатывает на любое состояние.
+        """
+        if self._raw_states is None:
+            self._compile()
+        if self._any:
+            return None
+        return self._raw_states
+
+    @property
+    def index_keys(self) -> tuple[str | None, ...] | None:
+        """Состояния для индекса хендлеров, ``None`` - фильтр нельзя индексировать."""
+        if type(self).__call__ is not StateFilter.__call__:
+            return None
+
+        raw_states = self.raw_states
+        if raw_states is None:
+            return None
+        return tuple(raw_states)
 
     async def __call__(self, update: Any, ctx: Ctx) -> bool:
-        raw_state = ctx.get(RAW_STATE_KEY)
+        if self._raw_states is None:
+            self._compile()
+        if self._any:
+            return True
+
+        if isinstance(ctx, Ctx):
+            await ctx.resolve((RAW_STATE_KEY,))
+        return ctx.get(RAW_STATE_KEY) in self._raw_states  # type: ignore[operator]
+
+    def _compile(self) -> None:
+        raw_states: set[str | None] = set()
 
         for state in self._states:
-            if (isinstance(state, str) or state is None) and (
-                state in (any_state, raw_state)
-            ):
-                return True
-            if isinstance(state, State) and raw_state == state:
-                return True
-            if isclass(state) and issubclass(state, StatesGroup) and raw_state in state:
-                return True
-
-        return False
+            if isinstance(state, str) or state is None:
+                if state == any_state:
+                    self._any = True
+                raw_states.add(state)
+            elif isinstance(state, State):
+                # Состояние без имени не совпадает ни с одним `raw_state`
+                if state.state is not None:
+                    raw_states.add(state.state)
+            elif isclass(state) and issubclass(state, StatesGroup):
+                raw_states.update(state.__all_states_names__)
+
+        self._raw_states = frozenset(raw_states)
@@ -1,9 +1,9 @@
 import asyncio
 import inspect
-from functools import partial
 from typing import Any, Generic, Protocol, TypeVar, runtime_checkable
 
 from maxo.routing.ctx import Ctx
+from maxo.routing.executors.base import BaseExecutor
 from maxo.routing.filters.always import AlwaysTrueFilter
 from maxo.routing.interfaces.filter import Filter
 from maxo.routing.interfaces.handler import Handler
@@ -30,27 +30,35 @@ class UpdateHandler(
 ):
     __slots__ = (
         "_awaitable",
+        "_bound_executor",
         "_filter",
         "_handler_fn",
         "_params",
         "_varkw",
+        "executor",
     )
 
     def __init__(
         self,
         handler_fn: UpdateHandlerFn[_UpdateT, _ReturnT_co],
         filter: Filter[_UpdateT] | None = None,
+        executor: BaseExecutor | str | None = None,
     ) -> None:
         if filter is None:
             filter = AlwaysTrueFilter()
 
         self._filter = filter
+        # Исполнитель синхронного хендлера или его имя в `Dispatcher.executors`.
+        # None - исполнитель роутера, а если его нет - asyncio.to_thread
+        self.executor = executor
+        self._bound_executor: BaseExecutor | None = None
         self._handler_fn = handler_fn
         self._awaitable = inspect.isawaitable(
             handler_fn,
         ) or inspect.iscoroutinefunction(handler_fn)
         spec = inspect.getfullargspec(handler_fn)
-        self._params = {*spec.args, *spec.kwonlyargs}
+        # update передаётся первым позиционным аргументом
+        self._params = {*spec.args, *spec.kwonlyargs} - {"update"}
         self._varkw = spec.varkw is not None
 
     def __repr__(self) -> str:
@@ -59,9 +67,27 @@ class UpdateHandler(
             f"(handler_fn={self._handler_fn}, filter={self._filter})"
         )
 
+    @property
+    def filter(self) -> Filter[_UpdateT]:
+        return self._filter
+
+    @property
+    def awaitable(self) -> bool:
+        return self._awaitable
+
+    @property
+    def bound_executor(self) -> BaseExecutor | None:
+        return self._bound_executor
+
+    def bind_executor(self, executor: BaseExecutor | None) -> None:
+        """Задать исполнитель, выбранный диспетчером при запуске."""
+        self._bound_executor = executor
+
     def _prepare_kwargs(self, ctx: Ctx) -> dict[str, Any]:
         if self._varkw:
-            return dict(ctx)
+            kwargs = dict(ctx)
+            kwargs.pop("update", None)
+            return kwargs
 
         return {k: ctx[k] for k in self._params if k in ctx}
 
@@ -69,10 +95,14 @@ class UpdateHandler(
         return await self._filter(ctx["update"], ctx)
 
     async def __call__(self, ctx: Ctx) -> _ReturnT_co:
-        # потому что update это первый аргумент в хендлерах
-        update = ctx.pop("update")
-        wrapped = partial(self._handler_fn, update, **self._prepare_kwargs(ctx))
-        ctx["update"] = update
+        # Ленивые значения, которые хендлер запрашивает, загружаются заранее
+        if isinstance(ctx, Ctx):
+            await ctx.resolve(None if self._varkw else self._params)
+        update, kwargs = ctx["update"], self._prepare_kwargs(ctx)
         if self._awaitable:
-            return await wrapped()
-        return await asyncio.to_thread(wrapped)
+            return await self._handler_fn(update, **kwargs)
+
+        executor = self._bound_executor
+        if executor is None:
+            return await asyncio.to_thread(self._handler_fn, update, **kwargs)
+        return await executor.run(self._handler_fn, update, **kwargs)
@@ -41,6 +41,11 @@ class Observer(Protocol[_UpdateT, _HandlerT, _HandlerFnT]):
     def handlers(self) -> Sequence[_HandlerT]:
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def has_filter(self) -> bool:
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def middleware(self) -> MiddlewareManagerFacade[_UpdateT]:
@@ -65,6 +70,14 @@ class Observer(Protocol[_UpdateT, _HandlerT, _HandlerFnT]):
     def filter(self, filter: Filter[_UpdateT]) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def compile_middlewares(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset_middlewares(self) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def execute_filter(self, ctx: Ctx) -> bool:
         raise NotImplementedError
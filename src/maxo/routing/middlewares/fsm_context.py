@@ -16,15 +16,17 @@ RAW_STATE_KEY = "raw_state"
 
 
 class FSMContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
-    __slots__ = ("_events_isolation", "_storage")
+    __slots__ = ("_events_isolation", "_lazy_state", "_storage")
 
     def __init__(
         self,
         storage: BaseStorage,
         events_isolation: BaseEventIsolation,
+        lazy_state: bool = False,
     ) -> None:
         self._storage = storage
         self._events_isolation = events_isolation
+        self._lazy_state = lazy_state
 
     async def __call__(
         self,
@@ -45,7 +47,11 @@ class FSMContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
             fsm_context = FSMContext(key=storage_key, storage=self._storage)
             ctx[FSM_CONTEXT_KEY] = fsm_context
             ctx[FSM_CONTEXT_STATE_KEY] = fsm_context
-            ctx[RAW_STATE_KEY] = await fsm_context.get_state()
+            if self._lazy_state:
+                # Хранилище запрашивается, только если состояние кому-то нужно
+                ctx.set_lazy(RAW_STATE_KEY, fsm_context.get_state)
+            else:
+                ctx[RAW_STATE_KEY] = await fsm_context.get_state()
 
             return await next(ctx)
 
@@ -43,11 +43,15 @@ class MiddlewareManager(Generic[_UpdateT]):
     def wrap_middlewares(
         self,
         trigger: Callable[[Ctx], Awaitable[_ReturnT]],
+        wrap: Callable[
+            [BaseMiddleware[_UpdateT], NextMiddleware[_UpdateT]],
+            NextMiddleware[_UpdateT],
+        ] = _partial_middleware,
     ) -> NextMiddleware[_UpdateT]:
         middleware = cast("NextMiddleware[_UpdateT]", trigger)
 
         for m in reversed(self.middlewares):
-            middleware = _partial_middleware(m, middleware)
+            middleware = wrap(m, middleware)
 
         return middleware
 
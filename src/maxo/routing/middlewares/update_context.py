@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Any, Final
 
 from maxo import loggers
@@ -120,73 +121,82 @@ class UpdateContextMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
         ctx: Ctx,
         do_enrich: bool,
     ) -> UpdateContext:
-        # Deferred import to avoid circular dependency:
-        # update_context → dialogs → fsm → update_context
-        from maxo.dialogs.api.entities import DialogUpdateEvent  # noqa: PLC0415
-
-        chat_id = None
-        user_id = None
-        chat_type: ChatType | None = None
-        user: User | None = None
-
-        if isinstance(
-            update,
-            (
-                BotAddedToChat,
-                BotRemovedFromChat,
-                BotStarted,
-                BotStopped,
-                ChatTitleChanged,
-                DialogCleared,
-                DialogMuted,
-                DialogRemoved,
-                DialogUnmuted,
-                UserAddedToChat,
-                UserRemovedFromChat,
-            ),
-        ):
-            chat_id = update.chat_id
-            user_id = update.user.user_id
-            user = update.user
-            if hasattr(update, "is_channel"):
-                chat_type = ChatType.CHANNEL if update.is_channel else ChatType.CHAT
-        elif isinstance(update, MessageCallback):
-            user_id = update.user.user_id
-            user = update.callback.user
-            if update.message is not None:
-                chat_id = (
-                    update.message.recipient.chat_id or update.message.recipient.user_id
-                )
-                chat_type = update.message.recipient.chat_type
-        elif isinstance(update, (MessageEdited, MessageCreated)):
-            user_id = (
-                update.message.sender.user_id
-                if is_defined(update.message.sender)
-                else None
-            )
-            user = update.message.sender if is_defined(update.message.sender) else None
-            if update.message is not None:
-                chat_id = (
-                    update.message.recipient.chat_id or update.message.recipient.user_id
-                )
-                chat_type = update.message.recipient.chat_type
-        elif isinstance(update, MessageRemoved):
-            chat_id = update.chat_id
-            user_id = update.user_id
-            chat_type = None
-        elif isinstance(update, DialogUpdateEvent):
-            user_id = update.user.user_id
-            user = update.user
-            chat_id = update.recipient.chat_id
-            chat_type = update.recipient.chat_type
-
-        update_context = UpdateContext(
-            chat_id=chat_id,
-            user_id=user_id,
-            type=chat_type,
-            user=user,
-        )
+        update_context = resolve_update_context(update)
         if do_enrich and "bot" in ctx:
             await self._enrich_context(ctx, update_context)
 
         return update_context
+
+
+def resolve_update_context(update: Any) -> UpdateContext:
+    """Собирает контекст апдейта (chat_id, user_id) без запросов к Bot API."""
+    chat_id = None
+    user_id = None
+    chat_type: ChatType | None = None
+    user: User | None = None
+
+    # Сообщения - самые частые апдейты, поэтому проверяются первыми
+    if isinstance(update, (MessageCreated, MessageEdited)):
+        user_id = (
+            update.message.sender.user_id if is_defined(update.message.sender) else None
+        )
+        user = update.message.sender if is_defined(update.message.sender) else None
+        if update.message is not None:
+            chat_id = (
+                update.message.recipient.chat_id or update.message.recipient.user_id
+            )
+            chat_type = update.message.recipient.chat_type
+    elif isinstance(update, MessageCallback):
+        user_id = update.user.user_id
+        user = update.callback.user
+        if update.message is not None:
+            chat_id = (
+                update.message.recipient.chat_id or update.message.recipient.user_id
+            )
+            chat_type = update.message.recipient.chat_type
+    elif isinstance(
+        update,
+        (
+            BotAddedToChat,
+            BotRemovedFromChat,
+            BotStarted,
+            BotStopped,
+            ChatTitleChanged,
+            DialogCleared,
+            DialogMuted,
+            DialogRemoved,
+            DialogUnmuted,
+            UserAddedToChat,
+            UserRemovedFromChat,
+        ),
+    ):
+        chat_id = update.chat_id
+        user_id = update.user.user_id
+        user = update.user
+        if hasattr(update, "is_channel"):
+            chat_type = ChatType.CHANNEL if update.is_channel else ChatType.CHAT
+    elif isinstance(update, MessageRemoved):
+        chat_id = update.chat_id
+        user_id = update.user_id
+        chat_type = None
+    elif isinstance(update, _dialog_update_event_type()):
+        user_id = update.user.user_id
+        user = update.user
+        chat_id = update.recipient.chat_id
+        chat_type = update.recipient.chat_type
+
+    return UpdateContext(
+        chat_id=chat_id,
+        user_id=user_id,
+        type=chat_type,
+        user=user,
+    )
+
+
+@cache
+def _dialog_update_event_type() -> type[Any]:
+    # Deferred import to avoid circular dependency:
+    # update_context → dialogs → fsm → update_context
+    from maxo.dialogs.api.entities import DialogUpdateEvent  # noqa: PLC0415
+
+    return DialogUpdateEvent
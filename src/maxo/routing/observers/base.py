@@ -1,15 +1,22 @@
 from abc import ABC
-from collections.abc import Callable, Coroutine, MutableSequence, Sequence
+from collections.abc import Awaitable, Callable, Coroutine, MutableSequence, Sequence
 from typing import Any, ParamSpec, TypeVar, cast
 
+from maxo.instrumentation.base import Instrumentation, Stage
 from maxo.routing.ctx import Ctx
 from maxo.routing.filters import AlwaysTrueFilter
 from maxo.routing.interfaces import Filter, Handler, Observer
+from maxo.routing.interfaces.middleware import NextMiddleware
 from maxo.routing.interfaces.observer import ObserverState
 from maxo.routing.middlewares.manager import MiddlewareManagerFacade
 from maxo.routing.observers.state import EmptyObserverState
 from maxo.routing.sentinels import UNHANDLED, SkipHandler
 from maxo.routing.updates.base import BaseUpdate
+from maxo.routing.utils._instrumenting import (
+    callable_name,
+    timed_call,
+    timed_middlewares,
+)
 
 _UpdateT = TypeVar("_UpdateT", bound=BaseUpdate)
 _ReturnT_co = TypeVar("_ReturnT_co", covariant=True)
@@ -27,6 +34,7 @@ class BaseObserver(Observer[_UpdateT, _HandlerT, _HandlerFnT], ABC):
     _handlers: MutableSequence[_HandlerT]
     _middleware: MiddlewareManagerFacade[_UpdateT]
     _state: ObserverState
+    _handler_chains: dict[_HandlerT, NextMiddleware[_UpdateT]]
 
     __slots__ = (
         "_filter",
@@ -39,6 +47,13 @@ class BaseObserver(Observer[_UpdateT, _HandlerT, _HandlerFnT], ABC):
         self._filter = AlwaysTrueFilter()
         self._middleware = MiddlewareManagerFacade()
         self._state = EmptyObserverState()
+        self._handler_chains = {}
+        self._instrumentation: Instrumentation | None = None
+        self._router_name = ""
+        self._timed_handlers = True
+        self._timed_filters: (
+            dict[_HandlerT, Callable[[Ctx], Awaitable[bool]]] | None
+        ) = None
 
     @property
     def state(self) -> ObserverState:
@@ -52,10 +67,36 @@ class BaseObserver(Observer[_UpdateT, _HandlerT, _HandlerFnT], ABC):
     def handlers(self) -> Sequence[_HandlerT]:
         return self._handlers
 
+    @property
+    def has_filter(self) -> bool:
+        """Установлен ли фильтр через :meth:`filter`."""
+        return not isinstance(self._filter, AlwaysTrueFilter)
+
     @property
     def middleware(self) -> MiddlewareManagerFacade[_UpdateT]:
         return self._middleware
 
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self._instrumentation
+
+    def instrument(
+        self,
+        instrumentation: Instrumentation | None,
+        router_name: str,
+        handlers: bool = True,
+    ) -> None:
+        """
+        Включить измерения inner-мидлварей, фильтров и хендлеров, None - выключить.
+
+        Вступает в силу при сборке цепочек в :meth:`compile_middlewares`.
+
+        :param handlers: Измерять ли фильтры и хендлеры, а не только мидлвари.
+        """
+        self._instrumentation = instrumentation
+        self._router_name = router_name
+        self._timed_handlers = handlers
+
     def __call__(
         self,
         filter: Filter[_UpdateT] | None = None,
@@ -73,9 +114,19 @@ class BaseObserver(Observer[_UpdateT, _HandlerT, _HandlerFnT], ABC):
     async def execute_filter(self, ctx: Ctx) -> bool:
         return await self._filter(ctx["update"], ctx)
 
+    async def _lookup_candidates(self, ctx: Ctx) -> Sequence[_HandlerT]:
+        """Хендлеры, которые могут обработать апдейт, в порядке регистрации."""
+        return self._handlers
+
     async def handler_lookup(self, ctx: Ctx) -> Any:
-        for handler in self._handlers:
-            if await handler.execute_filter(ctx):
+        timed_filters = self._timed_filters
+        for handler in await self._lookup_candidates(ctx):
+            if timed_filters is None:
+                passed = await handler.execute_filter(ctx)
+            else:
+                passed = await timed_filters[handler](ctx)
+
+            if passed:
                 try:
                     return await self.execute_handler(ctx, handler)
                 except SkipHandler:
@@ -83,10 +134,59 @@ class BaseObserver(Observer[_UpdateT, _HandlerT, _HandlerFnT], ABC):
 
         return UNHANDLED
 
+    def compile_middlewares(self) -> None:
+        """
+        Собрать цепочки inner-мидлварей для всех хендлеров.
+
+        Вызывается после запуска, когда мидлвари и хендлеры уже не меняются,
+        чтобы не собирать цепочку заново на каждый апдейт.
+        """
+        instrumentation = self._instrumentation
+        if instrumentation is None:
+            self._handler_chains = {
+                handler: self.middleware.inner.wrap_middlewares(handler)
+                for handler in self._handlers
+            }
+            self._timed_filters = None
+            return
+
+        router = self._router_name
+        wrap = timed_middlewares(instrumentation, Stage.INNER_MIDDLEWARE, router)
+        self._handler_chains = {}
+        self._timed_filters = {} if self._timed_handlers else None
+        for handler in self._handlers:
+            trigger: Callable[[Ctx], Awaitable[Any]] = handler
+            if self._timed_filters is not None:
+                name = callable_name(handler)
+                trigger = timed_call(
+                    handler,
+                    instrumentation,
+                    Stage.HANDLER,
+                    name,
+                    router,
+                )
+                self._timed_filters[handler] = timed_call(
+                    handler.execute_filter,
+                    instrumentation,
+                    Stage.FILTER,
+                    name,
+                    router,
+                )
+            self._handler_chains[handler] = self.middleware.inner.wrap_middlewares(
+                trigger,
+                wrap,
+            )
+
+    def reset_middlewares(self) -> None:
+        self._handler_chains = {}
+        self._timed_filters = None
+
     async def execute_handler(
         self,
         ctx: Ctx,
         handler: _HandlerT,
     ) -> _ReturnT_co:
-        chain_middlewares = self.middleware.inner.wrap_middlewares(handler)
+        chain_middlewares = self._handler_chains.get(handler)
+        if chain_middlewares is None:
+            chain_middlewares = self.middleware.inner.wrap_middlewares(handler)
         return cast(_ReturnT_co, await chain_middlewares(ctx))
@@ -0,0 +1,252 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Sequence
+from typing import Any, ClassVar, Generic, TypeVar, cast
+
+from maxo.routing.ctx import Ctx
+from maxo.routing.filters.command import (
+    Command,
+    CommandException,
+    extract_command_cached,
+    get_command_text,
+)
+from maxo.routing.filters.logic import AndFilter
+from maxo.routing.filters.payload import MessageCallbackFilter
+from maxo.routing.filters.pure import PureFilter
+from maxo.routing.filters.state import StateFilter
+from maxo.routing.handlers.update import UpdateHandler
+from maxo.routing.interfaces.filter import Filter
+from maxo.routing.middlewares.fsm_context import RAW_STATE_KEY
+from maxo.routing.updates.message_callback import MessageCallback
+from maxo.routing.updates.message_created import MessageCreated
+
+_HandlerT = TypeVar("_HandlerT", bound=UpdateHandler[Any, Any])
+
+
+class HandlerIndex(ABC, Generic[_HandlerT]):
+    """
+    Индекс хендлеров по ключу, который можно получить из фильтра и из апдейта.
+
+    Для апдейта возвращает только хендлеры, которые могут на него сработать:
+    с подходящим ключом и все неиндексируемые. Порядок регистрации
+    сохраняется, а фильтры кандидатов всё равно проверяются полностью.
+    """
+
+    __slots__ = ("_by_key", "_handlers", "_unindexed")
+
+    # Ключи контекста, которые читает `lookup_key`
+    _ctx_keys: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self, handlers: Sequence[_HandlerT]) -> None:
+        keys = [self.index_keys(handler) for handler in handlers]
+
+        self._handlers = tuple(handlers)
+        self._unindexed = tuple(
+            handler
+            for handler, handler_keys in zip(handlers, keys, strict=True)
+            if handler_keys is None
+        )
+        self._by_key = {
+            key: tuple(
+                handler
+                for handler, handler_keys in zip(handlers, keys, strict=True)
+                if handler_keys is None or key in handler_keys
+            )
+            for handler_keys in keys
+            if handler_keys is not None
+            for key in handler_keys
+        }
+
+    @property
+    def indexed(self) -> bool:
+        return bool(self._by_key)
+
+    @property
+    def ctx_keys(self) -> tuple[str, ...]:
+        """Ленивые значения контекста, которые нужно загрузить перед поиском."""
+        return self._ctx_keys if self._by_key else ()
+
+    def lookup(self, ctx: Ctx) -> Sequence[_HandlerT]:
+        if not self._by_key:
+            return self._handlers
+
+        key = self.lookup_key(ctx)
+        if key is None:
+            return self._unindexed
+        return self._by_key.get(key, self._unindexed)
+
+    def resolve_key(self, ctx: Ctx) -> Hashable | None:
+        """Ключ апдейта, если по нему есть хендлеры, иначе ``None``."""
+        key = self.lookup_key(ctx)
+        if key is None or key not in self._by_key:
+            return None
+        return key
+
+    def candidates(self, key: Hashable | None) -> Sequence[_HandlerT]:
+        """Хендлеры для ключа из :meth:`resolve_key`."""
+        if key is None:
+            return self._unindexed
+        return self._by_key[key]
+
+    @abstractmethod
+    def index_keys(self, handler: _HandlerT) -> tuple[Hashable, ...] | None:
+        """Ключи хендлера или ``None``, если его нельзя индексировать."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def lookup_key(self, ctx: Ctx) -> Hashable | None:
+        """Ключ апдейта или ``None``, если индексированные хендлеры не подходят."""
+        raise NotImplementedError
+
+
+class CommandIndex(HandlerIndex[_HandlerT]):
+    """Индекс хендлеров с фильтром :class:`~maxo.routing.filters.Command`."""
+
+    __slots__ = ()
+
+    def index_keys(self, handler: _HandlerT) -> tuple[Hashable, ...] | None:
+        filter_ = handler.filter
+        if not isinstance(filter_, Command):
+            return None
+        return filter_.index_keys
+
+    def lookup_key(self, ctx: Ctx) -> Hashable | None:
+        update = ctx["update"]
+        if not isinstance(update, MessageCreated):
+            return None
+
+        text = get_command_text(update)
+        if not text:
+            return None
+
+        try:
+            command = extract_command_cached(text, ctx)
+        except CommandException:
+            return None
+        return command.command.casefold()
+
+
+class PayloadIndex(HandlerIndex[_HandlerT]):
+    """
+    Индекс хендлеров с фильтром ``Payload.filter()`` по префиксу payload.
+
+    Если классы payload используют разные разделители, префикс апдейта
+    определить однозначно нельзя, и индекс отключается.
+    """
+
+    __slots__ = ("_separator",)
+
+    def __init__(self, handlers: Sequence[_HandlerT]) -> None:
+        super().__init__(handlers)
+        separators = {separator for separator, _ in self._by_key}  # type: ignore[misc]
+        self._separator = separators.pop() if len(separators) == 1 else None
+        if self._separator is None:
+            self._by_key = {}
+
+    def index_keys(self, handler: _HandlerT) -> tuple[Hashable, ...] | None:
+        filter_ = handler.filter
+        if not isinstance(filter_, MessageCallbackFilter):
+            return None
+        return filter_.index_keys
+
+    def lookup_key(self, ctx: Ctx) -> Hashable | None:
+        update = ctx["update"]
+        if not isinstance(update, MessageCallback) or not update.payload:
+            return None
+
+        separator = cast(str, self._separator)
+        return separator, update.payload.split(separator, 1)[0]
+
+
+# Ключ индекса для отсутствующего состояния, None в индексе - "нет ключа"
+_DEFAULT_STATE = ("raw_state", None)
+
+
+class StateIndex(HandlerIndex[_HandlerT]):
+    """
+    Индекс хендлеров с фильтром :class:`~maxo.fsm.StateFilter` по ``raw_state``.
+
+    Учитывается и ``StateFilter`` внутри ``&``: хендлер с фильтром
+    ``StateFilter(Form.name) & F.text`` проверяется только в состоянии
+    ``Form.name``.
+    """
+
+    __slots__ = ()
+
+    _ctx_keys = (RAW_STATE_KEY,)
+
+    def index_keys(self, handler: _HandlerT) -> tuple[Hashable, ...] | None:
+        raw_states = _state_keys(handler.filter)
+        if raw_states is None:
+            return None
+        return tuple(_DEFAULT_STATE if state is None else state for state in raw_states)
+
+    def lookup_key(self, ctx: Ctx) -> Hashable | None:
+        raw_state = ctx.get(RAW_STATE_KEY)
+        if raw_state is None:
+            return _DEFAULT_STATE
+        return cast(Hashable, raw_state)
+
+
+def _state_keys(filter_: Filter[Any]) -> frozenset[str | None] | None:
+    if isinstance(filter_, PureFilter):
+        filter_ = filter_.filter
+
+    if isinstance(filter_, StateFilter):
+        index_keys = filter_.index_keys
+        return None if index_keys is None else frozenset(index_keys)
+
+    if isinstance(filter_, AndFilter):
+        result: frozenset[str | None] | None = None
+        for sub_filter in filter_.filters:
+            keys = _state_keys(sub_filter)
+            if keys is not None:
+                result = keys if result is None else result & keys
+        return result
+
+    return None
+
+
+class CombinedIndex(Generic[_HandlerT]):
+    """
+    Несколько индексов одного наблюдателя.
+
+    Кандидаты - хендлеры, которые подходят по всем индексам, в порядке
+    регистрации. Пересечение считается один раз для каждого сочетания ключей.
+    """
+
+    __slots__ = ("_cache", "_ctx_keys", "_handlers", "_indexes")
+
+    def __init__(
+        self,
+        handlers: Sequence[_HandlerT],
+        indexes: Sequence[HandlerIndex[_HandlerT]],
+    ) -> None:
+        self._handlers = tuple(handlers)
+        self._indexes = tuple(indexes)
+        self._ctx_keys = tuple(
+            {key: None for index in self._indexes for key in index.ctx_keys},
+        )
+        self._cache: dict[tuple[Hashable | None, ...], Sequence[_HandlerT]] = {}
+
+    @property
+    def indexed(self) -> bool:
+        return True
+
+    @property
+    def ctx_keys(self) -> tuple[str, ...]:
+        return self._ctx_keys
+
+    def lookup(self, ctx: Ctx) -> Sequence[_HandlerT]:
+        keys = tuple(index.resolve_key(ctx) for index in self._indexes)
+        candidates = self._cache.get(keys)
+        if candidates is None:
+            allowed = [
+                set(index.candidates(key))
+                for index, key in zip(self._indexes, keys, strict=True)
+            ]
+            candidates = self._cache[keys] = tuple(
+                handler
+                for handler in self._handlers
+                if all(handler in handlers for handlers in allowed)
+            )
+        return candidates
@@ -1,9 +1,18 @@
+from collections.abc import Callable, Sequence
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from maxo.routing.ctx import Ctx
+from maxo.routing.executors.base import BaseExecutor
 from maxo.routing.handlers.update import UpdateHandler, UpdateHandlerFn
 from maxo.routing.interfaces.filter import Filter
 from maxo.routing.observers.base import BaseObserver
+from maxo.routing.observers.index import (
+    CombinedIndex,
+    CommandIndex,
+    HandlerIndex,
+    PayloadIndex,
+    StateIndex,
+)
 from maxo.routing.updates.base import BaseUpdate
 
 _UpdateT = TypeVar("_UpdateT", bound=BaseUpdate)
@@ -18,19 +27,73 @@ class UpdateObserver(
     ],
     Generic[_UpdateT],
 ):
+    _index_types: tuple[type[HandlerIndex[Any]], ...] = (
+        CommandIndex,
+        PayloadIndex,
+        StateIndex,
+    )
+    _index: (
+        HandlerIndex[UpdateHandler[_UpdateT, Any]]
+        | CombinedIndex[UpdateHandler[_UpdateT, Any]]
+        | None
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._index = None
+
+    def __call__(
+        self,
+        filter: Filter[_UpdateT] | None = None,
+        executor: BaseExecutor | str | None = None,
+    ) -> Callable[
+        [UpdateHandlerFn[_UpdateT, Any]],
+        UpdateHandlerFn[_UpdateT, Any],
+    ]:
+        def wrapper(
+            handler_fn: UpdateHandlerFn[_UpdateT, Any],
+        ) -> UpdateHandlerFn[_UpdateT, Any]:
+            return self.handler(handler_fn, filter, executor)
+
+        return wrapper
+
     def handler(
         self,
         handler_fn: UpdateHandlerFn[_UpdateT, Any],
         filter: Filter[_UpdateT] | None = None,
+        executor: BaseExecutor | str | None = None,
     ) -> UpdateHandlerFn[_UpdateT, Any]:
         self.state.ensure_add_handler()
 
-        self._handlers.append(UpdateHandler(handler_fn, filter))
+        self._handlers.append(UpdateHandler(handler_fn, filter, executor))
+        self._index = None
 
         return handler_fn
 
     register = handler  # Подражание aiogram
 
+    async def _lookup_candidates(
+        self,
+        ctx: Ctx,
+    ) -> Sequence[UpdateHandler[_UpdateT, Any]]:
+        if self._index is None:
+            self._index = self._build_index()
+        if self._index.ctx_keys and isinstance(ctx, Ctx):
+            await ctx.resolve(self._index.ctx_keys)
+        return self._index.lookup(ctx)
+
+    def _build_index(
+        self,
+    ) -> (
+        HandlerIndex[UpdateHandler[_UpdateT, Any]]
+        | CombinedIndex[UpdateHandler[_UpdateT, Any]]
+    ):
+        indexes = [index_type(self._handlers) for index_type in self._index_types]
+        used = [index for index in indexes if index.indexed]
+        if len(used) > 1:
+            return CombinedIndex(self._handlers, used)
+        return used[0] if used else indexes[0]
+
     if TYPE_CHECKING:
 
         async def execute_handler(
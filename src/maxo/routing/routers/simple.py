@@ -1,9 +1,12 @@
-from collections.abc import Mapping, MutableSequence
+from collections.abc import Mapping, MutableSequence, Sequence
 from functools import partial
 from typing import Any
 
+from maxo.instrumentation.base import Instrumentation, Stage
 from maxo.routing.ctx import Ctx
+from maxo.routing.executors.base import BaseExecutor
 from maxo.routing.interfaces import BaseRouter, Observer
+from maxo.routing.interfaces.middleware import NextMiddleware
 from maxo.routing.interfaces.router import RouterState
 from maxo.routing.middlewares.state import (
     EmptyMiddlewareManagerState,
@@ -33,11 +36,17 @@ from maxo.routing.updates import (
     UserRemovedFromChat,
 )
 from maxo.routing.updates.error import ErrorEvent
+from maxo.routing.utils._instrumenting import timed_middlewares
+from maxo.routing.utils.dispatch_plan import DispatchPlan
 from maxo.routing.utils.get_default_name import get_router_default_name
 
 
 class Router(BaseRouter):
-    def __init__(self, name: str | None = None) -> None:
+    def __init__(
+        self,
+        name: str | None = None,
+        executor: BaseExecutor | str | None = None,
+    ) -> None:
         self.bot_added_to_chat = UpdateObserver[BotAddedToChat]()
         self.bot_removed_from_chat = UpdateObserver[BotRemovedFromChat]()
         self.bot_started = UpdateObserver[BotStarted]()
@@ -98,8 +107,16 @@ class Router(BaseRouter):
             name = get_router_default_name()
 
         self._name = name
+        # Исполнитель синхронных хендлеров роутера и вложенных в него роутеров
+        self.executor = executor
         self._children_routers: MutableSequence[BaseRouter] = []
         self._state = EmptyRouterState()
+        # Цепочки outer-мидлварей, собранные при запуске
+        self._chains: dict[Observer[Any, Any, Any], NextMiddleware[Any]] = {}
+        # Дочерние роутеры по типам апдейтов, рассчитывает диспетчер при запуске
+        self._dispatch_plan: DispatchPlan = {}
+        # Инструментация диспетчера, задаётся при запуске
+        self._instrumentation: Instrumentation | None = None
 
     def __repr__(self) -> str:
         return f"<Router {self._name!r}>"
@@ -124,12 +141,41 @@ class Router(BaseRouter):
     def children_routers(self) -> MutableSequence[BaseRouter]:
         return self._children_routers
 
+    @property
+    def dispatch_plan(self) -> DispatchPlan:
+        return self._dispatch_plan
+
+    @dispatch_plan.setter
+    def dispatch_plan(self, value: DispatchPlan) -> None:
+        self._dispatch_plan = value
+
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self._instrumentation
+
+    def instrument(self, instrumentation: Instrumentation | None) -> None:
+        """Включить измерения в роутере и вложенных роутерах, None - выключить."""
+        self._instrumentation = instrumentation
+        for observer in self.observers.values():
+            if isinstance(observer, UpdateObserver):
+                observer.instrument(instrumentation, self._name)
+
+        for child_router in self.children_routers:
+            if isinstance(child_router, Router):
+                child_router.instrument(instrumentation)
+
     def include(self, *routers: BaseRouter) -> None:
         self.state.ensure_include()
         self.children_routers.extend(routers)
 
     async def trigger_child(self, ctx: Ctx) -> Any:
-        for child_router in self.children_routers:
+        children_routers: Sequence[BaseRouter] | None = self._dispatch_plan.get(
+            type(ctx["update"]),
+        )
+        if children_routers is None:
+            children_routers = self.children_routers
+
+        for child_router in children_routers:
             result = await child_router.trigger(ctx)
             if result is UNHANDLED:
                 continue
@@ -141,11 +187,25 @@ class Router(BaseRouter):
         if observer is None:
             return await self.trigger_child(ctx)
 
-        chain_middlewares = observer.middleware.outer.wrap_middlewares(
-            partial(self._trigger, observer=observer),
-        )
+        chain_middlewares = self._chains.get(observer)
+        if chain_middlewares is None:
+            chain_middlewares = self._wrap_observer(observer)
         return await chain_middlewares(ctx)
 
+    def _wrap_observer(self, observer: Observer[Any, Any, Any]) -> NextMiddleware[Any]:
+        trigger = partial(self._trigger, observer=observer)
+        if self._instrumentation is None or not isinstance(observer, UpdateObserver):
+            return observer.middleware.outer.wrap_middlewares(trigger)
+
+        return observer.middleware.outer.wrap_middlewares(
+            trigger,
+            timed_middlewares(
+                self._instrumentation,
+                Stage.OUTER_MIDDLEWARE,
+                self._name,
+            ),
+        )
+
     async def _trigger(self, ctx: Ctx, *, observer: Observer[Any, Any, Any]) -> Any:
         if not await observer.execute_filter(ctx):
             return UNHANDLED
@@ -166,6 +226,9 @@ class Router(BaseRouter):
             observer.middleware.inner.state = StartedMiddlewareManagerState()
             observer.middleware.outer.state = StartedMiddlewareManagerState()
 
+            observer.compile_middlewares()
+            self._chains[observer] = self._wrap_observer(observer)
+
     async def _emit_before_shutdown_handler(self) -> None:
         self._state = EmptyRouterState()
 
@@ -174,3 +237,7 @@ class Router(BaseRouter):
 
             observer.middleware.inner.state = EmptyMiddlewareManagerState()
             observer.middleware.outer.state = EmptyMiddlewareManagerState()
+
+            observer.reset_middlewares()
+        self._chains.clear()
+        self._dispatch_plan = {}
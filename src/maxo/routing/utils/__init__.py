@@ -1,3 +1,8 @@
 from maxo.routing.utils.collect_used_updates import collect_used_updates
+from maxo.routing.utils.dispatch_plan import build_dispatch_plan, format_dispatch_plan
 
-__all__ = ("collect_used_updates",)
+__all__ = (
+    "build_dispatch_plan",
+    "collect_used_updates",
+    "format_dispatch_plan",
+)
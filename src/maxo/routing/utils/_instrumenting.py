@@ -0,0 +1,91 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from maxo.instrumentation.base import Instrumentation, Span, Stage
+from maxo.routing.ctx import Ctx
+from maxo.routing.interfaces.middleware import BaseMiddleware, NextMiddleware
+from maxo.routing.sentinels import SkipHandler
+
+MiddlewareWrapper = Callable[
+    [BaseMiddleware[Any], NextMiddleware[Any]],
+    NextMiddleware[Any],
+]
+
+
+def callable_name(obj: Any) -> str:
+    """Имя хендлера или мидлвари для измерений."""
+    obj = getattr(obj, "_handler_fn", obj)
+    name = getattr(obj, "__qualname__", None)
+    if isinstance(name, str):
+        return name
+    return type(obj).__qualname__
+
+
+def timed_middlewares(
+    instrumentation: Instrumentation,
+    stage: Stage,
+    router: str,
+) -> MiddlewareWrapper:
+    """Обёртка мидлварей, измеряющая их собственное время без ``next``."""
+    clock = instrumentation.clock
+
+    def wrap(
+        middleware: BaseMiddleware[Any],
+        next: NextMiddleware[Any],
+    ) -> NextMiddleware[Any]:
+        name = callable_name(middleware)
+
+        async def wrapper(ctx: Ctx) -> Any:
+            nested = 0.0
+
+            async def timed_next(ctx: Ctx) -> Any:
+                nonlocal nested
+                started_at = clock()
+                try:
+                    return await next(ctx)
+                finally:
+                    nested += clock() - started_at
+
+            error = None
+            started_at = clock()
+            try:
+                return await middleware(update=ctx["update"], ctx=ctx, next=timed_next)
+            except SkipHandler:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                instrumentation.emit(
+                    Span(stage, name, router, clock() - started_at - nested, error),
+                )
+
+        return wrapper
+
+    return wrap
+
+
+def timed_call(
+    call: Callable[[Ctx], Awaitable[Any]],
+    instrumentation: Instrumentation,
+    stage: Stage,
+    name: str,
+    router: str,
+) -> Callable[[Ctx], Awaitable[Any]]:
+    """Обёртка хендлера или фильтра хендлера, измеряющая время вызова."""
+    clock = instrumentation.clock
+
+    async def wrapper(ctx: Ctx) -> Any:
+        error = None
+        started_at = clock()
+        try:
+            return await call(ctx)
+        except SkipHandler:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            instrumentation.emit(Span(stage, name, router, clock() - started_at, error))
+
+    return wrapper
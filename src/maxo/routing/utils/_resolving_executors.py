@@ -0,0 +1,54 @@
+from collections.abc import Mapping
+
+from maxo.errors.routing import UnknownExecutorError
+from maxo.routing.executors.base import BaseExecutor
+from maxo.routing.handlers.update import UpdateHandler
+from maxo.routing.interfaces.router import BaseRouter
+
+
+def resolve_executors(
+    router: BaseRouter,
+    executors: Mapping[str, BaseExecutor],
+    inherited: BaseExecutor | None = None,
+) -> set[BaseExecutor]:
+    """
+    Привязать к синхронным хендлерам их исполнители.
+
+    Хендлер использует свой исполнитель, иначе исполнитель ближайшего
+    роутера, иначе исполнитель ``"default"`` из ``executors``.
+    Возвращает исполнители, которые достались хотя бы одному хендлеру.
+    """
+    if inherited is None:
+        inherited = executors.get("default")
+
+    router_executor = _get_executor(getattr(router, "executor", None), executors)
+    if router_executor is not None:
+        inherited = router_executor
+
+    used: set[BaseExecutor] = set()
+    for observer in router.observers.values():
+        for handler in observer.handlers:
+            if not isinstance(handler, UpdateHandler) or handler.awaitable:
+                continue
+
+            executor = _get_executor(handler.executor, executors) or inherited
+            handler.bind_executor(executor)
+            if executor is not None:
+                used.add(executor)
+
+    for children_router in router.children_routers:
+        used |= resolve_executors(children_router, executors, inherited)
+    return used
+
+
+def _get_executor(
+    executor: BaseExecutor | str | None,
+    executors: Mapping[str, BaseExecutor],
+) -> BaseExecutor | None:
+    if not isinstance(executor, str):
+        return executor
+
+    try:
+        return executors[executor]
+    except KeyError:
+        raise UnknownExecutorError(executor, tuple(executors)) from None
@@ -0,0 +1,113 @@
+from collections.abc import Iterable, Mapping, MutableMapping
+from typing import Any
+
+from maxo.routing.interfaces.router import BaseRouter
+
+DispatchPlan = Mapping[type[Any], tuple[BaseRouter, ...]]
+
+
+def build_dispatch_plan(router: BaseRouter) -> dict[BaseRouter, DispatchPlan]:
+    """
+    Рассчитать для каждого роутера дерева дочерние роутеры по типам апдейтов.
+
+    Дочерний роутер попадает в план для типа апдейта, только если в его
+    поддереве есть хендлеры, фильтры или outer-мидлвари этого типа. Остальные
+    поддеревья не могут обработать апдейт, поэтому их можно не обходить.
+    """
+    update_types = _collect_update_types(router)
+    active: dict[tuple[int, type[Any]], bool] = {}
+    plans: dict[BaseRouter, DispatchPlan] = {}
+    _build(router, update_types, active, plans)
+    return plans
+
+
+def format_dispatch_plan(
+    router: BaseRouter,
+    plans: Mapping[BaseRouter, DispatchPlan] | None = None,
+) -> str:
+    """Вывести план в виде дерева роутеров для каждого типа апдейта."""
+    if plans is None:
+        plans = build_dispatch_plan(router)
+
+    lines: list[str] = []
+    for update_tp in sorted(_collect_update_types(router), key=lambda tp: tp.__name__):
+        lines.append(f"{update_tp.__name__}:")
+        _format(router, update_tp, plans, lines, depth=1)
+    return "\n".join(lines)
+
+
+def _collect_update_types(
+    router: BaseRouter,
+    update_types: set[type[Any]] | None = None,
+) -> set[type[Any]]:
+    if update_types is None:
+        update_types = set()
+
+    update_types.update(router.observers)
+    for children_router in router.children_routers:
+        _collect_update_types(children_router, update_types)
+    return update_types
+
+
+def _build(
+    router: BaseRouter,
+    update_types: Iterable[type[Any]],
+    active: MutableMapping[tuple[int, type[Any]], bool],
+    plans: MutableMapping[BaseRouter, DispatchPlan],
+) -> None:
+    plans[router] = {
+        update_tp: tuple(
+            children_router
+            for children_router in router.children_routers
+            if _is_active(children_router, update_tp, active)
+        )
+        for update_tp in update_types
+    }
+    for children_router in router.children_routers:
+        if children_router not in plans:
+            _build(children_router, update_types, active, plans)
+
+
+def _is_active(
+    router: BaseRouter,
+    update_tp: type[Any],
+    active: MutableMapping[tuple[int, type[Any]], bool],
+) -> bool:
+    key = (id(router), update_tp)
+    if key not in active:
+        observer = router.observers.get(update_tp)
+        active[key] = (
+            observer is not None
+            and bool(
+                observer.handlers
+                or observer.has_filter
+                or observer.middleware.outer.middlewares,
+            )
+        ) or any(
+            _is_active(children_router, update_tp, active)
+            for children_router in router.children_routers
+        )
+    return active[key]
+
+
+def _format(
+    router: BaseRouter,
+    update_tp: type[Any],
+    plans: Mapping[BaseRouter, DispatchPlan],
+    lines: list[str],
+    depth: int,
+) -> None:
+    observer = router.observers.get(update_tp)
+    details = []
+    if observer is not None and observer.handlers:
+        details.append(f"handlers={len(observer.handlers)}")
+    if observer is not None and observer.has_filter:
+        details.append("filter")
+    if observer is not None and observer.middleware.outer.middlewares:
+        details.append(f"outer={len(observer.middleware.outer.middlewares)}")
+
+    suffix = f" ({', '.join(details)})" if details else ""
+    lines.append(f"{'  ' * depth}{router.name}{suffix}")
+
+    for children_router in plans.get(router, {}).get(update_tp, ()):
+        _format(children_router, update_tp, plans, lines, depth + 1)
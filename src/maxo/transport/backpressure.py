@@ -0,0 +1,292 @@
+import asyncio
+import time
+from abc import abstractmethod
+from collections import deque
+from collections.abc import Hashable
+from typing import Protocol
+
+
+class Limiter(Protocol):
+    @property
+    @abstractmethod
+    def in_flight(self) -> int:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def has_capacity(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def blocked_for(self) -> float:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def blocked_time(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self) -> None:
+        raise NotImplementedError
+
+
+class InFlightLimiter(Limiter):
+    """
+    Ограничитель количества одновременно обрабатываемых апдейтов.
+
+    Пока лимит исчерпан, :meth:`acquire` не возвращает управление, и транспорт
+    перестаёт запрашивать новые апдейты. При ``max_in_flight=None`` ограничения нет,
+    но счётчики всё равно ведутся.
+
+    Рассчитан на одного ожидающего (поллер одного бота).
+    """
+
+    __slots__ = (
+        "_blocked_since",
+        "_blocked_time",
+        "_in_flight",
+        "_max_in_flight",
+        "_released",
+    )
+
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("`max_in_flight` should be greater than 0")
+
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._released = asyncio.Event()
+        self._blocked_since: float | None = None
+        self._blocked_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(in_flight={self._in_flight}, "
+            f"max_in_flight={self._max_in_flight}, "
+            f"blocked_time={self.blocked_time:.3f})"
+        )
+
+    @property
+    def max_in_flight(self) -> int | None:
+        return self._max_in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """Количество апдейтов, обработка которых ещё не завершилась."""
+        return self._in_flight
+
+    @property
+    def has_capacity(self) -> bool:
+        return self._max_in_flight is None or self._in_flight < self._max_in_flight
+
+    @property
+    def blocked(self) -> bool:
+        return self._blocked_since is not None
+
+    @property
+    def blocked_for(self) -> float:
+        """Сколько секунд длится текущая блокировка (0, если её нет)."""
+        if self._blocked_since is None:
+            return 0.0
+        return time.monotonic() - self._blocked_since
+
+    @property
+    def blocked_time(self) -> float:
+        """Суммарное время в секундах, проведённое в ожидании свободного места."""
+        return self._blocked_time + self.blocked_for
+
+    async def acquire(self) -> None:
+        if not self.has_capacity:
+            self._blocked_since = time.monotonic()
+            try:
+                while not self.has_capacity:
+                    self._released.clear()
+                    await self._released.wait()
+            finally:
+                self._blocked_time += time.monotonic() - self._blocked_since
+                self._blocked_since = None
+
+        self._in_flight += 1
+
+    def release(self) -> None:
+        if self._in_flight <= 0:
+            raise RuntimeError("Release called more times than acquire")
+
+        self._in_flight -= 1
+        self._released.set()
+
+
+class FairInFlightLimiter:
+    """
+    Общий лимит одновременно обрабатываемых апдейтов для нескольких поллеров.
+
+    Когда лимит исчерпан, освободившиеся места раздаются ожидающим поллерам
+    по кругу, поэтому бот с большим потоком апдейтов не может занять весь лимит
+    и остановить остальных.
+
+    Каждый поллер работает со своим участником лимита, см. :meth:`member`.
+    """
+
+    __slots__ = ("_in_flight", "_max_in_flight", "_waiters")
+
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("`max_in_flight` should be greater than 0")
+
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        # dict сохраняет порядок вставки - это и есть очередь round-robin
+        self._waiters: dict[Hashable, deque[asyncio.Future[None]]] = {}
+
+    @property
+    def max_in_flight(self) -> int | None:
+        return self._max_in_flight
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def has_capacity(self) -> bool:
+        if self._waiters:
+            return False
+        return self._max_in_flight is None or self._in_flight < self._max_in_flight
+
+    def member(self, key: Hashable) -> "FairLimiterMember":
+        return FairLimiterMember(self, key)
+
+    async def acquire(self, key: Hashable) -> None:
+        if self.has_capacity:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Место уже выдано, но забрать его не успели
+                self.release()
+            else:
+                self._discard_waiter(key, waiter)
+            raise
+
+    def release(self) -> None:
+        if self._in_flight <= 0:
+            raise RuntimeError("Release called more times than acquire")
+
+        self._in_flight -= 1
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters and (
+            self._max_in_flight is None or self._in_flight < self._max_in_flight
+        ):
+            key = next(iter(self._waiters))
+            queue = self._waiters.pop(key)
+            waiter = queue.popleft()
+            if queue:
+                # Остальные ожидающие этого ключа встают в конец очереди
+                self._waiters[key] = queue
+
+            if waiter.done():
+                continue
+
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _discard_waiter(self, key: Hashable, waiter: asyncio.Future[None]) -> None:
+        queue = self._waiters.get(key)
+        if queue is None:
+            return
+
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+
+        if not queue:
+            del self._waiters[key]
+
+
+class FairLimiterMember(Limiter):
+    """Участник общего :class:`FairInFlightLimiter` со своими счётчиками."""
+
+    __slots__ = (
+        "_blocked_since",
+        "_blocked_time",
+        "_in_flight",
+        "_key",
+        "_parent",
+        "_waiting",
+    )
+
+    def __init__(self, parent: FairInFlightLimiter, key: Hashable) -> None:
+        self._parent = parent
+        self._key = key
+        self._in_flight = 0
+        self._waiting = 0
+        self._blocked_since: float | None = None
+        self._blocked_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(key={self._key!r}, "
+            f"in_flight={self._in_flight}, "
+            f"blocked_time={self.blocked_time:.3f})"
+        )
+
+    @property
+    def key(self) -> Hashable:
+        return self._key
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def has_capacity(self) -> bool:
+        return self._parent.has_capacity
+
+    @property
+    def blocked_for(self) -> float:
+        if self._blocked_since is None:
+            return 0.0
+        return time.monotonic() - self._blocked_since
+
+    @property
+    def blocked_time(self) -> float:
+        return self._blocked_time + self.blocked_for
+
+    async def acquire(self) -> None:
+        if self._parent.has_capacity:
+            await self._parent.acquire(self._key)
+        else:
+            self._waiting += 1
+            if self._blocked_since is None:
+                self._blocked_since = time.monotonic()
+            try:
+                await self._parent.acquire(self._key)
+            finally:
+                self._waiting -= 1
+                if not self._waiting and self._blocked_since is not None:
+                    self._blocked_time += time.monotonic() - self._blocked_since
+                    self._blocked_since = None
+
+        self._in_flight += 1
+
+    def release(self) -> None:
+        if self._in_flight <= 0:
+            raise RuntimeError("Release called more times than acquire")
+
+        self._in_flight -= 1
+        self._parent.release()
@@ -1,7 +1,9 @@
 import asyncio
 import contextlib
+import signal
 import time
-from collections.abc import AsyncIterator, Sequence
+from collections.abc import AsyncIterator, Coroutine, Iterator, Sequence
+from functools import partial
 from typing import Any
 
 from adaptix.load_error import LoadError
@@ -15,6 +17,10 @@ from maxo.routing.signals.shutdown import AfterShutdown, BeforeShutdown
 from maxo.routing.signals.startup import AfterStartup, BeforeStartup
 from maxo.routing.signals.update import MaxoUpdate
 from maxo.routing.utils import collect_used_updates
+from maxo.transport.backpressure import InFlightLimiter, Limiter
+from maxo.transport.markers import BaseMarkerStore, MarkerTracker
+from maxo.transport.schedulers import BaseScheduler, TaskScheduler
+from maxo.transport.workers import ProcessPool, WorkerLost
 
 _DEFAULT_BACKOFF_CONFIG = BackoffConfig(
     min_delay=1.0,
@@ -24,91 +30,240 @@ _DEFAULT_BACKOFF_CONFIG = BackoffConfig(
 )
 
 
-class LongPolling:
+class BaseLongPolling:
+    """Общая часть поллеров: цикл получения апдейтов, лимиты и маркеры."""
+
     def __init__(
         self,
         dispatcher: Dispatcher,
         backoff_config: BackoffConfig = _DEFAULT_BACKOFF_CONFIG,
+        scheduler: BaseScheduler | None = None,
+        marker_store: BaseMarkerStore | None = None,
+        process_pool: ProcessPool | None = None,
+        drain_timeout: float | None = 30.0,
     ) -> None:
         self._dispatcher = dispatcher
         self._backoff_config = backoff_config
+        self._scheduler = scheduler or TaskScheduler()
+        self._marker_store = marker_store
+        self._process_pool = process_pool
+        self._drain_timeout = drain_timeout
+        self._trackers: dict[int, MarkerTracker] = {}
+        self._saved_markers: dict[int, int] = {}
+        self._stop_event = asyncio.Event()
+        self._marker_lock = asyncio.Lock()
         self._lock = asyncio.Lock()
 
-    def run(
+    def stop(self) -> None:
+        """
+        Остановить поллинг.
+
+        Поллер перестаёт запрашивать апдейты, дожидается обработки уже полученных
+        (не дольше `drain_timeout`) и сохраняет маркер.
+        """
+        self._stop_event.set()
+
+    async def _poll(
         self,
         bot: Bot,
+        limiter: Limiter,
         timeout: Omittable[int] = 30,
         limit: Omittable[int] = 100,
         marker: Omittable[int | None] = Omitted(),
-        types: Omittable[Sequence[str]] = Omitted(),
-        auto_close_bot: bool = True,
+        types: Omittable[list[str]] = Omitted(),
         drop_pending_updates: bool = False,
-        **workflow_data: Any,
     ) -> None:
-        asyncio.run(
-            self.start(
-                bot=bot,
-                timeout=timeout,
-                limit=limit,
-                marker=marker,
-                types=types,
-                auto_close_bot=auto_close_bot,
-                drop_pending_updates=drop_pending_updates,
-                **workflow_data,
-            ),
+        if not is_defined(marker):
+            marker = await self._load_marker(bot)
+        tracker = MarkerTracker()
+        self._trackers[bot.state.info.user_id] = tracker
+        self._saved_markers.pop(bot.state.info.user_id, None)
+
+        updates_poller = self._get_updates(
+            bot=bot,
+            timeout=timeout,
+            limit=limit,
+            marker=marker,
+            types=types,
+            drop_pending_updates=drop_pending_updates,
+            tracker=tracker if self._marker_store is not None else None,
         )
 
-    async def start(
+        async for update in updates_poller:
+            await self._acquire_slot(bot, limiter)
+            await self._scheduler.submit(
+                update,
+                partial(self._process_update, update, bot, tracker, limiter),
+                # Отброшенный при остановке апдейт не обработан,
+                # поэтому маркер за ним не сохраняется
+                limiter.release,
+            )
+
+    async def _run_pollers(self, *pollers: Coroutine[Any, Any, None]) -> None:
+        self._stop_event.clear()
+        tasks = [asyncio.create_task(poller) for poller in pollers]
+        stop_waiter = asyncio.create_task(self._stop_event.wait())
+        try:
+            await asyncio.wait(
+                [stop_waiter, *tasks],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            # Прерывается и текущий запрос get_updates
+            stop_waiter.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(stop_waiter, *tasks, return_exceptions=True)
+
+        for task in tasks:
+            if not task.cancelled() and (exception := task.exception()) is not None:
+                raise exception
+
+    async def _drain(self) -> None:
+        loggers.long_polling.info(
+            "Polling stopped, waiting for %d updates",
+            self._scheduler.pending,
+        )
+        dropped = await self._scheduler.drain(timeout=self._drain_timeout)
+        for update in dropped:
+            loggers.long_polling.warning(
+                "Update dropped on shutdown. Update type=%r marker=%r",
+                update.update.__class__.__name__,
+                update.marker,
+            )
+
+        if self._process_pool is not None:
+            await self._process_pool.close()
+
+        if self._marker_store is not None:
+            for bot_id, tracker in self._trackers.items():
+                marker = tracker.committed
+                if marker is not None and self._saved_markers.get(bot_id) != marker:
+                    await self._save_marker(bot_id, marker)
+
+    @contextlib.contextmanager
+    def _handle_signals(self, enabled: bool) -> Iterator[None]:
+        if not enabled:
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        installed = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            # Не поддерживается на Windows и вне главного потока
+            with contextlib.suppress(NotImplementedError, RuntimeError):
+                loop.add_signal_handler(signum, self.stop)
+                installed.append(signum)
+
+        try:
+            yield
+        finally:
+            for signum in installed:
+                loop.remove_signal_handler(signum)
+
+    async def _acquire_slot(self, bot: Bot, limiter: Limiter) -> None:
+        if limiter.has_capacity:
+            await limiter.acquire()
+            return
+
+        loggers.long_polling.debug(
+            "Polling paused: %d updates in flight (username = @%s, bot id = %d)",
+            limiter.in_flight,
+            bot.state.info.username,
+            bot.state.info.user_id,
+        )
+        blocked_time = limiter.blocked_time
+        await limiter.acquire()
+        loggers.long_polling.debug(
+            "Polling resumed after %f seconds (username = @%s, bot id = %d)",
+            limiter.blocked_time - blocked_time,
+            bot.state.info.username,
+            bot.state.info.user_id,
+        )
+
+    async def _process_update(
         self,
+        update: MaxoUpdate[Any],
         bot: Bot,
-        timeout: Omittable[int] = 30,
-        limit: Omittable[int] = 100,
-        marker: Omittable[int | None] = Omitted(),
-        types: Omittable[Sequence[str]] = Omitted(),
-        auto_close_bot: bool = True,
-        drop_pending_updates: bool = False,
-        **workflow_data: Any,
+        tracker: MarkerTracker,
+        limiter: Limiter,
     ) -> None:
-        dispatcher = self._dispatcher
-        types = list(types or collect_used_updates(self._dispatcher))
+        unprocessed = False
+        try:
+            if self._process_pool is not None:
+                await self._process_pool.feed(update, bot)
+            else:
+                await self._dispatcher.feed_max_update(update, bot)
+        except asyncio.CancelledError:
+            # Обработка прервана - маркер за этим апдейтом не сохраняется
+            unprocessed = True
+            raise
+        except WorkerLost:
+            # Апдейт не обработан - маркер за ним не сохраняется,
+            # чтобы после перезапуска получить его заново
+            unprocessed = True
+            loggers.long_polling.warning(
+                "Update lost in worker process. Update type=%r marker=%r",
+                update.update.__class__.__name__,
+                update.marker,
+            )
+        finally:
+            limiter.release()
+            if self._marker_store is not None and not unprocessed:
+                await self._commit_marker(bot, tracker, update)
 
-        async with self._lock:
-            dispatcher.workflow_data.update(bot=bot, **workflow_data)
+    async def _load_marker(self, bot: Bot) -> Omittable[int | None]:
+        if self._marker_store is None:
+            return Omitted()
 
-            await dispatcher.feed_signal(BeforeStartup())
+        marker = await self._marker_store.get_marker(bot.state.info.user_id)
+        if marker is None:
+            return Omitted()
 
-            async with bot.context(auto_close=auto_close_bot):
-                loggers.dispatcher.info(
-                    "Polling started for @%s id=%s",
-                    bot.state.info.username,
-                    bot.state.info.user_id,
-                )
-
-                await dispatcher.feed_signal(AfterStartup(), bot)
-
-                updates_poller = self._get_updates(
-                    bot=bot,
-                    timeout=timeout,
-                    limit=limit,
-                    marker=marker,
-                    types=types,
-                    drop_pending_updates=drop_pending_updates,
-                )
+        loggers.long_polling.info(
+            "Resume polling from marker %d (username = @%s, bot id = %d)",
+            marker,
+            bot.state.info.username,
+            bot.state.info.user_id,
+        )
+        return marker
 
-                with contextlib.suppress(KeyboardInterrupt):
-                    async with asyncio.TaskGroup() as tg:
-                        async for update in updates_poller:
-                            tg.create_task(dispatcher.feed_max_update(update, bot))
+    async def _commit_marker(
+        self,
+        bot: Bot,
+        tracker: MarkerTracker,
+        update: MaxoUpdate[Any],
+    ) -> None:
+        if self._marker_store is None or not (
+            is_defined(update.marker) and update.marker is not None
+        ):
+            return
+        if tracker.complete(update.marker) is None:
+            return
 
-                await dispatcher.feed_signal(BeforeShutdown(), bot)
+        marker = tracker.committed
+        if marker is not None:
+            await self._save_marker(bot.state.info.user_id, marker)
 
-                loggers.dispatcher.info(
-                    "Polling stop for @%s bot id=%s",
-                    bot.state.info.username,
-                    bot.state.info.user_id,
+    async def _save_marker(self, bot_id: int, marker: int) -> None:
+        # Сохранения сериализуются, чтобы более старый маркер
+        # не перезаписал более новый
+        async with self._marker_lock:
+            if self._marker_store is None:
+                return
+            saved = self._saved_markers.get(bot_id)
+            if saved is not None and saved >= marker:
+                return
+            try:
+                await self._marker_store.set_marker(bot_id, marker)
+            except Exception:  # noqa: BLE001
+                loggers.long_polling.exception(
+                    "Failed to save marker %d (bot id = %d)",
+                    marker,
+                    bot_id,
                 )
-
-        await dispatcher.feed_signal(AfterShutdown())
+            else:
+                self._saved_markers[bot_id] = marker
 
     async def _get_updates(
         self,
@@ -118,6 +273,7 @@ class LongPolling:
         marker: Omittable[int | None] = Omitted(),
         types: Omittable[list[str]] = Omitted(),
         drop_pending_updates: bool = False,
+        tracker: MarkerTracker | None = None,
     ) -> AsyncIterator[MaxoUpdate[Any]]:
         start_time = time.time()
         backoff = Backoff(self._backoff_config)
@@ -187,9 +343,142 @@ class LongPolling:
 
             marker = result.marker
 
+            updates = []
             for update in result.updates:
                 if drop_pending_updates and update.timestamp.timestamp() < start_time:
                     loggers.long_polling.debug("Skip pending update: %s", update)
                     continue
+                updates.append(update)
+
+            # Пачка учитывается целиком до выдачи первого апдейта: пока
+            # остальные ждут слота, маркер пачки не должен сохраниться
+            if tracker is not None and updates and result.marker is not None:
+                tracker.track(result.marker, len(updates))
+
+            for update in updates:
                 loggers.long_polling.debug("New update: %s", update)
                 yield MaxoUpdate(update=update, marker=result.marker)
+
+
+class LongPolling(BaseLongPolling):
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        backoff_config: BackoffConfig = _DEFAULT_BACKOFF_CONFIG,
+        max_in_flight: int | None = None,
+        scheduler: BaseScheduler | None = None,
+        marker_store: BaseMarkerStore | None = None,
+        process_pool: ProcessPool | None = None,
+        drain_timeout: float | None = 30.0,
+    ) -> None:
+        super().__init__(
+            dispatcher=dispatcher,
+            backoff_config=backoff_config,
+            scheduler=scheduler,
+            marker_store=marker_store,
+            process_pool=process_pool,
+            drain_timeout=drain_timeout,
+        )
+        self._limiter = InFlightLimiter(max_in_flight)
+
+    @property
+    def in_flight(self) -> int:
+        """Количество апдейтов, которые сейчас обрабатываются."""
+        return self._limiter.in_flight
+
+    @property
+    def blocked_time(self) -> float:
+        """Суммарное время в секундах, когда поллинг стоял из-за `max_in_flight`."""
+        return self._limiter.blocked_time
+
+    @property
+    def blocked_for(self) -> float:
+        """Сколько секунд поллинг стоит прямо сейчас (0, если не стоит)."""
+        return self._limiter.blocked_for
+
+    def run(
+        self,
+        bot: Bot,
+        timeout: Omittable[int] = 30,
+        limit: Omittable[int] = 100,
+        marker: Omittable[int | None] = Omitted(),
+        types: Omittable[Sequence[str]] = Omitted(),
+        auto_close_bot: bool = True,
+        drop_pending_updates: bool = False,
+        handle_signals: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        asyncio.run(
+            self.start(
+                bot=bot,
+                timeout=timeout,
+                limit=limit,
+                marker=marker,
+                types=types,
+                auto_close_bot=auto_close_bot,
+                drop_pending_updates=drop_pending_updates,
+                handle_signals=handle_signals,
+                **workflow_data,
+            ),
+        )
+
+    async def start(
+        self,
+        bot: Bot,
+        timeout: Omittable[int] = 30,
+        limit: Omittable[int] = 100,
+        marker: Omittable[int | None] = Omitted(),
+        types: Omittable[Sequence[str]] = Omitted(),
+        auto_close_bot: bool = True,
+        drop_pending_updates: bool = False,
+        handle_signals: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        dispatcher = self._dispatcher
+        types = list(types or collect_used_updates(self._dispatcher))
+
+        async with self._lock:
+            dispatcher.workflow_data.update(bot=bot, **workflow_data)
+
+            await dispatcher.feed_signal(BeforeStartup())
+
+            async with bot.context(auto_close=auto_close_bot):
+                loggers.dispatcher.info(
+                    "Polling started for @%s id=%s",
+                    bot.state.info.username,
+                    bot.state.info.user_id,
+                )
+
+                await dispatcher.feed_signal(AfterStartup(), bot)
+
+                if self._process_pool is not None:
+                    await self._process_pool.start()
+
+                with (
+                    contextlib.suppress(KeyboardInterrupt),
+                    self._handle_signals(handle_signals),
+                ):
+                    try:
+                        await self._run_pollers(
+                            self._poll(
+                                bot=bot,
+                                limiter=self._limiter,
+                                timeout=timeout,
+                                limit=limit,
+                                marker=marker,
+                                types=types,
+                                drop_pending_updates=drop_pending_updates,
+                            ),
+                        )
+                    finally:
+                        await self._drain()
+
+                await dispatcher.feed_signal(BeforeShutdown(), bot)
+
+                loggers.dispatcher.info(
+                    "Polling stop for @%s bot id=%s",
+                    bot.state.info.username,
+                    bot.state.info.user_id,
+                )
+
+        await dispatcher.feed_signal(AfterShutdown())
@@ -0,0 +1,13 @@
+# `RedisMarkerStore` in maxo.transport.markers.redis
+
+from maxo.transport.markers.base import BaseMarkerStore
+from maxo.transport.markers.file import FileMarkerStore
+from maxo.transport.markers.memory import MemoryMarkerStore
+from maxo.transport.markers.tracker import MarkerTracker
+
+__all__ = (
+    "BaseMarkerStore",
+    "FileMarkerStore",
+    "MarkerTracker",
+    "MemoryMarkerStore",
+)
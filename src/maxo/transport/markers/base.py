@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+
+
+class BaseMarkerStore(ABC):
+    """
+    Хранилище маркера long polling.
+
+    Маркер сохраняется только после того, как все апдейты до него обработаны,
+    поэтому после перезапуска поллинг продолжается с того же места без потери
+    и без повторной обработки апдейтов.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def get_marker(self, bot_id: int) -> int | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_marker(self, bot_id: int, marker: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from maxo.transport.markers.base import BaseMarkerStore
+
+
+class FileMarkerStore(BaseMarkerStore):
+    """
+    Хранилище маркеров в JSON-файле.
+
+    Запись атомарная: данные пишутся во временный файл рядом с целевым,
+    сбрасываются на диск (fsync) и только после этого заменяют исходный файл.
+    """
+
+    __slots__ = ("_lock", "_markers", "_path")
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = asyncio.Lock()
+        self._markers: dict[str, int] | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    async def get_marker(self, bot_id: int) -> int | None:
+        async with self._lock:
+            markers = await self._load()
+            return markers.get(str(bot_id))
+
+    async def set_marker(self, bot_id: int, marker: int) -> None:
+        async with self._lock:
+            markers = await self._load()
+            if markers.get(str(bot_id)) == marker:
+                return
+
+            markers[str(bot_id)] = marker
+            await asyncio.to_thread(self._write, dict(markers))
+
+    async def close(self) -> None:
+        self._markers = None
+
+    async def _load(self) -> dict[str, int]:
+        if self._markers is None:
+            self._markers = await asyncio.to_thread(self._read)
+        return self._markers
+
+    def _read(self) -> dict[str, int]:
+        try:
+            content = self._path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {}
+        return {key: int(value) for key, value in json.loads(content).items()}
+
+    def _write(self, markers: dict[str, int]) -> None:
+        directory = self._path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory,
+            prefix=f".{self._path.name}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(markers, f)
+                f.flush()
+                os.fsync(f.fileno())
+            Path(tmp_path).replace(self._path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._fsync_directory(directory)
+
+    @staticmethod
+    def _fsync_directory(directory: Path) -> None:
+        # На Windows директорию нельзя открыть для fsync
+        if os.name != "posix":
+            return
+
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -0,0 +1,17 @@
+from maxo.transport.markers.base import BaseMarkerStore
+
+
+class MemoryMarkerStore(BaseMarkerStore):
+    __slots__ = ("_markers",)
+
+    def __init__(self) -> None:
+        self._markers: dict[int, int] = {}
+
+    async def get_marker(self, bot_id: int) -> int | None:
+        return self._markers.get(bot_id)
+
+    async def set_marker(self, bot_id: int, marker: int) -> None:
+        self._markers[bot_id] = marker
+
+    async def close(self) -> None:
+        self._markers.clear()
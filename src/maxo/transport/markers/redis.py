@@ -0,0 +1,45 @@
+try:
+    from redis.asyncio import ConnectionPool, Redis
+except ImportError as e:
+    e.add_note("* Please run `pip install maxo[redis]`")
+    raise
+
+from typing import Any
+
+from maxo.transport.markers.base import BaseMarkerStore
+
+
+class RedisMarkerStore(BaseMarkerStore):
+    __slots__ = ("prefix", "redis")
+
+    def __init__(self, redis: Redis, prefix: str = "maxo:marker") -> None:
+        self.redis = redis
+        self.prefix = prefix
+
+    def build_key(self, bot_id: int) -> str:
+        return f"{self.prefix}:{bot_id}"
+
+    async def get_marker(self, bot_id: int) -> int | None:
+        value = await self.redis.get(self.build_key(bot_id))
+        if value is None:
+            return None
+        return int(value)
+
+    async def set_marker(self, bot_id: int, marker: int) -> None:
+        await self.redis.set(self.build_key(bot_id), marker)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        connection_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> "RedisMarkerStore":
+        if connection_kwargs is None:
+            connection_kwargs = {}
+        pool = ConnectionPool.from_url(url, **connection_kwargs)
+        redis = Redis(connection_pool=pool)
+        return cls(redis=redis, **kwargs)
@@ -0,0 +1,48 @@
+class MarkerTracker:
+    """
+    Отслеживает, до какого маркера все апдейты уже обработаны.
+
+    Апдейты одной пачки `get_updates` имеют общий маркер - маркер следующей пачки.
+    Маркер можно сохранять, только когда обработаны все апдейты его пачки
+    и всех предыдущих пачек.
+    """
+
+    __slots__ = ("_committed", "_pending")
+
+    def __init__(self) -> None:
+        # dict сохраняет порядок вставки - порядок пачек
+        self._pending: dict[int, int] = {}
+        self._committed: int | None = None
+
+    @property
+    def committed(self) -> int | None:
+        """Последний маркер, до которого все апдейты обработаны."""
+        return self._committed
+
+    def track(self, marker: int, count: int = 1) -> None:
+        """
+        Учесть ``count`` апдейтов пачки `marker`.
+
+        Пачку нужно учитывать целиком сразу после получения, иначе маркер
+        сохранится, когда обработана только её часть.
+        """
+        self._pending[marker] = self._pending.get(marker, 0) + count
+
+    def complete(self, marker: int) -> int | None:
+        """
+        Отметить апдейт пачки `marker` обработанным.
+
+        :return: Новый маркер для сохранения или None, если он не сдвинулся.
+        """
+        self._pending[marker] -= 1
+
+        committed = None
+        for pending_marker, count in list(self._pending.items()):
+            if count:
+                break
+            del self._pending[pending_marker]
+            committed = pending_marker
+
+        if committed is not None:
+            self._committed = committed
+        return committed
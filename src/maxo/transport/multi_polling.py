@@ -0,0 +1,213 @@
+import asyncio
+import contextlib
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Any
+
+from adaptix import Retort
+from aiohttp import TCPConnector
+
+from maxo import loggers
+from maxo.backoff import BackoffConfig
+from maxo.bot.bot import Bot
+from maxo.bot.defaults import BotDefaults
+from maxo.omit import Omittable, Omitted
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals.shutdown import AfterShutdown, BeforeShutdown
+from maxo.routing.signals.startup import AfterStartup, BeforeStartup
+from maxo.routing.utils import collect_used_updates
+from maxo.serialization import create_retort
+from maxo.transport.backpressure import FairInFlightLimiter, FairLimiterMember
+from maxo.transport.long_polling import _DEFAULT_BACKOFF_CONFIG, BaseLongPolling
+from maxo.transport.markers import BaseMarkerStore
+from maxo.transport.schedulers import BaseScheduler
+from maxo.transport.workers import ProcessPool
+
+
+class MultiBotPolling(BaseLongPolling):
+    """
+    Long polling нескольких ботов в одном event loop.
+
+    Боты разделяют один прогретый Retort и один aiohttp-коннектор,
+    а `max_in_flight` - общий лимит на все боты, который раздаётся по кругу.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        backoff_config: BackoffConfig = _DEFAULT_BACKOFF_CONFIG,
+        max_in_flight: int | None = None,
+        scheduler: BaseScheduler | None = None,
+        marker_store: BaseMarkerStore | None = None,
+        process_pool: ProcessPool | None = None,
+        drain_timeout: float | None = 30.0,
+        connector_limit: int = 100,
+    ) -> None:
+        super().__init__(
+            dispatcher=dispatcher,
+            backoff_config=backoff_config,
+            scheduler=scheduler,
+            marker_store=marker_store,
+            process_pool=process_pool,
+            drain_timeout=drain_timeout,
+        )
+        self._limiter = FairInFlightLimiter(max_in_flight)
+        self._members: dict[int, FairLimiterMember] = {}
+        self._connector_limit = connector_limit
+
+    @property
+    def in_flight(self) -> int:
+        """Количество апдейтов всех ботов, которые сейчас обрабатываются."""
+        return self._limiter.in_flight
+
+    @property
+    def limiters(self) -> Mapping[int, FairLimiterMember]:
+        """Счётчики общего лимита по id ботов."""
+        return MappingProxyType(self._members)
+
+    def run(
+        self,
+        tokens: Sequence[str],
+        defaults: BotDefaults | None = None,
+        timeout: Omittable[int] = 30,
+        limit: Omittable[int] = 100,
+        types: Omittable[Sequence[str]] = Omitted(),
+        drop_pending_updates: bool = False,
+        handle_signals: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        asyncio.run(
+            self.start(
+                tokens=tokens,
+                defaults=defaults,
+                timeout=timeout,
+                limit=limit,
+                types=types,
+                drop_pending_updates=drop_pending_updates,
+                handle_signals=handle_signals,
+                **workflow_data,
+            ),
+        )
+
+    async def start(
+        self,
+        tokens: Sequence[str],
+        defaults: BotDefaults | None = None,
+        timeout: Omittable[int] = 30,
+        limit: Omittable[int] = 100,
+        types: Omittable[Sequence[str]] = Omitted(),
+        drop_pending_updates: bool = False,
+        handle_signals: bool = True,
+        **workflow_data: Any,
+    ) -> None:
+        if not tokens:
+            raise ValueError("At least one token is required")
+
+        dispatcher = self._dispatcher
+        types = list(types or collect_used_updates(self._dispatcher))
+
+        async with self._lock:
+            dispatcher.workflow_data.update(**workflow_data)
+
+            await dispatcher.feed_signal(BeforeStartup())
+
+            self._members.clear()
+            defaults = defaults or BotDefaults()
+            retort = create_retort(defaults=defaults)
+            connector = TCPConnector(limit=self._connector_limit)
+            try:
+                bots = await self._start_bots(
+                    tokens=tokens,
+                    defaults=defaults,
+                    retort=retort,
+                    connector=connector,
+                )
+                dispatcher.workflow_data["bots"] = bots
+
+                try:
+                    for bot in bots:
+                        await dispatcher.feed_signal(AfterStartup(), bot)
+
+                    if self._process_pool is not None:
+                        await self._process_pool.start()
+
+                    with (
+                        contextlib.suppress(KeyboardInterrupt),
+                        self._handle_signals(handle_signals),
+                    ):
+                        try:
+                            await self._run_pollers(
+                                *(
+                                    self._poll(
+                                        bot=bot,
+                                        limiter=self._members[bot.state.info.user_id],
+                                        timeout=timeout,
+                                        limit=limit,
+                                        types=types,
+                                        drop_pending_updates=drop_pending_updates,
+                                    )
+                                    for bot in bots
+                                ),
+                            )
+                        finally:
+                            await self._drain()
+
+                    for bot in bots:
+                        await dispatcher.feed_signal(BeforeShutdown(), bot)
+                finally:
+                    await asyncio.gather(*(bot.close() for bot in bots))
+                    loggers.dispatcher.info("Polling stop for %d bots", len(bots))
+            finally:
+                await connector.close()
+
+        await dispatcher.feed_signal(AfterShutdown())
+
+    async def _start_bots(
+        self,
+        tokens: Sequence[str],
+        defaults: BotDefaults,
+        retort: Retort,
+        connector: TCPConnector,
+    ) -> list[Bot]:
+        candidates = [
+            Bot(token, defaults=defaults, retort=retort, connector=connector)
+            for token in tokens
+        ]
+        results = await asyncio.gather(
+            *(bot.start() for bot in candidates),
+            return_exceptions=True,
+        )
+
+        bots: list[Bot] = []
+        for index, (bot, result) in enumerate(zip(candidates, results, strict=True)):
+            if isinstance(result, BaseException):
+                loggers.dispatcher.error(
+                    "Failed to start bot #%d - %s: %s",
+                    index,
+                    type(result).__name__,
+                    result,
+                )
+                await bot.close()
+                continue
+
+            bot_id = bot.state.info.user_id
+            if bot_id in self._members:
+                loggers.dispatcher.warning(
+                    "Skip duplicate token for @%s id=%s",
+                    bot.state.info.username,
+                    bot_id,
+                )
+                await bot.close()
+                continue
+
+            self._members[bot_id] = self._limiter.member(bot_id)
+            bots.append(bot)
+            loggers.dispatcher.info(
+                "Polling started for @%s id=%s",
+                bot.state.info.username,
+                bot_id,
+            )
+
+        if not bots:
+            raise RuntimeError("No bot could be started")
+        return bots
@@ -0,0 +1,12 @@
+from maxo.transport.schedulers.base import BaseScheduler
+from maxo.transport.schedulers.ordered import ChatOrderedScheduler, chat_key
+from maxo.transport.schedulers.queue import QueueScheduler
+from maxo.transport.schedulers.task import TaskScheduler
+
+__all__ = (
+    "BaseScheduler",
+    "ChatOrderedScheduler",
+    "QueueScheduler",
+    "TaskScheduler",
+    "chat_key",
+)
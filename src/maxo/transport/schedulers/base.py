@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from maxo.routing.signals.update import MaxoUpdate
+
+Job = Callable[[], Awaitable[Any]]
+# Освобождает ресурсы, занятые под задачу, если она так и не была запущена
+DropCallback = Callable[[], Any]
+
+
+class BaseScheduler(ABC):
+    """
+    Планировщик обработки апдейтов.
+
+    Транспорт (поллинг или вебхук) передаёт в него апдейт и задачу его обработки,
+    а планировщик решает, когда и где эта задача будет выполнена.
+    """
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def pending(self) -> int:
+        """Количество принятых, но ещё не обработанных апдейтов."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> None:
+        """
+        Принять апдейт в обработку.
+
+        :param update: Апдейт, по которому планировщик выбирает место выполнения.
+        :param job: Корутинная функция без аргументов, обрабатывающая апдейт.
+        :param on_drop: Вызывается вместо `job`, если апдейт отброшен
+            (например, в :meth:`drain`) до начала обработки. Задача,
+            которая начала выполняться, освобождает свои ресурсы сама.
+        """
+        raise NotImplementedError
+
+    async def try_submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> bool:
+        """
+        Принять апдейт в обработку, если для него есть место.
+
+        В отличие от :meth:`submit`, не ждёт освобождения места.
+
+        :return: False, если апдейт не принят. `on_drop` в этом случае
+            не вызывается.
+        """
+        await self.submit(update, job, on_drop)
+        return True
+
+    @abstractmethod
+    async def drain(self, timeout: float | None = None) -> list[MaxoUpdate[Any]]:
+        """
+        Дождаться обработки принятых апдейтов и освободить ресурсы.
+
+        :param timeout: Сколько секунд ждать, None - без ограничения.
+            Апдейты, которые не успели обработаться, отменяются.
+        :return: Отменённые апдейты.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Дождаться обработки всех принятых апдейтов и освободить ресурсы."""
+        await self.drain()
@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import itertools
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from maxo import loggers
+from maxo.routing.middlewares.update_context import resolve_update_context
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers.base import BaseScheduler, DropCallback, Job
+
+UpdateKey = Callable[[MaxoUpdate[Any]], Hashable | None]
+_Entry = tuple[MaxoUpdate[Any], Job, DropCallback | None]
+
+
+def chat_key(update: MaxoUpdate[Any]) -> Hashable | None:
+    """Ключ шардирования по умолчанию: `chat_id`, а если его нет - `user_id`."""
+    update_context = resolve_update_context(update.update)
+    if update_context.chat_id is not None:
+        return update_context.chat_id
+    return update_context.user_id
+
+
+class ChatOrderedScheduler(BaseScheduler):
+    """
+    Планировщик со строгим порядком внутри чата и параллелизмом между чатами.
+
+    Апдейты распределяются по `workers` очередям по ключу (по умолчанию - чат).
+    Каждую очередь последовательно разбирает свой воркер, поэтому апдейты одного
+    чата обрабатываются строго по очереди, а разные чаты - параллельно, без
+    конкуренции за блокировки.
+
+    Апдейты без ключа распределяются по очередям по кругу.
+
+    :param workers: Количество воркеров (и очередей).
+    :param key: Функция, возвращающая ключ шардирования апдейта.
+    :param queue_size: Максимальный размер каждой очереди, 0 - без ограничения.
+        Если очередь заполнена, `submit` ждёт освобождения места,
+        а `try_submit` возвращает False.
+    """
+
+    __slots__ = (
+        "_current",
+        "_key",
+        "_pending",
+        "_queues",
+        "_round_robin",
+        "_workers",
+    )
+
+    def __init__(
+        self,
+        workers: int = 8,
+        key: UpdateKey = chat_key,
+        queue_size: int = 0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+
+        self._key = key
+        self._queues: list[asyncio.Queue[_Entry]] = [
+            asyncio.Queue(maxsize=queue_size) for _ in range(workers)
+        ]
+        self._workers: list[asyncio.Task[None]] = []
+        self._current: list[MaxoUpdate[Any] | None] = [None] * workers
+        self._round_robin = itertools.count()
+        self._pending = 0
+
+    @property
+    def workers(self) -> int:
+        return len(self._queues)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def shard(self, update: MaxoUpdate[Any]) -> int:
+        key = self._key(update)
+        if key is None:
+            return next(self._round_robin) % len(self._queues)
+        return hash(key) % len(self._queues)
+
+    async def submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> None:
+        self._start_workers()
+        self._pending += 1
+        try:
+            await self._queues[self.shard(update)].put((update, job, on_drop))
+        except BaseException:
+            self._pending -= 1
+            raise
+
+    async def try_submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> bool:
+        self._start_workers()
+        try:
+            self._queues[self.shard(update)].put_nowait((update, job, on_drop))
+        except asyncio.QueueFull:
+            return False
+
+        self._pending += 1
+        return True
+
+    async def drain(self, timeout: float | None = None) -> list[MaxoUpdate[Any]]:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)),
+                timeout=timeout,
+            )
+
+        dropped = [update for update in self._current if update is not None]
+        for queue in self._queues:
+            while not queue.empty():
+                update, _, on_drop = queue.get_nowait()
+                dropped.append(update)
+                self._pending -= 1
+                queue.task_done()
+                if on_drop is not None:
+                    on_drop()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        return dropped
+
+    def _start_workers(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(index, queue))
+                for index, queue in enumerate(self._queues)
+            ]
+
+    async def _work(
+        self,
+        index: int,
+        queue: asyncio.Queue[_Entry],
+    ) -> None:
+        while True:
+            update, job, _ = await queue.get()
+            self._current[index] = update
+            try:
+                await job()
+            except Exception:  # noqa: BLE001
+                loggers.dispatcher.exception(
+                    "Update processing failed. Update type=%r marker=%r",
+                    update.update.__class__.__name__,
+                    update.marker,
+                )
+            finally:
+                self._current[index] = None
+                self._pending -= 1
+                queue.task_done()
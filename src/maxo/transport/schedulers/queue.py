@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import time
+from typing import Any
+
+from maxo import loggers
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers.base import BaseScheduler, DropCallback, Job
+
+_Entry = tuple[MaxoUpdate[Any], Job, DropCallback | None, float]
+
+
+class QueueScheduler(BaseScheduler):
+    """
+    Ограниченная очередь и фиксированный пул воркеров.
+
+    В отличие от :class:`TaskScheduler`, количество одновременно обрабатываемых
+    и ожидающих апдейтов ограничено. Если очередь заполнена, :meth:`submit` ждёт
+    освобождения места, а :meth:`try_submit` сразу возвращает False - так вебхук
+    может ответить серверу ошибкой, и тот повторит доставку позже.
+
+    :param workers: Количество воркеров.
+    :param max_size: Максимальное количество апдейтов в очереди.
+    """
+
+    __slots__ = (
+        "_current",
+        "_max_wait_time",
+        "_processed",
+        "_queue",
+        "_rejected",
+        "_total_wait_time",
+        "_worker_count",
+        "_workers",
+    )
+
+    def __init__(self, workers: int = 8, max_size: int = 1000) -> None:
+        if workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+        if max_size < 1:
+            raise ValueError("`max_size` should be greater than 0")
+
+        self._worker_count = workers
+        self._queue: asyncio.Queue[_Entry] = asyncio.Queue(maxsize=max_size)
+        self._workers: list[asyncio.Task[None]] = []
+        self._current: list[MaxoUpdate[Any] | None] = [None] * workers
+        self._processed = 0
+        self._rejected = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() + sum(update is not None for update in self._current)
+
+    @property
+    def depth(self) -> int:
+        """Количество апдейтов, ожидающих в очереди."""
+        return self._queue.qsize()
+
+    @property
+    def max_size(self) -> int:
+        return self._queue.maxsize
+
+    @property
+    def rejected(self) -> int:
+        """Количество апдейтов, не принятых :meth:`try_submit` из-за переполнения."""
+        return self._rejected
+
+    @property
+    def wait_time(self) -> float:
+        """Среднее время ожидания апдейта в очереди в секундах."""
+        if not self._processed:
+            return 0.0
+        return self._total_wait_time / self._processed
+
+    @property
+    def max_wait_time(self) -> float:
+        """Максимальное время ожидания апдейта в очереди в секундах."""
+        return self._max_wait_time
+
+    async def submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> None:
+        self._start_workers()
+        await self._queue.put((update, job, on_drop, time.monotonic()))
+
+    async def try_submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> bool:
+        self._start_workers()
+        try:
+            self._queue.put_nowait((update, job, on_drop, time.monotonic()))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            return False
+        return True
+
+    async def drain(self, timeout: float | None = None) -> list[MaxoUpdate[Any]]:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+
+        dropped = [update for update in self._current if update is not None]
+        while not self._queue.empty():
+            update, _, on_drop, _ = self._queue.get_nowait()
+            dropped.append(update)
+            self._queue.task_done()
+            if on_drop is not None:
+                on_drop()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        return dropped
+
+    def _start_workers(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(index))
+                for index in range(self._worker_count)
+            ]
+
+    async def _work(self, index: int) -> None:
+        while True:
+            update, job, _, enqueued_at = await self._queue.get()
+            wait_time = time.monotonic() - enqueued_at
+            self._processed += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+
+            self._current[index] = update
+            try:
+                await job()
+            except Exception:  # noqa: BLE001
+                loggers.dispatcher.exception(
+                    "Update processing failed. Update type=%r marker=%r",
+                    update.update.__class__.__name__,
+                    update.marker,
+                )
+            finally:
+                self._current[index] = None
+                self._queue.task_done()
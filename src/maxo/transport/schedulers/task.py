@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any
+
+from maxo import loggers
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers.base import BaseScheduler, DropCallback, Job
+
+
+class TaskScheduler(BaseScheduler):
+    """Обрабатывает каждый апдейт в отдельной `asyncio.Task` без ограничений."""
+
+    __slots__ = ("_on_drop", "_tasks")
+
+    def __init__(self) -> None:
+        self._tasks: dict[asyncio.Task[Any], MaxoUpdate[Any]] = {}
+        # Задачи, которые ещё не начали выполняться
+        self._on_drop: dict[asyncio.Task[Any], DropCallback] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def submit(
+        self,
+        update: MaxoUpdate[Any],
+        job: Job,
+        on_drop: DropCallback | None = None,
+    ) -> None:
+        if on_drop is None:
+            task = asyncio.create_task(job())
+        else:
+            task = asyncio.create_task(self._run(job))
+            self._on_drop[task] = on_drop
+        self._tasks[task] = update
+        task.add_done_callback(self._discard)
+
+    async def drain(self, timeout: float | None = None) -> list[MaxoUpdate[Any]]:
+        if not self._tasks:
+            return []
+
+        _, pending = await asyncio.wait(list(self._tasks), timeout=timeout)
+        dropped = [self._tasks[task] for task in pending]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return dropped
+
+    async def _run(self, job: Job) -> Any:
+        self._on_drop.pop(asyncio.current_task(), None)  # type: ignore[arg-type]
+        return await job()
+
+    def _discard(self, task: asyncio.Task[Any]) -> None:
+        update = self._tasks.pop(task, None)
+        # Задача отменена до начала выполнения
+        on_drop = self._on_drop.pop(task, None)
+        if on_drop is not None:
+            on_drop()
+
+        if task.cancelled() or update is None:
+            return
+        exception = task.exception()
+        if exception is not None:
+            # Ошибки вне диспетчера (например, хранилища маркеров) иначе
+            # не увидит никто
+            loggers.dispatcher.error(
+                "Update processing failed. Update type=%r marker=%r",
+                update.update.__class__.__name__,
+                update.marker,
+                exc_info=exception,
+            )
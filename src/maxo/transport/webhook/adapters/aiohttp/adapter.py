@@ -4,7 +4,6 @@ from ipaddress import IPv4Address, IPv6Address
 from json import JSONDecodeError
 from typing import Any, cast
 
-from aiohttp import ContentTypeError
 from aiohttp.web import Application, Request
 from aiohttp.web_response import Response, json_response
 
@@ -12,21 +11,47 @@ from maxo.transport.webhook.adapters.aiohttp.mapping import (
     AiohttpHeadersMapping,
     AiohttpQueryMapping,
 )
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.webhook.adapters.base_adapter import (
+    BoundRequest,
+    RawBodyBoundRequest,
+    WebAdapter,
+)
 from maxo.transport.webhook.adapters.base_mapping import MappingABC
 
+JSON_CONTENT_TYPE = "application/json"
+
+
+def _is_json_content_type(content_type: str) -> bool:
+    return content_type == JSON_CONTENT_TYPE or (
+        content_type.startswith("application/") and content_type.endswith("+json")
+    )
 
-class AiohttpBoundRequest(BoundRequest[Request]):
+
+class AiohttpBoundRequest(RawBodyBoundRequest[Request]):
     def __init__(self, request: Request) -> None:
         super().__init__(request)
         self._headers = AiohttpHeadersMapping(self.request.headers)
         self._query_params = AiohttpQueryMapping(self.request.query)
 
-    async def json(self) -> dict[str, Any]:
-        try:
-            return await self.request.json()
-        except ContentTypeError as e:
-            raise JSONDecodeError(str(e), "", 0) from e
+    async def read(self, max_size: int | None = None) -> bytes:
+        # The body is always decoded as JSON, so keep rejecting other
+        # content types with JSONDecodeError as request.json() used to
+        content_type = self.request.content_type
+        if not _is_json_content_type(content_type):
+            msg = f"Attempt to decode JSON with unexpected mimetype: {content_type}"
+            raise JSONDecodeError(msg, "", 0)
+
+        content_length = self.request.content_length
+        self._check_size(content_length, max_size)
+        if max_size is None or content_length is not None:
+            return await self.request.read()
+
+        # Chunked body: stop reading as soon as the limit is exceeded
+        body = bytearray()
+        async for chunk in self.request.content.iter_any():
+            body += chunk
+            self._check_size(len(body), max_size)
+        return bytes(body)
 
     @property
     def client_ip(self) -> IPv4Address | IPv6Address | str | None:
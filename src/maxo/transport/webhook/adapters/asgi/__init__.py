@@ -0,0 +1,14 @@
+from .adapter import AsgiBoundRequest, AsgiRequest, AsgiWebAdapter
+from .app import AsgiApp
+from .mapping import AsgiHeadersMapping, AsgiQueryMapping
+from .response import AsgiResponse
+
+__all__ = (
+    "AsgiApp",
+    "AsgiBoundRequest",
+    "AsgiHeadersMapping",
+    "AsgiQueryMapping",
+    "AsgiRequest",
+    "AsgiResponse",
+    "AsgiWebAdapter",
+)
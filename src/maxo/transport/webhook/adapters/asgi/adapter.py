@@ -0,0 +1,170 @@
+from collections.abc import Awaitable, Callable, Mapping
+from ipaddress import IPv4Address, IPv6Address
+from typing import Any
+
+from maxo.transport.webhook.adapters.asgi.app import AsgiApp, Receive, Scope
+from maxo.transport.webhook.adapters.asgi.mapping import (
+    AsgiHeadersMapping,
+    AsgiQueryMapping,
+)
+from maxo.transport.webhook.adapters.asgi.response import AsgiResponse
+from maxo.transport.webhook.adapters.base_adapter import (
+    BoundRequest,
+    RawBodyBoundRequest,
+    WebAdapter,
+)
+from maxo.transport.webhook.adapters.base_mapping import MappingABC
+
+# Engine responses with a fixed body, built once in advance
+_STATIC_PAYLOADS: tuple[tuple[int, dict[str, Any]], ...] = (
+    (200, {}),
+    (400, {"detail": "Bad request"}),
+    (400, {"detail": "Bot not found"}),
+    (403, {"detail": "Forbidden"}),
+    (413, {"detail": "Payload too large"}),
+    (503, {"detail": "Shutting down"}),
+)
+_MAX_CACHED_RESPONSES = 64
+
+
+class AsgiRequest:
+    """Raw ASGI request: connection scope, receive channel and path parameters."""
+
+    __slots__ = ("path_params", "receive", "scope")
+
+    def __init__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        path_params: dict[str, str],
+    ) -> None:
+        self.scope = scope
+        self.receive = receive
+        self.path_params = path_params
+
+
+class AsgiBoundRequest(RawBodyBoundRequest[AsgiRequest]):
+    __slots__ = ("_body", "_headers", "_query_params")
+
+    def __init__(self, request: AsgiRequest) -> None:
+        super().__init__(request)
+        self._body: bytes | None = None
+        self._headers: AsgiHeadersMapping | None = None
+        self._query_params: AsgiQueryMapping | None = None
+
+    async def read(self, max_size: int | None = None) -> bytes:
+        if self._body is not None:
+            self._check_size(len(self._body), max_size)
+            return self._body
+
+        content_length = self.headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            self._check_size(int(content_length), max_size)
+
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await self.request.receive()
+            if message["type"] == "http.disconnect":
+                break
+
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            self._check_size(size, max_size)
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+
+        self._body = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        return self._body
+
+    @property
+    def client_ip(self) -> IPv4Address | IPv6Address | str | None:
+        client = self.request.scope.get("client")
+        if client:
+            return client[0]
+        return None
+
+    @property
+    def headers(self) -> MappingABC[Mapping[str, Any]]:
+        if self._headers is None:
+            self._headers = AsgiHeadersMapping(self.request.scope["headers"])
+        return self._headers
+
+    @property
+    def query_params(self) -> MappingABC[Mapping[str, Any]]:
+        if self._query_params is None:
+            self._query_params = AsgiQueryMapping(
+                self.request.scope.get("query_string", b""),
+            )
+        return self._query_params
+
+    @property
+    def path_params(self) -> dict[str, Any]:
+        return self.request.path_params
+
+
+class AsgiWebAdapter(WebAdapter):
+    """
+    Web adapter for plain ASGI servers without a web framework.
+
+    Webhook endpoints are registered in an :class:`AsgiApp`. Responses with
+    a fixed body (``200 {}``, ``400``, ``403`` and other engine replies)
+    are encoded once and reused for every request.
+    """
+
+    def __init__(self) -> None:
+        self._responses: dict[tuple[int, str | None], AsgiResponse] = {}
+        for status, payload in _STATIC_PAYLOADS:
+            self.create_json_response(status=status, payload=payload)
+
+    def bind(self, request: AsgiRequest) -> AsgiBoundRequest:
+        return AsgiBoundRequest(request=request)
+
+    def register(
+        self,
+        app: AsgiApp,
+        path: str,
+        handler: Callable[[BoundRequest[Any]], Awaitable[Any]],
+        on_startup: Callable[..., Awaitable[Any]] | None = None,
+        on_shutdown: Callable[..., Awaitable[Any]] | None = None,
+    ) -> None:
+        async def endpoint(
+            scope: Scope,
+            receive: Receive,
+            path_params: dict[str, str],
+        ) -> AsgiResponse:
+            return await handler(self.bind(AsgiRequest(scope, receive, path_params)))
+
+        app.add_route(path=path, endpoint=endpoint)
+
+        if on_startup is not None:
+            app.on_startup.append(on_startup)
+        if on_shutdown is not None:
+            app.on_shutdown.append(on_shutdown)
+
+    def create_json_response(
+        self,
+        status: int,
+        payload: dict[str, Any],
+    ) -> AsgiResponse:
+        key = _cache_key(status, payload)
+        if key is None:
+            return AsgiResponse.json(status, payload)
+
+        response = self._responses.get(key)
+        if response is None:
+            response = AsgiResponse.json(status, payload)
+            if len(self._responses) < _MAX_CACHED_RESPONSES:
+                self._responses[key] = response
+        return response
+
+
+def _cache_key(status: int, payload: dict[str, Any]) -> tuple[int, str | None] | None:
+    if not payload:
+        return status, None
+
+    detail = payload.get("detail")
+    if len(payload) == 1 and isinstance(detail, str):
+        return status, detail
+    return None
@@ -0,0 +1,106 @@
+import re
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import Any
+
+from maxo import loggers
+from maxo.transport.webhook.adapters.asgi.response import AsgiResponse
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Endpoint = Callable[[Scope, Receive, dict[str, str]], Awaitable[AsgiResponse]]
+LifespanCallback = Callable[..., Awaitable[Any]]
+
+_PARAM_RE = re.compile(r"\{(\w+)\}")
+
+NOT_FOUND = AsgiResponse.json(404, {"detail": "Not found"})
+METHOD_NOT_ALLOWED = AsgiResponse.json(405, {"detail": "Method not allowed"})
+
+
+class AsgiApp:
+    """
+    Minimal ASGI application for webhook endpoints.
+
+    Only POST routes registered by
+    :class:`~maxo.transport.webhook.adapters.asgi.AsgiWebAdapter` and
+    the lifespan protocol are supported, so the app can be run by any ASGI
+    server (uvicorn, granian, hypercorn) without a web framework.
+
+    Path parameters use the ``{name}`` syntax and match one path segment.
+    """
+
+    def __init__(self) -> None:
+        self.on_startup: list[LifespanCallback] = []
+        self.on_shutdown: list[LifespanCallback] = []
+        self._static_routes: dict[str, Endpoint] = {}
+        self._dynamic_routes: list[tuple[re.Pattern[str], Endpoint]] = []
+
+    def add_route(self, path: str, endpoint: Endpoint) -> None:
+        if not _PARAM_RE.search(path):
+            self._static_routes[path] = endpoint
+            return
+
+        pattern = ""
+        position = 0
+        for match in _PARAM_RE.finditer(path):
+            pattern += re.escape(path[position : match.start()])
+            pattern += f"(?P<{match.group(1)}>[^/]+)"
+            position = match.end()
+        pattern += re.escape(path[position:])
+        self._dynamic_routes.append((re.compile(pattern), endpoint))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope_type = scope["type"]
+        if scope_type == "http":
+            await self._handle_http(scope, receive, send)
+        elif scope_type == "lifespan":
+            await self._handle_lifespan(receive, send)
+        elif scope_type == "websocket":
+            await send({"type": "websocket.close"})
+
+    def _resolve(self, path: str) -> tuple[Endpoint, dict[str, str]] | None:
+        endpoint = self._static_routes.get(path)
+        if endpoint is not None:
+            return endpoint, {}
+
+        for pattern, endpoint in self._dynamic_routes:
+            match = pattern.fullmatch(path)
+            if match is not None:
+                return endpoint, match.groupdict()
+        return None
+
+    async def _handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        resolved = self._resolve(scope["path"])
+        if resolved is None:
+            await NOT_FOUND.send(send)
+            return
+        if scope["method"] != "POST":
+            await METHOD_NOT_ALLOWED.send(send)
+            return
+
+        endpoint, path_params = resolved
+        response = await endpoint(scope, receive, path_params)
+        await response.send(send)
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                event, callbacks = "startup", self.on_startup
+            elif message["type"] == "lifespan.shutdown":
+                event, callbacks = "shutdown", self.on_shutdown
+            else:
+                continue
+
+            try:
+                for callback in callbacks:
+                    await callback(self)
+            except Exception as e:  # noqa: BLE001
+                loggers.webhook.exception("ASGI lifespan %s failed", event)
+                await send({"type": f"lifespan.{event}.failed", "message": str(e)})
+                return
+
+            await send({"type": f"lifespan.{event}.complete"})
+            if event == "shutdown":
+                return
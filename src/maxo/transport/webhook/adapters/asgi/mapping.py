@@ -0,0 +1,45 @@
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import parse_qsl
+
+from maxo.transport.webhook.adapters.base_mapping import MappingABC
+
+
+class AsgiHeadersMapping(MappingABC[dict[str, str]]):
+    """Case-insensitive view of raw ASGI headers."""
+
+    def __init__(self, raw_headers: Iterable[tuple[bytes, bytes]]) -> None:
+        first: dict[str, str] = {}
+        self._lists: dict[str, list[str]] = {}
+        for raw_name, raw_value in raw_headers:
+            name = raw_name.decode("latin-1").lower()
+            value = raw_value.decode("latin-1")
+            first.setdefault(name, value)
+            self._lists.setdefault(name, []).append(value)
+        super().__init__(first)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._mapping.get(name.lower(), default)
+
+    def getlist(self, name: str) -> list[Any]:
+        return list(self._lists.get(name.lower(), ()))
+
+    def __getitem__(self, name: str) -> Any:
+        return self._mapping[name.lower()]
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._mapping
+
+
+class AsgiQueryMapping(MappingABC[dict[str, str]]):
+    def __init__(self, query_string: bytes) -> None:
+        first: dict[str, str] = {}
+        self._lists: dict[str, list[str]] = {}
+        pairs = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+        for name, value in pairs:
+            first.setdefault(name, value)
+            self._lists.setdefault(name, []).append(value)
+        super().__init__(first)
+
+    def getlist(self, name: str) -> list[Any]:
+        return list(self._lists.get(name, ()))
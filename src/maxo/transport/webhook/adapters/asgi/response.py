@@ -0,0 +1,41 @@
+import json
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import Any
+
+_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+class AsgiResponse:
+    """Prebuilt ASGI response: the status, headers and body are encoded once."""
+
+    __slots__ = ("_body_message", "_start_message")
+
+    def __init__(self, status: int, body: bytes) -> None:
+        self._start_message: dict[str, Any] = {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [_CONTENT_TYPE, (b"content-length", str(len(body)).encode())],
+        }
+        self._body_message: dict[str, Any] = {
+            "type": "http.response.body",
+            "body": body,
+        }
+
+    @classmethod
+    def json(cls, status: int, payload: dict[str, Any]) -> "AsgiResponse":
+        return cls(status, json.dumps(payload, separators=(",", ":")).encode())
+
+    @property
+    def status(self) -> int:
+        return self._start_message["status"]
+
+    @property
+    def body(self) -> bytes:
+        return self._body_message["body"]
+
+    async def send(
+        self,
+        send: Callable[[MutableMapping[str, Any]], Awaitable[None]],
+    ) -> None:
+        await send(self._start_message)
+        await send(self._body_message)
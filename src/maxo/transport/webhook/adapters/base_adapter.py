@@ -1,10 +1,15 @@
+import json
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable, Mapping
 from ipaddress import IPv4Address, IPv6Address
+from json import JSONDecodeError
 from typing import Any, Generic, TypeVar
 
+from maxo.errors import PayloadTooLargeError
 from maxo.transport.webhook.adapters.base_mapping import MappingABC
 
+JsonLoads = Callable[[str | bytes | bytearray], Any]
+
 R = TypeVar("R")
 
 
@@ -46,6 +51,61 @@ class BoundRequest(ABC, Generic[R]):
         raise NotImplementedError
 
 
+class RawBodyBoundRequest(BoundRequest[R], Generic[R]):
+    """
+    Request whose raw body can be read.
+
+    The webhook engine reads such requests with :meth:`read`, so it can limit
+    the body size and decode it with the bot's ``json_loads``. Requests that
+    only implement :meth:`json` are decoded by the adapter itself.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def read(self, max_size: int | None = None) -> bytes:
+        """
+        Get raw request body.
+
+        :param max_size: Maximum body size in bytes, None - no limit.
+        :raises PayloadTooLargeError: If the body is larger than `max_size`.
+        """
+        raise NotImplementedError
+
+    async def json(
+        self,
+        loads: JsonLoads = json.loads,
+        max_size: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get JSON data from request.
+
+        :raises JSONDecodeError: If the body is not valid JSON.
+        :raises PayloadTooLargeError: If the body is larger than `max_size`.
+        """
+        return decode_json(await self.read(max_size), loads)
+
+    @staticmethod
+    def _check_size(size: int | None, max_size: int | None) -> None:
+        if size is not None and max_size is not None and size > max_size:
+            raise PayloadTooLargeError(size=size, max_size=max_size)
+
+
+def decode_json(body: bytes, loads: JsonLoads = json.loads) -> Any:
+    """
+    Decode request body with `loads` in one pass.
+
+    :raises JSONDecodeError: If the body is not valid JSON.
+    """
+    try:
+        return loads(body)
+    except JSONDecodeError:
+        raise
+    except ValueError as e:
+        # orjson and msgspec raise their own ValueError subclasses
+        raise JSONDecodeError(str(e), "", 0) from e
+
+
 class WebAdapter(ABC):
     """Abstraction for web framework adapters."""
 
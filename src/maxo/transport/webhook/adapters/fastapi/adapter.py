@@ -5,7 +5,11 @@ from typing import Any
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.webhook.adapters.base_adapter import (
+    BoundRequest,
+    RawBodyBoundRequest,
+    WebAdapter,
+)
 from maxo.transport.webhook.adapters.base_mapping import MappingABC
 from maxo.transport.webhook.adapters.fastapi.mapping import (
     FastApiHeadersMapping,
@@ -13,14 +17,26 @@ from maxo.transport.webhook.adapters.fastapi.mapping import (
 )
 
 
-class FastApiBoundRequest(BoundRequest[Request]):
+class FastApiBoundRequest(RawBodyBoundRequest[Request]):
     def __init__(self, request: Request) -> None:
         super().__init__(request)
         self._headers = FastApiHeadersMapping(self.request.headers)
         self._query_params = FastApiQueryMapping(self.request.query_params)
 
-    async def json(self) -> dict[str, Any]:
-        return await self.request.json()
+    async def read(self, max_size: int | None = None) -> bytes:
+        content_length = self.request.headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            self._check_size(int(content_length), max_size)
+            return await self.request.body()
+        if max_size is None:
+            return await self.request.body()
+
+        # Chunked body: stop reading as soon as the limit is exceeded
+        body = bytearray()
+        async for chunk in self.request.stream():
+            body += chunk
+            self._check_size(len(body), max_size)
+        return bytes(body)
 
     @property
     def client_ip(self) -> IPv4Address | IPv6Address | str | None:
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from aiohttp import TCPConnector
+
+from maxo import Bot, loggers
+from maxo.serialization import create_retort
+from maxo.transport.webhook.config.bot import BotConfig
+
+if TYPE_CHECKING:
+    from adaptix import Retort
+
+
+class BotPool:
+    """
+    Bounded LRU pool of started bots.
+
+    Bots are started on first use and share one warmed retort and one
+    aiohttp connector. Least recently used bots are closed when the pool is
+    full or when they stay idle longer than ``idle_timeout``; idle bots are
+    checked on every acquire and release and by a timer, so they are closed
+    even when no more updates arrive. A bot that is still processing updates
+    is closed only after they are released.
+
+    :param max_size: Maximum number of started bots.
+    :param idle_timeout: Seconds after which an unused bot is closed,
+        None - keep bots until they are evicted by size.
+    :param bot_config: Settings for the created bots.
+    :param connector_limit: Connection limit of the shared connector.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        idle_timeout: float | None = 600.0,
+        bot_config: BotConfig | None = None,
+        connector_limit: int = 100,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("`max_size` should be greater than 0")
+
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.bot_config = bot_config or BotConfig()
+        self._connector_limit = connector_limit
+
+        self._retort: Retort | None = None
+        self._connector: TCPConnector | None = None
+        # Ordered from least to most recently used
+        self._bots: OrderedDict[str, Bot] = OrderedDict()
+        self._last_used: dict[str, float] = {}
+        self._leases: dict[Bot, int] = {}
+        self._starting: dict[str, asyncio.Future[Bot | None]] = {}
+        self._retired: set[Bot] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._evict_timer: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._bots)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._bots
+
+    def get(self, token: str) -> Bot | None:
+        """Return a started bot from the pool without touching its LRU position."""
+        return self._bots.get(token)
+
+    def create(self, token: str) -> Bot:
+        """Create a not started bot sharing the pool resources."""
+        if self._retort is None:
+            self._retort = create_retort(defaults=self.bot_config.defaults)
+        if self._connector is None or self._connector.closed:
+            self._connector = TCPConnector(limit=self._connector_limit)
+
+        return Bot(
+            token,
+            defaults=self.bot_config.defaults,
+            retort=self._retort,
+            connector=self._connector,
+        )
+
+    async def acquire(self, bot: Bot) -> Bot | None:
+        """
+        Take a bot for update processing, starting it if needed.
+
+        Every successful call must be paired with :meth:`release`.
+
+        :return: Started bot from the pool or None if it failed to start.
+        """
+        token = bot.token
+        self._evict_idle()
+
+        pooled = self._bots.get(token)
+        if pooled is None:
+            pooled = await self._start(bot)
+            if pooled is None:
+                return None
+
+        self._bots.move_to_end(token)
+        self._last_used[token] = time.monotonic()
+        self._leases[pooled] = self._leases.get(pooled, 0) + 1
+        return pooled
+
+    def release(self, bot: Bot) -> None:
+        leases = self._leases.get(bot, 0) - 1
+        if leases > 0:
+            self._leases[bot] = leases
+            return
+
+        self._leases.pop(bot, None)
+        if bot in self._retired:
+            self._retired.discard(bot)
+            self._schedule_close(bot)
+        self._evict_idle()
+
+    async def close(self) -> None:
+        if self._evict_timer is not None:
+            self._evict_timer.cancel()
+            self._evict_timer = None
+
+        bots = [*self._bots.values(), *self._retired]
+        self._bots.clear()
+        self._last_used.clear()
+        self._leases.clear()
+        self._retired.clear()
+
+        await asyncio.gather(*(bot.close() for bot in bots))
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    async def _start(self, bot: Bot) -> Bot | None:
+        token = bot.token
+        starting = self._starting.get(token)
+        if starting is not None:
+            return await asyncio.shield(starting)
+
+        future: asyncio.Future[Bot | None] = asyncio.get_running_loop().create_future()
+        self._starting[token] = future
+        try:
+            await bot.start()
+        except Exception:  # noqa: BLE001
+            loggers.bot.exception("Failed to start bot from pool")
+            await bot.close()
+            future.set_result(None)
+            return None
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._starting[token]
+
+        self._bots[token] = bot
+        self._last_used[token] = time.monotonic()
+        while len(self._bots) > self.max_size:
+            self._evict(next(iter(self._bots)))
+        self._schedule_evict()
+
+        future.set_result(bot)
+        return bot
+
+    def _evict_idle(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        deadline = time.monotonic() - self.idle_timeout
+        while self._bots:
+            token = next(iter(self._bots))
+            if self._last_used[token] > deadline:
+                break
+            self._evict(token)
+
+    def _schedule_evict(self) -> None:
+        if self.idle_timeout is None or self._evict_timer is not None:
+            return
+        if not self._bots:
+            return
+
+        # The first bot has been idle the longest
+        token = next(iter(self._bots))
+        delay = self._last_used[token] + self.idle_timeout - time.monotonic()
+        self._evict_timer = asyncio.get_running_loop().call_later(
+            max(delay, 0),
+            self._on_evict_timer,
+        )
+
+    def _on_evict_timer(self) -> None:
+        self._evict_timer = None
+        self._evict_idle()
+        self._schedule_evict()
+
+    def _evict(self, token: str) -> None:
+        bot = self._bots.pop(token)
+        del self._last_used[token]
+        loggers.bot.debug("Bot evicted from pool (pool size = %d)", len(self._bots))
+
+        if self._leases.get(bot):
+            # Closed once all its updates are released
+            self._retired.add(bot)
+        else:
+            self._schedule_close(bot)
+
+    def _schedule_close(self, bot: Bot) -> None:
+        task = asyncio.create_task(bot.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
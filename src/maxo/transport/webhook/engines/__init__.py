@@ -1,7 +1,9 @@
 from maxo.transport.webhook.engines.base import WebhookEngine
 from maxo.transport.webhook.engines.simple import SimpleEngine
+from maxo.transport.webhook.engines.token import TokenEngine
 
 __all__ = (
     "SimpleEngine",
+    "TokenEngine",
     "WebhookEngine",
 )
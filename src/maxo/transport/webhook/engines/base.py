@@ -1,17 +1,29 @@
 import asyncio
+import contextlib
 from abc import ABC, abstractmethod
+from functools import partial
 from json import JSONDecodeError
 from typing import Any
 
 from adaptix.load_error import LoadError
 
-from maxo import Bot, Dispatcher
+from maxo import Bot, Dispatcher, loggers
 from maxo.bot.methods.base import MaxoMethod
+from maxo.errors import PayloadTooLargeError
 from maxo.routing.signals import MaxoUpdate
 from maxo.routing.updates import Updates
-from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.schedulers import BaseScheduler, TaskScheduler
+from maxo.transport.webhook.adapters.base_adapter import (
+    BoundRequest,
+    RawBodyBoundRequest,
+    WebAdapter,
+    decode_json,
+)
 from maxo.transport.webhook.routing.base import BaseRouting
 from maxo.transport.webhook.security.security import Security
+from maxo.transport.workers import ProcessPool, WorkerLost
+
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
 
 
 class WebhookEngine(ABC):
@@ -31,18 +43,41 @@ class WebhookEngine(ABC):
         routing: BaseRouting,
         security: Security | None = None,
         handle_in_background: bool = True,
+        scheduler: BaseScheduler | None = None,
+        process_pool: ProcessPool | None = None,
+        overflow_status: int = 503,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+        drain_timeout: float | None = 30.0,
     ) -> None:
         self.dispatcher = dispatcher
         self.web_adapter = web_adapter
         self.routing = routing
         self.security = security
         self.handle_in_background = handle_in_background
-        self._background_feed_update_tasks: set[asyncio.Task[Any]] = set()
+        self.scheduler = scheduler or TaskScheduler()
+        self.process_pool = process_pool
+        self.overflow_status = overflow_status
+        self.max_body_size = max_body_size
+        self.drain_timeout = drain_timeout
+        self._closing = False
+        self._active_requests = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
 
     @abstractmethod
     def _get_bot_from_request(self, bound_request: BoundRequest[Any]) -> Bot | None:
         raise NotImplementedError
 
+    async def _prepare_bot(self, bot: Bot) -> Bot | None:
+        """
+        Prepare the resolved bot for update processing.
+
+        Called after security checks and update loading.
+
+        :return: Bot to process the update with, or None if it is unavailable.
+        """
+        return bot
+
     @abstractmethod
     async def set_webhook(self, *args: Any, **kwargs: Any) -> Bot:
         raise NotImplementedError
@@ -64,7 +99,28 @@ class WebhookEngine(ABC):
             **kwargs,
         }
 
+    @property
+    def closing(self) -> bool:
+        """Whether the engine is shutting down and rejects new updates."""
+        return self._closing
+
     async def handle_request(self, bound_request: BoundRequest[Any]) -> Any:
+        if self._closing:
+            return self.web_adapter.create_json_response(
+                status=503,
+                payload={"detail": "Shutting down"},
+            )
+
+        self._active_requests += 1
+        self._idle.clear()
+        try:
+            return await self._process_request(bound_request)
+        finally:
+            self._active_requests -= 1
+            if not self._active_requests:
+                self._idle.set()
+
+    async def _process_request(self, bound_request: BoundRequest[Any]) -> Any:
         bot = self._get_bot_from_request(bound_request)
         if bot is None:
             return self.web_adapter.create_json_response(
@@ -82,7 +138,17 @@ class WebhookEngine(ABC):
             )
 
         try:
-            raw_update = await bound_request.json()
+            if isinstance(bound_request, RawBodyBoundRequest):
+                body = await bound_request.read(self.max_body_size)
+                raw_update = decode_json(body, bot.json_loads)
+            else:
+                # Adapters without read() read and parse the body themselves
+                raw_update = await bound_request.json()
+        except PayloadTooLargeError:
+            return self.web_adapter.create_json_response(
+                status=413,
+                payload={"detail": "Payload too large"},
+            )
         except JSONDecodeError:
             return self.web_adapter.create_json_response(
                 status=400,
@@ -97,10 +163,63 @@ class WebhookEngine(ABC):
                 payload={"detail": "Bad request"},
             )
 
+        prepared_bot = await self._prepare_bot(bot)
+        if prepared_bot is None:
+            return self.web_adapter.create_json_response(
+                status=400,
+                payload={"detail": "Bot not found"},
+            )
+        bot = prepared_bot
+
         if self.handle_in_background:
             return await self._handle_request_background(bot=bot, update=update)
         return await self._handle_request(bot=bot, update=update)
 
+    async def _drain(self) -> None:
+        """
+        Stop accepting updates and wait for the accepted ones.
+
+        New requests are answered with 503, so MAX redelivers them to another
+        instance. Requests in progress and background updates get
+        `drain_timeout` seconds in total, the rest are cancelled.
+        """
+        self._closing = True
+        loop = asyncio.get_running_loop()
+        deadline = None
+        if self.drain_timeout is not None:
+            deadline = loop.time() + self.drain_timeout
+
+        loggers.webhook.info(
+            "Webhook is shutting down, waiting for %d requests and %d updates",
+            self._active_requests,
+            self.scheduler.pending,
+        )
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+        if self._active_requests:
+            loggers.webhook.warning(
+                "%d requests are still in progress after drain timeout",
+                self._active_requests,
+            )
+
+        pending = self.scheduler.pending
+        timeout = None if deadline is None else max(deadline - loop.time(), 0.0)
+        dropped = await self.scheduler.drain(timeout=timeout)
+        for update in dropped:
+            loggers.webhook.warning(
+                "Update dropped on shutdown. Update type=%r marker=%r",
+                update.update.__class__.__name__,
+                update.marker,
+            )
+        loggers.webhook.info(
+            "Webhook drained: %d updates completed, %d cancelled",
+            pending - len(dropped),
+            len(dropped),
+        )
+
+        if self.process_pool is not None:
+            await self.process_pool.close()
+
     def register(self, app: Any) -> None:
         self.web_adapter.register(
             app=app,
@@ -115,6 +234,11 @@ class WebhookEngine(ABC):
         bot: Bot,
         update: MaxoUpdate[Any],
     ) -> Any:
+        if self.process_pool is not None:
+            # The worker process sends the handler's response itself
+            await self.process_pool.feed(update, bot)
+            return self.web_adapter.create_json_response(status=200, payload={})
+
         result = await self.dispatcher.feed_max_update(bot=bot, update=update)
 
         if not isinstance(result, MaxoMethod):
@@ -124,6 +248,17 @@ class WebhookEngine(ABC):
         return self.web_adapter.create_json_response(status=200, payload={})
 
     async def _background_feed_update(self, bot: Bot, update: MaxoUpdate[Any]) -> None:
+        if self.process_pool is not None:
+            try:
+                await self.process_pool.feed(update, bot)
+            except WorkerLost:
+                # The update was already answered with 200, MAX won't redeliver it
+                loggers.webhook.warning(
+                    "Update lost in worker process. Update type=%r",
+                    update.update.__class__.__name__,
+                )
+            return
+
         result = await self.dispatcher.feed_max_update(
             bot=bot,
             update=update,
@@ -136,10 +271,29 @@ class WebhookEngine(ABC):
         bot: Bot,
         update: MaxoUpdate[Any],
     ) -> Any:
-        feed_update_task = asyncio.create_task(
-            self._background_feed_update(bot=bot, update=update),
+        accepted = await self.scheduler.try_submit(
+            update,
+            partial(self._background_feed_update, bot=bot, update=update),
+            partial(self._drop_update, bot=bot, update=update),
         )
-        self._background_feed_update_tasks.add(feed_update_task)
-        feed_update_task.add_done_callback(self._background_feed_update_tasks.discard)
-
+        if not accepted:
+            return await self._reject_update(bot=bot, update=update)
         return self.web_adapter.create_json_response(status=200, payload={})
+
+    def _drop_update(self, bot: Bot, update: MaxoUpdate[Any]) -> None:  # noqa: B027
+        """
+        Release resources taken for an accepted update the scheduler dropped.
+
+        Called instead of :meth:`_background_feed_update` on shutdown.
+        """
+
+    async def _reject_update(self, bot: Bot, update: MaxoUpdate[Any]) -> Any:
+        """
+        Build the response for an update the scheduler has no room for.
+
+        MAX redelivers the update later, so nothing is lost.
+        """
+        return self.web_adapter.create_json_response(
+            status=self.overflow_status,
+            payload={"detail": "Too many requests"},
+        )
@@ -7,10 +7,15 @@ from maxo.routing.signals import (
     BeforeShutdown,
     BeforeStartup,
 )
+from maxo.transport.schedulers import BaseScheduler
 from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
-from maxo.transport.webhook.engines.base import WebhookEngine
+from maxo.transport.webhook.engines.base import (
+    DEFAULT_MAX_BODY_SIZE,
+    WebhookEngine,
+)
 from maxo.transport.webhook.routing.base import BaseRouting
 from maxo.transport.webhook.security.security import Security
+from maxo.transport.workers import ProcessPool
 
 
 class SimpleEngine(WebhookEngine):
@@ -30,6 +35,11 @@ class SimpleEngine(WebhookEngine):
         routing: BaseRouting,
         security: Security | None = None,
         handle_in_background: bool = True,
+        scheduler: BaseScheduler | None = None,
+        process_pool: ProcessPool | None = None,
+        overflow_status: int = 503,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+        drain_timeout: float | None = 30.0,
     ) -> None:
         self.bot = bot
         super().__init__(
@@ -38,6 +48,11 @@ class SimpleEngine(WebhookEngine):
             routing=routing,
             security=security,
             handle_in_background=handle_in_background,
+            scheduler=scheduler,
+            process_pool=process_pool,
+            overflow_status=overflow_status,
+            max_body_size=max_body_size,
+            drain_timeout=drain_timeout,
         )
 
     def _get_bot_from_request(self, bound_request: BoundRequest[Any]) -> Bot | None:
@@ -70,22 +85,29 @@ class SimpleEngine(WebhookEngine):
         """Call on application startup. Emits dispatcher startup event."""
         workflow_data = self._build_workflow_data(app=app, bot=self.bot, **kwargs)
         self.dispatcher.workflow_data.update(workflow_data)
+        self._closing = False
 
         await self.dispatcher.feed_signal(BeforeStartup(), self.bot)
 
         await self.bot.start()
 
+        if self.process_pool is not None:
+            await self.process_pool.start()
+
         await self.dispatcher.feed_signal(AfterStartup(), self.bot)
 
     async def on_shutdown(self, app: Any, *args: Any, **kwargs: Any) -> None:
         """
         Call on application shutdown.
 
-        Emits dispatcher shutdown event and closes bot session.
+        Drains accepted updates, emits dispatcher shutdown event
+        and closes bot session.
         """
         workflow_data = self._build_workflow_data(app=app, bot=self.bot, **kwargs)
         self.dispatcher.workflow_data.update(workflow_data)
 
+        await self._drain()
+
         await self.dispatcher.feed_signal(BeforeShutdown(), self.bot)
 
         await self.bot.close()
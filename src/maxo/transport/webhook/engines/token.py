@@ -0,0 +1,170 @@
+from typing import Any
+
+from maxo import Bot, Dispatcher
+from maxo.routing.signals import (
+    AfterShutdown,
+    AfterStartup,
+    BeforeShutdown,
+    BeforeStartup,
+)
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers import BaseScheduler
+from maxo.transport.webhook.adapters.base_adapter import BoundRequest, WebAdapter
+from maxo.transport.webhook.bot_pool import BotPool
+from maxo.transport.webhook.config.bot import BotConfig
+from maxo.transport.webhook.engines.base import (
+    DEFAULT_MAX_BODY_SIZE,
+    WebhookEngine,
+)
+from maxo.transport.webhook.routing.base import TokenRouting
+from maxo.transport.webhook.security.security import Security
+from maxo.transport.workers import ProcessPool
+
+
+class TokenEngine(WebhookEngine):
+    """
+    Webhook engine for multi-bot applications.
+
+    Resolves the bot from the token in the request URL. Bots are created
+    and started on the first request and kept in a bounded LRU
+    :class:`~maxo.transport.webhook.bot_pool.BotPool`, so one process can serve
+    many bots without creating them in advance.
+    """
+
+    routing: TokenRouting
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        /,
+        web_adapter: WebAdapter,
+        routing: TokenRouting,
+        security: Security | None = None,
+        handle_in_background: bool = True,
+        scheduler: BaseScheduler | None = None,
+        process_pool: ProcessPool | None = None,
+        overflow_status: int = 503,
+        max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
+        drain_timeout: float | None = 30.0,
+        bot_config: BotConfig | None = None,
+        max_bots: int = 1000,
+        idle_timeout: float | None = 600.0,
+    ) -> None:
+        super().__init__(
+            dispatcher,
+            web_adapter=web_adapter,
+            routing=routing,
+            security=security,
+            handle_in_background=handle_in_background,
+            scheduler=scheduler,
+            process_pool=process_pool,
+            overflow_status=overflow_status,
+            max_body_size=max_body_size,
+            drain_timeout=drain_timeout,
+        )
+        self.bot_pool = BotPool(
+            max_size=max_bots,
+            idle_timeout=idle_timeout,
+            bot_config=bot_config,
+        )
+
+    def _get_bot_from_request(self, bound_request: BoundRequest[Any]) -> Bot | None:
+        """
+        Resolve the bot by the token from the request.
+
+        The returned bot may be not started yet: it is started only after
+        the request passes security checks.
+
+        :param bound_request: The incoming bound request.
+        :return: Bot instance or None if the request has no token.
+        """
+        token = self.routing.extract_token(bound_request)
+        if not token:
+            return None
+        return self.bot_pool.get(token) or self.bot_pool.create(token)
+
+    async def _prepare_bot(self, bot: Bot) -> Bot | None:
+        return await self.bot_pool.acquire(bot)
+
+    async def _handle_request(self, bot: Bot, update: MaxoUpdate[Any]) -> Any:
+        try:
+            return await super()._handle_request(bot=bot, update=update)
+        finally:
+            self.bot_pool.release(bot)
+
+    async def _background_feed_update(self, bot: Bot, update: MaxoUpdate[Any]) -> None:
+        try:
+            await super()._background_feed_update(bot=bot, update=update)
+        finally:
+            self.bot_pool.release(bot)
+
+    def _drop_update(self, bot: Bot, update: MaxoUpdate[Any]) -> None:
+        self.bot_pool.release(bot)
+
+    async def _reject_update(self, bot: Bot, update: MaxoUpdate[Any]) -> Any:
+        self.bot_pool.release(bot)
+        return await super()._reject_update(bot=bot, update=update)
+
+    async def set_webhook(
+        self,
+        token: str,
+        *,
+        update_types: list[str] | None = None,
+    ) -> Bot:
+        """Set the webhook for the bot with the given token."""
+        bot = await self.bot_pool.acquire(self.bot_pool.create(token))
+        if bot is None:
+            raise ValueError("Failed to start bot with the given token")
+
+        try:
+            secret_token = None
+            if self.security is not None:
+                secret_token = await self.security.get_secret_token(bot=bot)
+
+            await bot.subscribe(
+                url=self.routing.webhook_point(bot),
+                secret=secret_token,
+                update_types=update_types,
+            )
+        finally:
+            self.bot_pool.release(bot)
+        return bot
+
+    async def on_startup(self, app: Any, *args: Any, **kwargs: Any) -> None:
+        """Call on application startup. Emits dispatcher startup event."""
+        workflow_data = self._build_workflow_data(
+            app=app,
+            bot_pool=self.bot_pool,
+            **kwargs,
+        )
+        self.dispatcher.workflow_data.update(workflow_data)
+        self._closing = False
+
+        await self.dispatcher.feed_signal(BeforeStartup())
+
+        if self.process_pool is not None:
+            await self.process_pool.start()
+
+        await self.dispatcher.feed_signal(AfterStartup())
+
+    async def on_shutdown(self, app: Any, *args: Any, **kwargs: Any) -> None:
+        """
+        Call on application shutdown.
+
+        Drains accepted updates, emits dispatcher shutdown event
+        and closes all pooled bots.
+        """
+        workflow_data = self._build_workflow_data(
+            app=app,
+            bot_pool=self.bot_pool,
+            **kwargs,
+        )
+        self.dispatcher.workflow_data.update(workflow_data)
+
+        await self._drain()
+
+        await self.dispatcher.feed_signal(BeforeShutdown())
+
+        await self.bot_pool.close()
+
+        await self.dispatcher.feed_signal(AfterShutdown())
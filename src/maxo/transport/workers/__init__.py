@@ -0,0 +1,6 @@
+from maxo.transport.workers.pool import ProcessPool, WorkerLost
+
+__all__ = (
+    "ProcessPool",
+    "WorkerLost",
+)
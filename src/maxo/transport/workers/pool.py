@@ -0,0 +1,353 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any
+
+from maxo import loggers
+from maxo.bot.bot import Bot
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers.ordered import UpdateKey, chat_key
+from maxo.transport.workers.worker import (
+    BOT_MESSAGE,
+    UPDATE_MESSAGE,
+    DispatcherFactory,
+    run_worker,
+)
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+class WorkerLost(Exception):
+    """Процесс-воркер не обработал апдейт: завершился или не запустил бота."""
+
+
+def _jump_hash(key: int, buckets: int) -> int:
+    """
+    Консистентный хэш Jump (Lamping, Veach).
+
+    При увеличении числа корзин с n до n + 1 в новую корзину переходит
+    примерно 1 / (n + 1) ключей, остальные остаются на месте.
+    """
+    key &= _UINT64_MASK
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & _UINT64_MASK
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+class _WorkerHandle:
+    __slots__ = (
+        "accepting",
+        "bots",
+        "inbox",
+        "index",
+        "pending",
+        "process",
+        "slots",
+    )
+
+    def __init__(self, index: int, max_pending: int) -> None:
+        self.index = index
+        self.process: BaseProcess | None = None
+        self.inbox: Queue[Any] | None = None
+        self.bots: set[str] = set()
+        self.pending: dict[int, asyncio.Future[None]] = {}
+        self.slots = asyncio.Semaphore(max_pending)
+        self.accepting = asyncio.Event()
+
+
+class ProcessPool:
+    """
+    Обработка апдейтов в пуле процессов.
+
+    Транспорт продолжает получать апдейты в основном процессе, а обработку
+    передаёт в `workers` процессов. Каждый процесс создаёт свой диспетчер через
+    `dispatcher_factory` и своих ботов.
+
+    Апдейты распределяются по процессам по ключу (по умолчанию - чат), поэтому
+    порядок обработки внутри чата сохраняется. Процесс выбирается
+    консистентным хэшем, поэтому при изменении `workers` на другой процесс
+    переезжает только небольшая часть чатов. Внутри процесса апдейты
+    обрабатываются :class:`~maxo.transport.schedulers.ChatOrderedScheduler`
+    с `concurrency` воркерами.
+
+    :param dispatcher_factory: Функция без аргументов, возвращающая диспетчер.
+        Вызывается в процессе-воркере, поэтому должна быть доступна для импорта
+        (функция уровня модуля).
+    :param workers: Количество процессов.
+    :param key: Функция, возвращающая ключ шардирования апдейта.
+    :param max_pending: Максимальное количество необработанных апдейтов
+        на процесс. Если лимит исчерпан, `feed` ждёт освобождения места.
+    :param concurrency: Количество воркеров `ChatOrderedScheduler` в процессе.
+    :param health_interval: Период проверки, что процессы живы, в секундах.
+        Упавший процесс перезапускается, а `feed` его необработанных апдейтов
+        завершается ошибкой :class:`WorkerLost`.
+    :param stop_timeout: Сколько секунд всего ждать обработки апдейтов
+        и завершения процесса при остановке или перезапуске, после чего
+        процесс завершается принудительно.
+    :param mp_context: Способ запуска процессов, см. :mod:`multiprocessing`.
+    """
+
+    def __init__(
+        self,
+        dispatcher_factory: DispatcherFactory,
+        workers: int | None = None,
+        key: UpdateKey = chat_key,
+        max_pending: int = 1000,
+        concurrency: int = 8,
+        health_interval: float = 1.0,
+        stop_timeout: float = 30.0,
+        mp_context: str = "spawn",
+    ) -> None:
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("`workers` should be greater than 0")
+        if max_pending < 1:
+            raise ValueError("`max_pending` should be greater than 0")
+
+        self._dispatcher_factory = dispatcher_factory
+        self._key = key
+        self._max_pending = max_pending
+        self._concurrency = concurrency
+        self._health_interval = health_interval
+        self._stop_timeout = stop_timeout
+        self._context: BaseContext = multiprocessing.get_context(mp_context)
+
+        self._handles = [_WorkerHandle(index, max_pending) for index in range(workers)]
+        self._seq = itertools.count()
+        self._round_robin = itertools.count()
+        self._results: Queue[Any] | None = None
+        self._reader: threading.Thread | None = None
+        self._watcher: asyncio.Task[None] | None = None
+        self._running = False
+
+    @property
+    def workers(self) -> int:
+        return len(self._handles)
+
+    @property
+    def pending(self) -> int:
+        """Количество апдейтов, переданных в процессы и ещё не обработанных."""
+        return sum(len(handle.pending) for handle in self._handles)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def shard(self, update: MaxoUpdate[Any]) -> int:
+        key = self._key(update)
+        if key is None:
+            return next(self._round_robin) % len(self._handles)
+        return _jump_hash(hash(key), len(self._handles))
+
+    async def start(self) -> None:
+        if self._running:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._results = self._context.Queue()
+        self._reader = threading.Thread(
+            target=self._read_results,
+            args=(loop, self._results),
+            name="maxo-workers-results",
+            daemon=True,
+        )
+        self._reader.start()
+
+        for handle in self._handles:
+            self._spawn(handle)
+
+        self._running = True
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def feed(self, update: MaxoUpdate[Any], bot: Bot) -> None:
+        """
+        Передать апдейт в процесс и дождаться окончания его обработки.
+
+        :raises WorkerLost: Процесс не обработал апдейт.
+        """
+        if not self._running:
+            raise RuntimeError("ProcessPool is not started")
+
+        handle = self._handles[self.shard(update)]
+        await handle.accepting.wait()
+
+        async with handle.slots:
+            # Пока ждали места, процесс могли начать останавливать. `_stop`
+            # снимает `accepting` и отправляет None без await между ними,
+            # поэтому после проверки ниже апдейт попадёт в очередь до None
+            while not handle.accepting.is_set():
+                await handle.accepting.wait()
+            if handle.inbox is None:
+                raise RuntimeError("ProcessPool is closed")
+
+            token = bot.token
+            if token not in handle.bots:
+                handle.inbox.put((BOT_MESSAGE, token, bot.defaults))
+                handle.bots.add(token)
+
+            seq = next(self._seq)
+            future = asyncio.get_running_loop().create_future()
+            handle.pending[seq] = future
+            handle.inbox.put((UPDATE_MESSAGE, seq, token, update))
+            await future
+
+    async def restart(self, index: int | None = None) -> None:
+        """
+        Перезапустить процессы по одному без потери апдейтов.
+
+        Новые апдейты для перезапускаемого процесса ждут, пока он не обработает
+        уже полученные и не будет запущен заново.
+        """
+        handles = self._handles if index is None else [self._handles[index]]
+        for handle in handles:
+            await self._stop(handle)
+            if self._running:
+                self._spawn(handle)
+
+    async def close(self) -> None:
+        """Дождаться обработки переданных апдейтов и остановить процессы."""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+        await asyncio.gather(*(self._stop(handle) for handle in self._handles))
+        for handle in self._handles:
+            # Разбудить ожидающих в `feed`, чтобы они получили ошибку
+            handle.accepting.set()
+
+        if self._results is not None:
+            self._results.put(None)
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join)
+            self._reader = None
+        if self._results is not None:
+            self._results.close()
+            self._results = None
+
+    def _spawn(self, handle: _WorkerHandle) -> None:
+        handle.inbox = self._context.Queue()
+        handle.bots = set()
+        handle.process = self._context.Process(
+            target=run_worker,
+            args=(
+                handle.index,
+                self._dispatcher_factory,
+                handle.inbox,
+                self._results,
+                self._concurrency,
+            ),
+            name=f"maxo-worker-{handle.index}",
+            daemon=True,
+        )
+        handle.process.start()
+        handle.accepting.set()
+        loggers.workers.info(
+            "Worker #%d spawned (pid = %s)",
+            handle.index,
+            handle.process.pid,
+        )
+
+    async def _stop(self, handle: _WorkerHandle) -> None:
+        handle.accepting.clear()
+        process, inbox = handle.process, handle.inbox
+        if process is None or inbox is None:
+            return
+
+        # Воркер обработает всё, что уже в очереди, и только потом увидит None
+        inbox.put(None)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._stop_timeout
+        if handle.pending:
+            await asyncio.wait(
+                list(handle.pending.values()),
+                timeout=self._stop_timeout,
+            )
+        # Ожидание апдейтов и процесса укладывается в один `stop_timeout`
+        await asyncio.to_thread(process.join, max(deadline - loop.time(), 0.0))
+        if process.is_alive():
+            loggers.workers.warning(
+                "Worker #%d did not stop in %f seconds, terminating",
+                handle.index,
+                self._stop_timeout,
+            )
+            process.terminate()
+            await asyncio.to_thread(process.join)
+
+        self._drop_pending(handle)
+        inbox.close()
+        handle.process = None
+        handle.inbox = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._health_interval)
+            for handle in self._handles:
+                process = handle.process
+                if (
+                    process is None
+                    or not handle.accepting.is_set()
+                    or process.is_alive()
+                ):
+                    continue
+
+                loggers.workers.error(
+                    "Worker #%d died (exit code = %s), restarting",
+                    handle.index,
+                    process.exitcode,
+                )
+                self._drop_pending(handle)
+                if handle.inbox is not None:
+                    handle.inbox.close()
+                self._spawn(handle)
+
+    def _drop_pending(self, handle: _WorkerHandle) -> None:
+        if not handle.pending:
+            return
+
+        loggers.workers.error(
+            "Worker #%d dropped %d updates",
+            handle.index,
+            len(handle.pending),
+        )
+        for future in handle.pending.values():
+            if not future.done():
+                future.set_exception(
+                    WorkerLost(f"Worker #{handle.index} stopped before the update"),
+                )
+        handle.pending.clear()
+
+    def _complete(self, index: int, seq: int, processed: bool = True) -> None:
+        future = self._handles[index].pending.pop(seq, None)
+        if future is None or future.done():
+            return
+
+        if processed:
+            future.set_result(None)
+        else:
+            future.set_exception(
+                WorkerLost(f"Worker #{index} could not process the update"),
+            )
+
+    def _read_results(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        results: "Queue[Any]",
+    ) -> None:
+        while True:
+            message = results.get()
+            if message is None:
+                return
+            loop.call_soon_threadsafe(self._complete, *message)
@@ -0,0 +1,135 @@
+import asyncio
+import signal
+from collections.abc import Callable
+from functools import partial
+from multiprocessing.queues import Queue
+from typing import Any
+
+from maxo import loggers
+from maxo.bot.bot import Bot
+from maxo.bot.defaults import BotDefaults
+from maxo.bot.methods.base import MaxoMethod
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals.shutdown import AfterShutdown, BeforeShutdown
+from maxo.routing.signals.startup import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.transport.schedulers import ChatOrderedScheduler
+
+DispatcherFactory = Callable[[], Dispatcher]
+
+# Сообщения из основного процесса в воркер:
+# (BOT_MESSAGE, token, defaults) - зарегистрировать бота;
+# (UPDATE_MESSAGE, seq, token, update) - обработать апдейт;
+# None - завершить работу после обработки уже полученных апдейтов.
+# Ответ воркера - (index, seq, processed), где processed=False значит,
+# что апдейт не обработан и его маркер нельзя сохранять.
+BOT_MESSAGE = "bot"
+UPDATE_MESSAGE = "update"
+
+
+def run_worker(
+    index: int,
+    dispatcher_factory: DispatcherFactory,
+    inbox: "Queue[Any]",
+    results: "Queue[Any]",
+    concurrency: int,
+) -> None:
+    """Точка входа процесса-воркера."""
+    # Остановкой воркеров управляет основной процесс
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    worker = _Worker(
+        index=index,
+        dispatcher=dispatcher_factory(),
+        inbox=inbox,
+        results=results,
+        concurrency=concurrency,
+    )
+    asyncio.run(worker.run())
+
+
+class _Worker:
+    def __init__(
+        self,
+        index: int,
+        dispatcher: Dispatcher,
+        inbox: "Queue[Any]",
+        results: "Queue[Any]",
+        concurrency: int,
+    ) -> None:
+        self._index = index
+        self._dispatcher = dispatcher
+        self._inbox = inbox
+        self._results = results
+        self._scheduler = ChatOrderedScheduler(workers=concurrency)
+        self._bots: dict[str, Bot] = {}
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        await self._dispatcher.feed_signal(BeforeStartup())
+        loggers.workers.info("Worker #%d started", self._index)
+
+        try:
+            while True:
+                message = await loop.run_in_executor(None, self._inbox.get)
+                if message is None:
+                    break
+
+                if message[0] == BOT_MESSAGE:
+                    _, token, defaults = message
+                    await self._start_bot(token, defaults)
+                elif message[0] == UPDATE_MESSAGE:
+                    _, seq, token, update = message
+                    await self._scheduler.submit(
+                        update,
+                        partial(self._process_update, seq, token, update),
+                    )
+        finally:
+            await self._scheduler.close()
+
+            for bot in self._bots.values():
+                await self._dispatcher.feed_signal(BeforeShutdown(), bot)
+                await bot.close()
+
+            await self._dispatcher.feed_signal(AfterShutdown())
+            loggers.workers.info("Worker #%d stopped", self._index)
+
+    async def _start_bot(self, token: str, defaults: BotDefaults) -> None:
+        if token in self._bots:
+            return
+
+        bot = Bot(token, defaults=defaults)
+        try:
+            await bot.start()
+        except Exception:  # noqa: BLE001
+            loggers.workers.exception("Worker #%d failed to start bot", self._index)
+            await bot.close()
+            return
+
+        self._bots[token] = bot
+        self._dispatcher.workflow_data.setdefault("bot", bot)
+        await self._dispatcher.feed_signal(AfterStartup(), bot)
+
+    async def _process_update(
+        self,
+        seq: int,
+        token: str,
+        update: MaxoUpdate[Any],
+    ) -> None:
+        processed = False
+        try:
+            bot = self._bots.get(token)
+            if bot is None:
+                loggers.workers.error(
+                    "Worker #%d dropped update marker=%r: bot is not started",
+                    self._index,
+                    update.marker,
+                )
+                return
+
+            processed = True
+            result = await self._dispatcher.feed_max_update(update, bot)
+            if isinstance(result, MaxoMethod):
+                await bot.silent_call_method(result)
+        finally:
+            self._results.put((self._index, seq, processed))
@@ -1,4 +1,5 @@
 from collections.abc import Mapping
+from functools import partial
 from typing import Any, final
 
 from maxo.routing.ctx import Ctx
@@ -75,7 +76,7 @@ class FacadeMiddleware(BaseMiddleware[MaxoUpdate[Any]]):
     ) -> Any:
         facade = self._facade_cls_factory(type(update.update))
         if facade:
-            ctx[FACADE_KEY] = facade(ctx["bot"], update.update)
+            ctx.set_lazy(FACADE_KEY, partial(facade, ctx["bot"], update.update))
 
         return await next(ctx)
 
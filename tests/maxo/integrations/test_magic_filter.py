@@ -1,7 +1,10 @@
+from typing import Any
+
 import pytest
 from magic_filter import F
 
 from maxo.integrations.magic_filter import MagicData, MagicFilter
+from maxo.routing.ctx import Ctx
 
 
 @pytest.mark.asyncio
@@ -28,3 +31,29 @@ async def test_magic_data_custom_cast() -> None:
     assert "result" in ctx
     assert ctx["result"] == "42"
     assert isinstance(ctx["result"], str)
+
+
+@pytest.mark.asyncio
+async def test_magic_data_resolves_only_used_keys() -> None:
+    loaded: list[str] = []
+
+    def lazy(key: str, value: Any) -> Any:
+        async def factory() -> Any:
+            loaded.append(key)
+            return value
+
+        return factory
+
+    ctx = Ctx()
+    ctx.set_lazy("raw_state", lazy("raw_state", "Form:name"))
+    ctx.set_lazy("profile", lazy("profile", {"admin": True}))
+
+    assert await MagicData(F.raw_state == "Form:name")(None, ctx)
+    assert loaded == ["raw_state"]
+    assert "profile" not in ctx
+
+    assert await MagicData(F.profile["admin"] & (F.raw_state == F.raw_state))(
+        None,
+        ctx,
+    )
+    assert loaded == ["raw_state", "profile"]
@@ -0,0 +1,232 @@
+import asyncio
+import random
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.trace import NonRecordingSpan, SpanContext, SpanKind
+from unihttp.http.request import HTTPRequest
+from unihttp.http.response import HTTPResponse
+
+from maxo import Dispatcher, Router
+from maxo.dialogs import Dialog, DialogManager, StartMode, Window, setup_dialogs
+from maxo.dialogs.test_tools import BotClient, MockMessageManager
+from maxo.dialogs.test_tools.memory_storage import JsonMemoryStorage
+from maxo.dialogs.widgets.text import Const
+from maxo.enums import ChatType
+from maxo.fsm import State, StatesGroup
+from maxo.fsm.key_builder import StorageKey
+from maxo.fsm.storages.memory import MemoryStorage
+from maxo.integrations.opentelemetry import (
+    TracingApiMiddleware,
+    TracingStorage,
+    setup_tracing,
+)
+from maxo.routing.filters import CommandStart
+from maxo.routing.signals import AfterStartup, BeforeStartup
+from maxo.routing.updates import MessageCreated
+
+
+class RecordedSpan(NonRecordingSpan):
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent: SpanContext | None,
+        kind: SpanKind,
+        attributes: Mapping[str, Any] | None,
+    ) -> None:
+        super().__init__(context)
+        self.name = name
+        self.parent = parent
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.ended = False
+
+    def is_recording(self) -> bool:
+        return not self.ended
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, end_time: int | None = None) -> None:
+        self.ended = True
+
+
+class RecordingTracer(trace.Tracer):
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+
+    def start_span(
+        self,
+        name: str,
+        context: Context | None = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Mapping[str, Any] | None = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RecordedSpan:
+        parent = trace.get_current_span(context).get_span_context()
+        if not parent.is_valid:
+            parent = None
+        trace_id = parent.trace_id if parent else random.getrandbits(128)
+        span_context = SpanContext(trace_id, random.getrandbits(64), is_remote=False)
+
+        span = RecordedSpan(name, span_context, parent, kind, attributes)
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def start_as_current_span(  # type: ignore[override]
+        self,
+        name: str,
+        context: Context | None = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Mapping[str, Any] | None = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Iterator[RecordedSpan]:
+        span = self.start_span(name, context, kind, attributes)
+        with trace.use_span(span, end_on_exit=True):
+            yield span
+
+    def find(self, name: str) -> RecordedSpan:
+        (span,) = (span for span in self.spans if span.name == name)
+        return span
+
+
+class DialogSG(StatesGroup):
+    start = State()
+
+
+async def greet(_: MessageCreated, dialog_manager: DialogManager) -> str:
+    await dialog_manager.bg(user_id=2, chat_id=-1).start(
+        DialogSG.start,
+        mode=StartMode.RESET_STACK,
+    )
+    return "hello"
+
+
+@pytest.mark.asyncio
+async def test_update_spans_are_linked() -> None:
+    tracer = RecordingTracer()
+    dp = Dispatcher(storage=JsonMemoryStorage())
+    router = Router("greetings")
+    router.message_created.handler(greet, CommandStart())
+    dp.include(router, Dialog(Window(Const("stub"), state=DialogSG.start)))
+    setup_dialogs(dp, message_manager=MockMessageManager())
+    setup_tracing(dp, tracer)
+
+    client = BotClient(dp, chat_id=-1, user_id=1, chat_type=ChatType.CHAT)
+    await dp.feed_signal(BeforeStartup(), client.bot)
+    await dp.feed_signal(AfterStartup(), client.bot)
+    assert await client.send("/start") == "hello"
+    await asyncio.sleep(0.1)
+
+    update_span = tracer.find("update MessageCreated")
+    assert update_span.kind is SpanKind.CONSUMER
+    assert update_span.ended
+    assert update_span.attributes == {
+        "maxo.update.type": "MessageCreated",
+        "maxo.chat.id": -1,
+        "maxo.user.id": 1,
+        "maxo.handler": "greet",
+        "maxo.router": "greetings",
+        "maxo.handled": True,
+    }
+
+    # Апдейт диалога из BgManager обрабатывается в отдельной задаче
+    dialog_span = tracer.find("update DialogStartEvent")
+    assert dialog_span.attributes["maxo.user.id"] == 2
+    assert dialog_span.parent == update_span.get_span_context()
+
+
+@pytest.mark.asyncio
+async def test_noop_tracer() -> None:
+    dp = Dispatcher()
+    setup_tracing(dp, trace.NoOpTracer())
+
+    @dp.message_created()
+    async def echo(update: MessageCreated) -> str | None:
+        return update.message.body.text
+
+    client = BotClient(dp, chat_id=-1, user_id=1, chat_type=ChatType.CHAT)
+    await dp.feed_signal(BeforeStartup(), client.bot)
+    assert await client.send("hi") == "hi"
+
+    async def send(request: HTTPRequest) -> HTTPResponse:
+        return HTTPResponse(200, {}, {}, {}, None)
+
+    response = await TracingApiMiddleware(trace.NoOpTracer()).handle(
+        make_request(),
+        send,
+    )
+    assert response.status_code == 200
+
+
+def make_request() -> HTTPRequest:
+    return HTTPRequest(
+        url="chats/5/pin",
+        method="put",
+        header={},
+        path={"chat_id": 5},
+        query={},
+        body={"message_id": "mid"},
+        file={},
+        form=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_api_spans_count_retries() -> None:
+    tracer = RecordingTracer()
+    middleware = TracingApiMiddleware(tracer)
+    statuses = iter((503, 200))
+
+    async def send(request: HTTPRequest) -> HTTPResponse:
+        return HTTPResponse(next(statuses), {}, {}, {}, None)
+
+    async def retry(request: HTTPRequest) -> HTTPResponse:
+        response = await middleware.handle(request, send)
+        if response.status_code == 503:
+            response = await middleware.handle(request, send)
+        return response
+
+    with tracer.start_as_current_span("handler") as parent:
+        await retry(make_request())
+
+    first, second = (span for span in tracer.spans if span.name == "api pin_message")
+    assert first.parent == second.parent == parent.get_span_context()
+    assert first.kind is SpanKind.CLIENT
+    assert first.attributes == {
+        "maxo.method": "pin_message",
+        "http.request.method": "PUT",
+        "url.template": "chats/{chat_id}/pin",
+        "http.response.status_code": 503,
+    }
+    assert second.attributes["http.request.resend_count"] == 1
+    assert second.attributes["http.response.status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_storage_spans() -> None:
+    tracer = RecordingTracer()
+    storage = TracingStorage(MemoryStorage(), tracer)
+    key = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+    await storage.set_state(key, DialogSG.start)
+    assert await storage.get_state(key) == "DialogSG:start"
+
+    assert [span.name for span in tracer.spans] == [
+        "storage set_state",
+        "storage get_state",
+    ]
+    assert tracer.spans[0].attributes == {
+        "maxo.storage.operation": "set_state",
+        "maxo.storage.destiny": "default",
+        "maxo.chat.id": 2,
+        "maxo.user.id": 3,
+    }
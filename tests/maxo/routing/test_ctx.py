@@ -0,0 +1,283 @@
+import asyncio
+from copy import copy
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.fsm import State, StateFilter, StatesGroup
+from maxo.fsm.storages.memory import MemoryStorage
+from maxo.routing.ctx import Ctx, WorkflowData
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Message, MessageBody, Recipient, User
+from maxo.utils.facades import MessageCreatedFacade
+
+
+def test_writes_do_not_touch_base() -> None:
+    base = {"config": 1, "container": 2}
+    ctx = Ctx({"update": 3}, base=base)
+
+    ctx["config"] = 10
+    del ctx["container"]
+
+    assert dict(ctx) == {"update": 3, "config": 10}
+    assert "container" not in ctx
+    assert len(ctx) == 2
+    assert base == {"config": 1, "container": 2}
+
+
+def test_deleted_base_key() -> None:
+    ctx = Ctx(base={"key": 1})
+
+    assert ctx.pop("key") == 1
+    with pytest.raises(KeyError):
+        ctx["key"]
+    with pytest.raises(KeyError):
+        del ctx["key"]
+    assert ctx.get("key") is None
+
+    ctx["key"] = 2
+    assert ctx["key"] == 2
+
+
+def test_copy_is_independent() -> None:
+    ctx = Ctx({"a": 1}, base={"b": 2})
+    copied = copy(ctx)
+
+    copied["a"] = 10
+    del copied["b"]
+
+    assert dict(ctx) == {"a": 1, "b": 2}
+    assert dict(copied) == {"a": 10}
+    assert copied.base is ctx.base
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda ctx: ctx.update(b=20),
+        lambda ctx: ctx.update(a=10, new=1),
+        lambda ctx: ctx.pop("b"),
+        lambda ctx: ctx.pop("c"),
+    ],
+)
+def test_update_from_copy_matches_dict(change: Any) -> None:
+    ctx = Ctx({"c": 30, "d": 4}, base={"a": 1, "b": 2, "c": 3})
+    del ctx["a"]
+    reference = dict(ctx)
+
+    copied, reference_copied = ctx.copy(), dict(reference)
+    change(copied)
+    change(reference_copied)
+    ctx["b"] = 200
+    reference["b"] = 200
+
+    ctx.update(copied)
+    reference.update(reference_copied)
+
+    assert dict(ctx) == reference
+
+
+@pytest.mark.asyncio
+async def test_workflow_data_is_shared_not_copied() -> None:
+    dp = Dispatcher(workflow_data={"config": object()})
+    seen: list[Ctx] = []
+
+    async def handler(ctx: Ctx, config: object) -> None:
+        ctx["config"] = "overridden"
+        seen.append(ctx)
+
+    dp.before_startup.handler(handler)
+    await dp.feed_signal(BeforeStartup())
+
+    assert seen[0].base is dp.workflow_data.snapshot()
+    assert dp.workflow_data["config"] != "overridden"
+
+
+@pytest.mark.asyncio
+async def test_update_sees_workflow_data_snapshot() -> None:
+    dp = Dispatcher(workflow_data={"config": 1})
+    entered = asyncio.Event()
+    release = asyncio.Event()
+    seen: list[Ctx] = []
+
+    async def handler(ctx: Ctx) -> None:
+        seen.append(ctx)
+        entered.set()
+        await release.wait()
+
+    dp.before_startup.handler(handler)
+    task = asyncio.create_task(dp.feed_signal(BeforeStartup()))
+    await entered.wait()
+
+    dp.workflow_data["config"] = 2
+    dp.workflow_data["bots"] = []
+    release.set()
+    await task
+
+    ctx = seen[0]
+    # Изменения после начала обработки не видны
+    assert ctx["config"] == 1
+    assert "bots" not in ctx
+    del ctx["config"]
+    dp.workflow_data["config"] = 3
+    assert "config" not in ctx
+
+    await dp.feed_signal(BeforeStartup())
+    assert seen[1]["config"] == 3
+    assert seen[1]["bots"] == []
+
+
+def test_lazy_value_is_computed_once() -> None:
+    calls = 0
+
+    def factory() -> int:
+        nonlocal calls
+        calls += 1
+        return 42
+
+    ctx = Ctx()
+    ctx.set_lazy("answer", factory)
+    copied = ctx.copy()
+
+    assert calls == 0
+    assert "answer" in ctx
+    assert copied["answer"] == 42
+    assert dict(ctx) == {"answer": 42}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_lazy_value_is_hidden_until_resolved() -> None:
+    calls = 0
+
+    async def factory() -> str:
+        nonlocal calls
+        calls += 1
+        return "loaded"
+
+    ctx = Ctx({"a": 1})
+    ctx.set_lazy("state", factory)
+    layer = Ctx(base=ctx.copy())
+
+    assert "state" not in ctx
+    assert dict(ctx) == {"a": 1}
+    assert len(ctx) == 1
+    assert ctx.get("state", "missing") == "missing"
+    with pytest.raises(KeyError):
+        ctx["state"]
+
+    await layer.resolve(["state"])
+    await ctx.resolve()
+
+    assert layer["state"] == ctx["state"] == "loaded"
+    assert calls == 1
+
+
+class Form(StatesGroup):
+    name = State()
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.get_state_calls = 0
+
+    async def get_state(self, key: Any) -> str | None:
+        self.get_state_calls += 1
+        return await super().get_state(key)
+
+
+def make_update(text: str) -> MaxoUpdate[MessageCreated]:
+    return MaxoUpdate(
+        update=MessageCreated(
+            message=Message(
+                body=MessageBody(mid="mid.1", seq=1, text=text),
+                recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+                timestamp=datetime.now(UTC),
+                sender=User(
+                    user_id=1,
+                    first_name="Test",
+                    is_bot=False,
+                    last_activity_time=datetime.now(UTC),
+                ),
+            ),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fsm_state_is_loaded_on_demand(bot: Any) -> None:
+    storage = CountingStorage()
+    dp = Dispatcher(storage=storage, lazy_state=True)
+    facades: list[Any] = []
+
+    @dp.message_created(StateFilter(Form.name))
+    async def in_form(_: MessageCreated, raw_state: str) -> str:
+        return raw_state
+
+    @dp.message_created()
+    async def echo(_: MessageCreated, facade: MessageCreatedFacade) -> str:
+        facades.append(facade)
+        return "echo"
+
+    other = Dispatcher(storage=storage, lazy_state=True)
+
+    @other.message_created()
+    async def plain(_: MessageCreated) -> str:
+        return "plain"
+
+    for dispatcher in (dp, other):
+        await dispatcher.feed_signal(BeforeStartup())
+        await dispatcher.feed_signal(AfterStartup())
+
+    assert await other.feed_update(make_update("hi"), bot) == "plain"
+    assert storage.get_state_calls == 0
+
+    assert await dp.feed_update(make_update("hi"), bot) == "echo"
+    assert storage.get_state_calls == 1
+    assert isinstance(facades[0], MessageCreatedFacade)
+
+
+@pytest.mark.asyncio
+async def test_fsm_state_is_eager_by_default(bot: Any) -> None:
+    storage = MemoryStorage()
+    dp = Dispatcher(storage=storage)
+    seen: list[Any] = []
+
+    async def read_state(update: Any, ctx: Ctx, next: Any) -> Any:
+        seen.append(ctx.get("raw_state", "missing"))
+        return await next(ctx)
+
+    dp.message_created.middleware.outer(read_state)
+
+    @dp.message_created()
+    async def echo(_: MessageCreated) -> str:
+        return "echo"
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+
+    assert await dp.feed_update(make_update("hi"), bot) == "echo"
+    assert seen == [None]
+
+
+def test_workflow_data_snapshot_is_reused_until_change() -> None:
+    data = WorkflowData(a=1)
+
+    snapshot = data.snapshot()
+    assert data.snapshot() is snapshot
+
+    data.update(b=2)
+    assert data.snapshot() is not snapshot
+    assert dict(data.snapshot()) == {"a": 1, "b": 2}
+
+    snapshot = data.snapshot()
+    data.setdefault("c", 3)
+    assert data.snapshot()["c"] == 3
+    assert "c" not in snapshot
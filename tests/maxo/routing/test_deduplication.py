@@ -0,0 +1,156 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.routing.deduplication import MemoryDeduplicator, update_identity
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.signals import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+@pytest.fixture
+def update() -> MessageCreated:
+    return MessageCreated(
+        message=Message(
+            body=MessageBody(mid="mid.1", seq=1),
+            recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+            timestamp=datetime.now(UTC),
+            sender=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+        ),
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+    )
+
+
+def test_update_identity(update: MessageCreated) -> None:
+    assert update_identity(update) == "message_created:mid.1:1735689600000"
+
+
+@pytest.mark.asyncio
+async def test_memory_window_is_bounded() -> None:
+    deduplicator = MemoryDeduplicator(max_size=2)
+
+    assert await deduplicator.remember("a")
+    assert not await deduplicator.remember("a")
+    assert await deduplicator.remember("b")
+    assert await deduplicator.remember("c")
+
+    assert len(deduplicator) == 2
+    # "a" вытеснен из окна
+    assert await deduplicator.remember("a")
+
+
+@pytest.mark.asyncio
+async def test_memory_keys_expire() -> None:
+    deduplicator = MemoryDeduplicator(ttl=0)
+
+    assert await deduplicator.remember("a")
+    assert await deduplicator.remember("a")
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_skips_duplicates(update: MessageCreated, bot: Any) -> None:
+    dp = Dispatcher(deduplicator=MemoryDeduplicator())
+    calls = 0
+
+    @dp.message_created()
+    async def handler(_: MessageCreated) -> None:
+        nonlocal calls
+        calls += 1
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+    # Тот же апдейт другого бота не считается повтором
+    await dp.feed_max_update(MaxoUpdate(update=update), type(bot)(user_id=2))
+
+    assert calls == 2
+
+
+class BrokenDeduplicator(MemoryDeduplicator):
+    async def remember(self, key: str) -> bool:
+        raise ConnectionError
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_survives_deduplicator_errors(
+    update: MessageCreated,
+    bot: Any,
+) -> None:
+    dp = Dispatcher(deduplicator=BrokenDeduplicator())
+    calls = 0
+
+    @dp.message_created()
+    async def handler(_: MessageCreated) -> None:
+        nonlocal calls
+        calls += 1
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_update_is_not_a_duplicate(
+    update: MessageCreated,
+    bot: Any,
+) -> None:
+    dp = Dispatcher(deduplicator=MemoryDeduplicator())
+    calls = 0
+
+    @dp.message_created()
+    async def handler(_: MessageCreated) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+    await dp.feed_max_update(MaxoUpdate(update=update), bot)
+
+    # Повторная доставка обработана, а после успеха повторы отбрасываются
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_update_is_not_a_duplicate(
+    update: MessageCreated,
+    bot: Any,
+) -> None:
+    deduplicator = MemoryDeduplicator()
+    dp = Dispatcher(deduplicator=deduplicator)
+    started = asyncio.Event()
+
+    @dp.message_created()
+    async def handler(_: MessageCreated) -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+
+    task = asyncio.create_task(dp.feed_max_update(MaxoUpdate(update=update), bot))
+    await started.wait()
+    assert len(deduplicator) == 1
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert len(deduplicator) == 0
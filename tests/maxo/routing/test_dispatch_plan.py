@@ -0,0 +1,109 @@
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.routing.ctx import Ctx
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.interfaces import NextMiddleware
+from maxo.routing.routers.simple import Router
+from maxo.routing.signals import BeforeShutdown, BeforeStartup
+from maxo.routing.updates.message_callback import MessageCallback
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.routing.utils import format_dispatch_plan
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+@pytest.fixture
+def update() -> MessageCreated:
+    return MessageCreated(
+        message=Message(
+            body=MessageBody(mid="test", seq=1),
+            recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+            timestamp=datetime.now(UTC),
+            sender=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+        ),
+        timestamp=datetime.now(UTC),
+    )
+
+
+async def handler(_: Any) -> str:
+    return "OK"
+
+
+def make_tree() -> tuple[Dispatcher, Router, Router, Router]:
+    dp = Dispatcher()
+    messages = Router("messages")
+    callbacks = Router("callbacks")
+    nested = Router("nested")
+    dp.include(messages, callbacks)
+    callbacks.include(nested)
+
+    messages.message_created.handler(handler)
+    nested.message_callback.handler(handler)
+    return dp, messages, callbacks, nested
+
+
+@pytest.mark.asyncio
+async def test_plan_skips_empty_subtrees() -> None:
+    dp, messages, callbacks, nested = make_tree()
+
+    await dp.feed_signal(BeforeStartup())
+
+    assert dp.dispatch_plan[MessageCreated] == (messages,)
+    assert dp.dispatch_plan[MessageCallback] == (callbacks,)
+    assert callbacks.dispatch_plan[MessageCallback] == (nested,)
+    assert callbacks.dispatch_plan[MessageCreated] == ()
+    # Сигналы запуска и остановки обрабатывает каждый роутер
+    assert dp.dispatch_plan[BeforeShutdown] == (messages, callbacks)
+
+
+@pytest.mark.asyncio
+async def test_plan_keeps_outer_middlewares(ctx: Ctx) -> None:
+    dp, _, callbacks, _ = make_tree()
+    calls: list[str] = []
+
+    async def middleware(
+        update: MessageCreated,
+        ctx: Ctx,
+        next: NextMiddleware[MessageCreated],
+    ) -> Any:
+        calls.append("callbacks")
+        return await next(ctx)
+
+    callbacks.message_created.middleware.outer(middleware)
+    await dp.feed_signal(BeforeStartup())
+
+    assert dp.dispatch_plan[MessageCreated][-1] is callbacks
+    assert await dp.trigger(ctx) == "OK"
+    # Роутер messages обработал апдейт раньше, до callbacks очередь не дошла
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_plan_is_reset_on_shutdown(ctx: Ctx) -> None:
+    dp, *_ = make_tree()
+
+    await dp.feed_signal(BeforeStartup())
+    assert await dp.trigger(ctx) == "OK"
+
+    await dp.feed_signal(BeforeShutdown())
+    assert dp.dispatch_plan == {}
+
+
+def test_format_dispatch_plan() -> None:
+    dp, *_ = make_tree()
+
+    dump = format_dispatch_plan(dp)
+
+    assert (
+        "MessageCallback:\n  Dispatcher\n    callbacks\n      nested (handlers=1)"
+        in dump
+    )
+    assert "MessageCreated:\n  Dispatcher\n    messages (handlers=1)\n" in dump
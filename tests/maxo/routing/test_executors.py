@@ -0,0 +1,159 @@
+import asyncio
+import math
+import threading
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.errors import UnknownExecutorError
+from maxo.routing.ctx import Ctx
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.executors import InlineExecutor, ProcessExecutor, ThreadExecutor
+from maxo.routing.routers.simple import Router
+from maxo.routing.signals import AfterShutdown, BeforeStartup
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+@pytest.fixture
+def update() -> MessageCreated:
+    return MessageCreated(
+        message=Message(
+            body=MessageBody(mid="test", seq=1),
+            recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+            timestamp=datetime.now(UTC),
+            sender=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+        ),
+        timestamp=datetime.now(UTC),
+    )
+
+
+def thread_name(_: Any) -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_handler_runs_in_router_executor(ctx: Ctx) -> None:
+    executor = ThreadExecutor(name="heavy", workers=1)
+    dp = Dispatcher(executors={"heavy": executor})
+    router = Router("heavy", executor="heavy")
+    dp.include(router)
+    router.message_created.handler(thread_name)
+
+    await dp.feed_signal(BeforeStartup())
+    result = await dp.trigger(ctx)
+    await dp.feed_signal(AfterShutdown())
+
+    assert result.startswith("heavy")
+    assert executor.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_handler_executor_overrides_router(ctx: Ctx) -> None:
+    router_executor = ThreadExecutor(name="router")
+    handler_executor = InlineExecutor()
+    dp = Dispatcher(executor=router_executor)
+    dp.message_created.handler(thread_name, executor=handler_executor)
+
+    await dp.feed_signal(BeforeStartup())
+    result = await dp.trigger(ctx)
+
+    assert result == threading.current_thread().name
+    assert handler_executor.completed == 1
+    assert router_executor.completed == 0
+
+
+@pytest.mark.asyncio
+async def test_default_executor(ctx: Ctx) -> None:
+    executor = ThreadExecutor(name="default-pool")
+    dp = Dispatcher(executors={"default": executor})
+    router = Router()
+    dp.include(router)
+    router.message_created.handler(thread_name)
+
+    await dp.feed_signal(BeforeStartup())
+    result = await dp.trigger(ctx)
+
+    assert result.startswith("default-pool")
+
+
+@pytest.mark.asyncio
+async def test_coroutine_handler_not_bound() -> None:
+    executor = ThreadExecutor()
+    dp = Dispatcher(executor=executor)
+
+    @dp.message_created()
+    async def handler(_: Any) -> None:
+        return None
+
+    await dp.feed_signal(BeforeStartup())
+
+    (update_handler,) = dp.message_created.handlers
+    assert update_handler.bound_executor is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_executor_name() -> None:
+    dp = Dispatcher(executors={"heavy": ThreadExecutor()})
+    dp.message_created.handler(thread_name, executor="missing")
+
+    with pytest.raises(UnknownExecutorError, match=r"'missing'.*'heavy'"):
+        await dp.feed_signal(BeforeStartup())
+
+
+@pytest.mark.asyncio
+async def test_max_pending() -> None:
+    executor = ThreadExecutor(workers=4, max_pending=1)
+    release = threading.Event()
+
+    first = asyncio.create_task(executor.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(executor.run(release.is_set))
+    await asyncio.sleep(0.05)
+
+    assert executor.active == 1
+    assert executor.waiting == 1
+
+    release.set()
+    assert await first is True
+    assert await second is True
+    assert executor.completed == 2
+    assert executor.max_wait_time > 0
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_counted() -> None:
+    executor = InlineExecutor()
+
+    with pytest.raises(ZeroDivisionError):
+        await executor.run(divmod, 1, 0)
+
+    assert executor.completed == 1
+    assert executor.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_process_executor() -> None:
+    executor = ProcessExecutor(workers=1)
+    try:
+        assert await executor.run(math.factorial, 10) == 3628800
+    finally:
+        await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_not_picklable_arguments() -> None:
+    executor = ProcessExecutor(workers=1)
+
+    with pytest.raises(TypeError, match="lock"):
+        await executor.run(thread_name, None, lock=threading.Lock())
+
+    assert executor.failed == 1
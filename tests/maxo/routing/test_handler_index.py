@@ -0,0 +1,303 @@
+import re
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.fsm import State, StateFilter, StatesGroup
+from maxo.routing.ctx import Ctx
+from maxo.routing.filters import command as command_module
+from maxo.routing.filters.command import Command, CommandObject
+from maxo.routing.filters.payload import Payload
+from maxo.routing.observers import UpdateObserver
+from maxo.routing.sentinels import UNHANDLED
+from maxo.routing.updates.message_callback import MessageCallback
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Callback, Message, MessageBody, Recipient, User
+
+
+def make_update(text: str) -> MessageCreated:
+    return MessageCreated(
+        message=Message(
+            body=MessageBody(mid="test", seq=1, text=text),
+            recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+            timestamp=datetime.now(UTC),
+            sender=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+        ),
+        timestamp=datetime.now(UTC),
+    )
+
+
+def make_ctx(text: str, bot: Any) -> Ctx:
+    return Ctx({"update": make_update(text), "bot": bot})
+
+
+def make_state_ctx(text: str, raw_state: str | None, bot: Any) -> Ctx:
+    ctx = make_ctx(text, bot)
+    ctx["raw_state"] = raw_state
+    return ctx
+
+
+def make_callback_ctx(payload: str, bot: Any) -> Ctx:
+    update = MessageCallback(
+        callback=Callback(
+            callback_id="test",
+            timestamp=datetime.now(UTC),
+            user=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+            payload=payload,
+        ),
+        timestamp=datetime.now(UTC),
+    )
+    return Ctx({"update": update, "bot": bot})
+
+
+class Item(Payload, prefix="item"):
+    id: int
+
+
+class Page(Payload, prefix="page"):
+    number: int
+
+
+class Form(StatesGroup):
+    name = State()
+    age = State()
+
+    class Address(StatesGroup):
+        city = State()
+
+
+def named_handler(name: str) -> Any:
+    async def handler(_: Any, command: CommandObject | None = None) -> Any:
+        return name, command and command.args
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_command_parsed_once(
+    bot: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    for index in range(100):
+        observer.handler(named_handler(f"cmd{index}"), Command(f"cmd{index}"))
+
+    calls = 0
+    extract_command = command_module.extract_command
+
+    def counting_extract_command(text: str) -> CommandObject:
+        nonlocal calls
+        calls += 1
+        return extract_command(text)
+
+    monkeypatch.setattr(command_module, "extract_command", counting_extract_command)
+
+    result = await observer.handler_lookup(make_ctx("/cmd99 some args", bot))
+
+    assert result == ("cmd99", "some args")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_parsed_command_is_not_a_handler_argument(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+
+    async def handler(_: Any, raw_command: str) -> Any:
+        return raw_command
+
+    observer.handler(handler, Command("start"))
+    ctx = make_ctx("/start", bot)
+    ctx["raw_command"] = "from workflow_data"
+
+    assert await observer.handler_lookup(ctx) == "from workflow_data"
+    assert set(ctx) == {"update", "bot", "command", "raw_command"}
+
+
+@pytest.mark.asyncio
+async def test_registration_order_is_kept(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    observer.handler(named_handler("start"), Command("start"))
+    observer.handler(named_handler("regexp"), Command(re.compile(r"help\d")))
+    observer.handler(named_handler("fallback"))
+    observer.handler(named_handler("help"), Command("help"))
+
+    assert await observer.handler_lookup(make_ctx("/start", bot)) == ("start", None)
+    assert await observer.handler_lookup(make_ctx("/help1", bot)) == ("regexp", None)
+    assert await observer.handler_lookup(make_ctx("/help", bot)) == ("fallback", None)
+    assert await observer.handler_lookup(make_ctx("text", bot)) == ("fallback", None)
+
+
+@pytest.mark.asyncio
+async def test_ignore_case(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    observer.handler(named_handler("exact"), Command("Start"))
+    observer.handler(named_handler("any"), Command("start", ignore_case=True))
+
+    assert await observer.handler_lookup(make_ctx("/Start", bot)) == ("exact", None)
+    assert await observer.handler_lookup(make_ctx("/START", bot)) == ("any", None)
+    assert await observer.handler_lookup(make_ctx("/stop", bot)) is UNHANDLED
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_after_registration(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    observer.handler(named_handler("start"), Command("start"))
+    assert await observer.handler_lookup(make_ctx("/help", bot)) is UNHANDLED
+
+    observer.handler(named_handler("help"), Command("help"))
+
+    assert await observer.handler_lookup(make_ctx("/help", bot)) == ("help", None)
+
+
+@pytest.mark.asyncio
+async def test_payload_handlers_are_indexed(
+    bot: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    observer = UpdateObserver[MessageCallback]()
+    for _ in range(10):
+        observer.handler(named_handler("page"), Page.filter())
+    observer.handler(named_handler("item"), Item.filter())
+
+    unpacked: list[str] = []
+    unpack = Payload.unpack.__func__  # type: ignore[attr-defined]
+
+    def counting_unpack(cls: type[Payload], value: str) -> Payload:
+        unpacked.append(cls.__prefix__)
+        return unpack(cls, value)
+
+    monkeypatch.setattr(Payload, "unpack", classmethod(counting_unpack))
+
+    result = await observer.handler_lookup(make_callback_ctx("item:7", bot))
+    unhandled = await observer.handler_lookup(make_callback_ctx("unknown:1", bot))
+
+    assert result == ("item", None)
+    assert unhandled is UNHANDLED
+    assert unpacked == ["item"]
+
+
+@pytest.mark.asyncio
+async def test_payload_order_with_unindexed_handlers(bot: Any) -> None:
+    observer = UpdateObserver[MessageCallback]()
+    observer.handler(named_handler("page"), Page.filter())
+    observer.handler(named_handler("fallback"))
+    observer.handler(named_handler("item"), Item.filter())
+
+    assert await observer.handler_lookup(make_callback_ctx("page:1", bot)) == (
+        "page",
+        None,
+    )
+    assert await observer.handler_lookup(make_callback_ctx("item:1", bot)) == (
+        "fallback",
+        None,
+    )
+
+
+def test_payload_codec_is_compiled_once() -> None:
+    codec = Item.codec()
+
+    assert Item.codec() is codec
+    assert codec.names == ("id",)
+    assert Item.unpack(Item(id=3).pack()) == Item(id=3)
+
+
+@pytest.mark.asyncio
+async def test_state_handlers_are_indexed(
+    bot: Any,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    for index in range(50):
+        observer.handler(named_handler(f"state{index}"), StateFilter(f"s:{index}"))
+    observer.handler(named_handler("form"), StateFilter(Form.Address))
+    observer.handler(named_handler("default"), StateFilter(None))
+
+    checked: list[StateFilter] = []
+    call = StateFilter.__call__
+
+    async def counting_call(self: StateFilter, update: Any, ctx: Ctx) -> bool:
+        checked.append(self)
+        return await call(self, update, ctx)
+
+    monkeypatch.setattr(StateFilter, "__call__", counting_call)
+
+    result = await observer.handler_lookup(make_state_ctx("hi", "s:7", bot))
+    unhandled = await observer.handler_lookup(make_state_ctx("hi", "other", bot))
+
+    assert result == ("state7", None)
+    assert unhandled is UNHANDLED
+    assert checked == [observer.handlers[7].filter]
+
+
+@pytest.mark.asyncio
+async def test_state_index_candidates(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    for index in range(50):
+        observer.handler(named_handler(f"state{index}"), StateFilter(f"s:{index}"))
+    observer.handler(named_handler("form"), StateFilter(Form.Address))
+    observer.handler(named_handler("default"), StateFilter(None))
+    observer.handler(named_handler("any"), StateFilter("*"))
+
+    ctx = make_state_ctx("hi", Form.Address.city.state, bot)
+    candidates = await observer._lookup_candidates(ctx)
+
+    assert list(candidates) == [observer.handlers[50], observer.handlers[52]]
+    assert await observer.handler_lookup(ctx) == ("form", None)
+    assert await observer.handler_lookup(make_state_ctx("hi", None, bot)) == (
+        "default",
+        None,
+    )
+    assert await observer.handler_lookup(make_state_ctx("hi", "s:3", bot)) == (
+        "state3",
+        None,
+    )
+    assert await observer.handler_lookup(make_state_ctx("hi", "other", bot)) == (
+        "any",
+        None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_state_and_command_indexes_are_combined(bot: Any) -> None:
+    observer = UpdateObserver[MessageCreated]()
+    observer.handler(named_handler("start"), Command("start"))
+    observer.handler(named_handler("name"), StateFilter(Form.name) & Command("set"))
+    observer.handler(named_handler("age"), StateFilter(Form.age))
+    observer.handler(named_handler("set"), Command("set"))
+
+    name_state = Form.name.state
+    assert await observer.handler_lookup(make_state_ctx("/set", name_state, bot)) == (
+        "name",
+        None,
+    )
+    assert await observer.handler_lookup(make_state_ctx("/set", None, bot)) == (
+        "set",
+        None,
+    )
+    assert await observer.handler_lookup(
+        make_state_ctx("/start", Form.age.state, bot),
+    ) == ("start", None)
+    assert await observer.handler_lookup(
+        make_state_ctx("text", Form.age.state, bot),
+    ) == ("age", None)
+    assert await observer.handler_lookup(make_state_ctx("text", None, bot)) is (
+        UNHANDLED
+    )
+
+
+def test_state_filter_raw_states() -> None:
+    assert StateFilter(Form).raw_states == frozenset(Form.__all_states_names__)
+    assert StateFilter(Form.name, None).raw_states == {Form.name.state, None}
+    assert StateFilter(Form.name, "*").raw_states is None
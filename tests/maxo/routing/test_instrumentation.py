@@ -0,0 +1,213 @@
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from maxo import Bot
+from maxo.bot.methods import GetMyInfo
+from maxo.bot.state import RunningBotState
+from maxo.enums import ChatType
+from maxo.instrumentation import (
+    Histogram,
+    Instrumentation,
+    Span,
+    Stage,
+    StageMetrics,
+    render_prometheus,
+)
+from maxo.routing.ctx import Ctx
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.filters import BaseFilter
+from maxo.routing.interfaces.middleware import NextMiddleware
+from maxo.routing.routers.simple import Router
+from maxo.routing.signals import AfterStartup, BeforeStartup
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+def make_update() -> MaxoUpdate[MessageCreated]:
+    return MaxoUpdate(
+        update=MessageCreated(
+            message=Message(
+                body=MessageBody(mid="mid.1", seq=1, text="hi"),
+                recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+                timestamp=datetime.now(UTC),
+                sender=User(
+                    user_id=1,
+                    first_name="Test",
+                    is_bot=False,
+                    last_activity_time=datetime.now(UTC),
+                ),
+            ),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+
+
+class Never(BaseFilter[MessageCreated]):
+    async def __call__(self, update: MessageCreated, ctx: Ctx) -> bool:
+        return False
+
+
+class Marker:
+    async def __call__(
+        self,
+        update: MessageCreated,
+        ctx: Ctx,
+        next: NextMiddleware[MessageCreated],
+    ) -> Any:
+        return await next(ctx)
+
+
+async def skipped(_: MessageCreated) -> str:
+    return "skipped"
+
+
+async def greet(_: MessageCreated) -> str:
+    return "hello"
+
+
+def test_histogram_percentiles() -> None:
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(value / 1_000_000)
+
+    assert histogram.count == 1000
+    assert histogram.max == pytest.approx(0.001)
+    assert histogram.percentile(50) == pytest.approx(0.0005, rel=0.125)
+    assert histogram.percentile(99) == pytest.approx(0.00099, rel=0.125)
+    assert histogram.percentile(100) == histogram.max
+
+
+def test_histogram_cumulative() -> None:
+    histogram = Histogram(precision=2)
+    for value in (3, 15, 16, 24, 100, 7000):
+        histogram.record(value / 1_000_000)
+
+    assert list(histogram.cumulative([16e-6, 128e-6, 4096e-6])) == [
+        (16e-6, 3),
+        (128e-6, 5),
+        (4096e-6, 5),
+    ]
+
+
+def test_histogram_cumulative_includes_bound() -> None:
+    histogram = Histogram()
+    for value in (5e-6, 6e-6, 0.25, 0.5):
+        histogram.record(value)
+
+    assert list(histogram.cumulative([5e-6, 0.25, 0.5])) == [
+        (5e-6, 1),
+        (0.25, 3),
+        (0.5, 4),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_spans(bot: Any) -> None:
+    spans: list[Span] = []
+    instrumentation = Instrumentation(spans.append)
+    dp = Dispatcher(instrumentation=instrumentation)
+    router = Router("greetings")
+    dp.include(router)
+    router.message_created.middleware.outer(Marker())
+    router.message_created.middleware.inner(Marker())
+    router.message_created.handler(skipped, Never())
+    router.message_created.handler(greet)
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_signal(AfterStartup())
+    assert await dp.feed_max_update(make_update(), bot) == "hello"
+
+    recorded = {(span.stage, span.router, span.name) for span in spans}
+    assert recorded >= {
+        (Stage.OUTER_MIDDLEWARE, "Dispatcher", "FSMContextMiddleware"),
+        (Stage.OUTER_MIDDLEWARE, "greetings", "Marker"),
+        (Stage.INNER_MIDDLEWARE, "greetings", "Marker"),
+        (Stage.FILTER, "greetings", "skipped"),
+        (Stage.FILTER, "greetings", "greet"),
+        (Stage.HANDLER, "greetings", "greet"),
+        (Stage.UPDATE, "Dispatcher", "MessageCreated"),
+    }
+    assert (Stage.HANDLER, "greetings", "skipped") not in recorded
+    assert all(
+        span.name != "Dispatcher._feed_update_handler"
+        for span in spans
+        if span.stage in (Stage.HANDLER, Stage.FILTER)
+    )
+    assert spans[-1].stage == Stage.UPDATE
+
+
+@pytest.mark.asyncio
+async def test_handler_error_is_recorded(bot: Any) -> None:
+    metrics = StageMetrics()
+    dp = Dispatcher(instrumentation=Instrumentation(metrics))
+
+    @dp.message_created()
+    async def broken(_: MessageCreated) -> None:
+        raise ZeroDivisionError
+
+    await dp.feed_signal(BeforeStartup())
+    await dp.feed_max_update(make_update(), bot)
+
+    key = (
+        Stage.HANDLER,
+        "Dispatcher",
+        "test_handler_error_is_recorded.<locals>.broken",
+    )
+    assert metrics.errors[key] == 1
+    assert metrics.histograms[key].count == 1
+
+
+@pytest.mark.asyncio
+async def test_api_call_span() -> None:
+    metrics = StageMetrics()
+    bot = Bot("token", warming_up=False, instrumentation=Instrumentation(metrics))
+    api_client = MagicMock()
+    api_client.call_method = AsyncMock(return_value="info")
+    bot._state = RunningBotState(info=MagicMock(), api_client=api_client)
+
+    assert await bot.call_method(GetMyInfo()) == "info"
+
+    histogram = metrics.histogram(Stage.API_CALL, "GetMyInfo")
+    assert histogram is not None
+    assert histogram.count == 1
+
+
+def test_listener_errors_are_suppressed() -> None:
+    spans: list[Span] = []
+    instrumentation = Instrumentation()
+
+    @instrumentation.subscribe
+    def broken(span: Span) -> None:
+        raise RuntimeError
+
+    instrumentation.subscribe(spans.append)
+    instrumentation.emit(Span(Stage.HANDLER, "handler", None, 0.1))
+
+    assert len(spans) == 1
+
+
+def test_render_prometheus() -> None:
+    metrics = StageMetrics()
+    metrics(Span(Stage.HANDLER, 'say "hi"', "main", 0.00002))
+    metrics(Span(Stage.HANDLER, 'say "hi"', "main", 0.5, ZeroDivisionError()))
+
+    text = render_prometheus(metrics, bounds=[16e-6, 32e-6, 1.0])
+
+    labels = 'stage="handler",router="main",name="say \\"hi\\""'
+    assert text.splitlines() == [
+        "# HELP maxo_stage_duration_seconds Duration of update processing stages.",
+        "# TYPE maxo_stage_duration_seconds histogram",
+        f'maxo_stage_duration_seconds_bucket{{{labels},le="1.6e-05"}} 0',
+        f'maxo_stage_duration_seconds_bucket{{{labels},le="3.2e-05"}} 1',
+        f'maxo_stage_duration_seconds_bucket{{{labels},le="1.0"}} 2',
+        f'maxo_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+        f"maxo_stage_duration_seconds_sum{{{labels}}} 0.50002",
+        f"maxo_stage_duration_seconds_count{{{labels}}} 2",
+        "# HELP maxo_stage_errors_total Update processing stages failed with an error.",
+        "# TYPE maxo_stage_errors_total counter",
+        f"maxo_stage_errors_total{{{labels}}} 1",
+    ]
@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any
+
+import pytest
+from magic_filter import F
+
+from maxo.integrations.magic_filter import MagicData
+from maxo.routing.ctx import Ctx
+from maxo.routing.filters import (
+    AndFilter,
+    BaseFilter,
+    ExceptionMessageFilter,
+    OrFilter,
+    PureFilter,
+    logic as logic_module,
+)
+from maxo.routing.updates.error import ErrorEvent
+
+
+class Check(BaseFilter[Any]):
+    side_effect_free = True
+
+    def __init__(
+        self,
+        name: str,
+        result: bool,
+        delay: float = 0,
+        cost: float | None = None,
+    ) -> None:
+        self.name = name
+        self.result = result
+        self.delay = delay
+        self.cost = cost
+
+    async def __call__(self, update: Any, ctx: Ctx) -> bool:
+        ctx["calls"].append(self.name)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.result
+
+
+class Effect(Check):
+    side_effect_free = False
+
+
+@pytest.mark.asyncio
+async def test_static_cost_order() -> None:
+    expensive = Check("expensive", result=True, cost=1000)
+    cheap = Check("cheap", result=False, cost=1)
+    ctx = Ctx({"calls": []})
+
+    and_filter = expensive & cheap
+
+    assert not await and_filter(None, ctx)
+    assert ctx["calls"] == ["cheap"]
+    assert tuple(and_filter.order) == (cheap, expensive)
+
+
+@pytest.mark.asyncio
+async def test_filters_with_side_effects_keep_place() -> None:
+    expensive = Check("expensive", result=True, cost=1000)
+    effect = Effect("effect", result=True, cost=1)
+    cheap = Check("cheap", result=True, cost=1)
+    ctx = Ctx({"calls": []})
+
+    assert await AndFilter(expensive, effect, cheap)(None, ctx)
+    assert ctx["calls"] == ["expensive", "effect", "cheap"]
+
+
+@pytest.mark.asyncio
+async def test_adaptive_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logic_module, "_REORDER_EVERY", 4)
+    slow = Check("slow", result=True, delay=0.01)
+    fast = Check("fast", result=False)
+    and_filter = AndFilter(slow, fast)
+
+    for _ in range(4):
+        assert not await and_filter(None, Ctx({"calls": []}))
+
+    assert tuple(and_filter.order) == (fast, slow)
+    ctx = Ctx({"calls": []})
+    assert not await and_filter(None, ctx)
+    assert ctx["calls"] == ["fast"]
+
+
+@pytest.mark.asyncio
+async def test_or_prefers_passing_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logic_module, "_REORDER_EVERY", 4)
+    rarely = Check("rarely", result=False)
+    often = Check("often", result=True)
+    or_filter = OrFilter(rarely, often)
+
+    for _ in range(4):
+        assert await or_filter(None, Ctx({"calls": []}))
+
+    assert tuple(or_filter.order) == (often, rarely)
+
+
+def test_cost_hints() -> None:
+    pure = PureFilter(Check("check", result=True), cost=5)
+
+    assert pure.side_effect_free
+    assert pure.cost == 5
+    assert PureFilter(pure).cost == 5
+    assert (pure & Check("other", result=True, cost=1)).cost == 6
+    assert (pure | Effect("effect", result=True, cost=1)).side_effect_free is False
+    assert (~pure).cost == 5
+
+
+class SlowExceptionMessage(ExceptionMessageFilter[Any, Any]):
+    cost = None
+
+    async def __call__(self, update: ErrorEvent[Any, Any], ctx: Ctx) -> bool:
+        await asyncio.sleep(0.001)
+        return await super().__call__(update, ctx)
+
+
+@pytest.mark.asyncio
+async def test_ctx_reader_stays_after_writer(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logic_module, "_REORDER_EVERY", 4)
+    writer = SlowExceptionMessage(r"user (\w+)")
+    reader = MagicData(F.match_exception.group(1) == "admin")
+    and_filter = AndFilter(writer, reader)
+    event = ErrorEvent(exception=ValueError("user admin"), update=None)
+
+    for _ in range(12):
+        assert await and_filter(event, Ctx())
+
+    assert tuple(and_filter.order) == (writer, reader)
+    assert not reader.side_effect_free
+    assert not writer.side_effect_free
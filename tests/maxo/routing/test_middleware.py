@@ -10,6 +10,7 @@ from maxo.routing.dispatcher import Dispatcher
 from maxo.routing.filters import AlwaysFalseFilter, AlwaysTrueFilter, BaseFilter
 from maxo.routing.interfaces import NextMiddleware
 from maxo.routing.middlewares.fsm_context import FSMContextMiddleware
+from maxo.routing.middlewares.manager import MiddlewareManager
 from maxo.routing.routers.simple import Router
 from maxo.routing.sentinels import UNHANDLED
 from maxo.routing.signals import BeforeStartup
@@ -172,6 +173,36 @@ async def test_nested_router_middleware_execution(ctx: Ctx) -> None:
     ]
 
 
+@pytest.mark.asyncio
+async def test_middleware_chains_are_compiled_on_startup(
+    ctx: Ctx,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    dp = Dispatcher()
+    child_router = Router("child")
+    dp.include(child_router)
+    dp.message_created.middleware.outer.add(middleware_factory("dp"))
+    child_router.message_created.middleware.inner.add(middleware_factory("inner"))
+    child_router.message_created.handler(handler)
+
+    await dp.feed_signal(BeforeStartup())
+
+    def fail(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("Middleware chain is built per update")
+
+    monkeypatch.setattr(MiddlewareManager, "wrap_middlewares", fail)
+    for _ in range(2):
+        ctx["execution_order"] = []
+        assert await dp.trigger(ctx) == "OK"
+        assert ctx["execution_order"] == [
+            "dp_pre",
+            "inner_pre",
+            "handler",
+            "inner_post",
+            "dp_post",
+        ]
+
+
 @pytest.mark.asyncio
 async def test_router_filter_false_skips_router_inner_middleware(ctx: Ctx) -> None:
     dp = Dispatcher()
@@ -0,0 +1,98 @@
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.routing.ctx import Ctx
+from maxo.routing.dispatcher import Dispatcher
+from maxo.routing.filters import BaseFilter, PureFilter
+from maxo.routing.routers.simple import Router
+from maxo.routing.signals import BeforeStartup
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+def make_update() -> MessageCreated:
+    return MessageCreated(
+        message=Message(
+            body=MessageBody(mid="test", seq=1),
+            recipient=Recipient(chat_type=ChatType.DIALOG, chat_id=1),
+            timestamp=datetime.now(UTC),
+            sender=User(
+                user_id=1,
+                first_name="Test",
+                is_bot=False,
+                last_activity_time=datetime.now(UTC),
+            ),
+        ),
+        timestamp=datetime.now(UTC),
+    )
+
+
+class IsAdmin(BaseFilter[MessageCreated]):
+    def __init__(self, result: bool) -> None:
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self, update: MessageCreated, ctx: Ctx) -> bool:
+        self.calls += 1
+        ctx["admin_level"] = 3
+        ctx.pop("guest", None)
+        return self.result
+
+
+class Never(BaseFilter[MessageCreated]):
+    async def __call__(self, update: MessageCreated, ctx: Ctx) -> bool:
+        return False
+
+
+async def handler(_: Any, admin_level: int) -> int:
+    return admin_level
+
+
+@pytest.mark.asyncio
+async def test_filter_runs_once_per_update(bot: Any) -> None:
+    is_admin = IsAdmin(result=True)
+    pure_admin = PureFilter(is_admin)
+
+    dp = Dispatcher()
+    router = Router()
+    dp.include(router)
+    dp.message_created.handler(handler, pure_admin & Never())
+    router.message_created.handler(handler, pure_admin & Never())
+    router.message_created.handler(handler, pure_admin)
+
+    await dp.feed_signal(BeforeStartup())
+    for _ in range(3):
+        ctx = Ctx({"update": make_update(), "bot": bot, "guest": True})
+        assert await dp.trigger(ctx) == 3
+        assert "guest" not in ctx
+
+    assert is_admin.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_false_result() -> None:
+    is_admin = IsAdmin(result=False)
+    pure_admin = PureFilter(is_admin)
+    update = make_update()
+    ctx = Ctx({"update": update})
+
+    assert not await pure_admin(update, ctx.copy())
+    assert not await PureFilter(pure_admin)(update, ctx)
+
+    assert ctx["admin_level"] == 3
+    assert is_admin.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_per_update() -> None:
+    is_admin = IsAdmin(result=True)
+    pure_admin = PureFilter(is_admin)
+    ctx = Ctx()
+
+    assert await pure_admin(make_update(), ctx)
+    assert await pure_admin(make_update(), ctx)
+
+    assert is_admin.calls == 2
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from maxo.transport.backpressure import FairInFlightLimiter, InFlightLimiter
+
+
+@pytest.mark.asyncio
+async def test_acquire_blocks_until_release() -> None:
+    limiter = InFlightLimiter(max_in_flight=1)
+
+    await limiter.acquire()
+    assert limiter.in_flight == 1
+    assert not limiter.has_capacity
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    assert limiter.blocked
+
+    limiter.release()
+    await asyncio.wait_for(waiter, timeout=1)
+
+    assert limiter.in_flight == 1
+    assert not limiter.blocked
+    assert limiter.blocked_time > 0
+
+
+@pytest.mark.asyncio
+async def test_unbounded_limiter_counts() -> None:
+    limiter = InFlightLimiter()
+
+    for _ in range(10):
+        await limiter.acquire()
+
+    assert limiter.in_flight == 10
+    assert limiter.has_capacity
+    assert limiter.blocked_time == 0
+
+
+def test_release_without_acquire() -> None:
+    limiter = InFlightLimiter(max_in_flight=1)
+    with pytest.raises(RuntimeError):
+        limiter.release()
+
+
+def test_invalid_max_in_flight() -> None:
+    with pytest.raises(ValueError, match="max_in_flight"):
+        InFlightLimiter(max_in_flight=0)
+
+
+@pytest.mark.asyncio
+async def test_fair_limiter_round_robin() -> None:
+    limiter = FairInFlightLimiter(max_in_flight=1)
+    busy = limiter.member("busy")
+    quiet = limiter.member("quiet")
+
+    await busy.acquire()
+    order: list[str] = []
+
+    async def take(member, name: str) -> None:
+        await member.acquire()
+        order.append(name)
+
+    waiters = [
+        asyncio.create_task(take(busy, "busy")),
+        asyncio.create_task(take(busy, "busy")),
+        asyncio.create_task(take(quiet, "quiet")),
+    ]
+    await asyncio.sleep(0.01)
+    assert not quiet.has_capacity
+
+    for holder in (busy, busy, quiet):
+        holder.release()
+        await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+    assert order == ["busy", "quiet", "busy"]
+    assert quiet.blocked_time > 0
+
+
+@pytest.mark.asyncio
+async def test_fair_limiter_cancelled_waiter() -> None:
+    limiter = FairInFlightLimiter(max_in_flight=1)
+    first = limiter.member(1)
+    second = limiter.member(2)
+
+    await first.acquire()
+    waiter = asyncio.create_task(second.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    first.release()
+    assert limiter.in_flight == 0
+    assert limiter.has_capacity
+    assert second.in_flight == 0
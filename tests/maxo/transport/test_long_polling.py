@@ -15,6 +15,9 @@ from maxo.omit import Omitted
 from maxo.routing.dispatcher import Dispatcher
 from maxo.routing.signals.update import MaxoUpdate
 from maxo.transport.long_polling import LongPolling
+from maxo.transport.markers import MemoryMarkerStore
+from maxo.transport.schedulers import ChatOrderedScheduler
+from maxo.transport.workers import ProcessPool, WorkerLost
 from maxo.types import BotInfo, MaxoType, UpdateList
 
 
@@ -177,3 +180,163 @@ async def test_handles_general_exception(
         )
         mock_bot.state.api_client.call_method.assert_called_once()
         mock_dispatcher.feed_max_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_and_saves_last_processed_marker(mock_bot: Bot) -> None:
+    responses = [
+        UpdateList(updates=[MockUpdate(timestamp=1)], marker=5),
+        UpdateList(updates=[MockUpdate(timestamp=2)], marker=6),
+    ]
+
+    async def get_updates(method: GetUpdates) -> UpdateList:
+        if responses:
+            return responses.pop(0)
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    async def feed_max_update(update: MaxoUpdate[MockUpdate], bot: Bot) -> None:
+        if update.update.timestamp == 2:
+            await asyncio.Event().wait()
+
+    mock_bot.state.api_client.call_method.side_effect = get_updates
+    dispatcher = Dispatcher()
+    dispatcher.feed_max_update = AsyncMock(side_effect=feed_max_update)
+    store = MemoryMarkerStore()
+    polling = LongPolling(dispatcher, marker_store=store, drain_timeout=0.05)
+
+    with patch("maxo.transport.long_polling.loggers.long_polling") as mock_logger:
+        task = asyncio.create_task(
+            polling.start(mock_bot, auto_close_bot=False, handle_signals=False),
+        )
+        await asyncio.sleep(0.05)
+        polling.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    assert await store.get_marker(123) == 5
+    assert polling.in_flight == 0
+    mock_logger.warning.assert_called_once_with(
+        "Update dropped on shutdown. Update type=%r marker=%r",
+        "MockUpdate",
+        6,
+    )
+
+
+@pytest.mark.asyncio
+async def test_lost_update_blocks_marker(mock_bot: Bot) -> None:
+    responses = [
+        UpdateList(updates=[MockUpdate(timestamp=1)], marker=5),
+        UpdateList(updates=[MockUpdate(timestamp=2)], marker=6),
+    ]
+
+    async def get_updates(method: GetUpdates) -> UpdateList:
+        if responses:
+            return responses.pop(0)
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    async def feed(update: MaxoUpdate[MockUpdate], bot: Bot) -> None:
+        if update.update.timestamp == 1:
+            raise WorkerLost
+
+    mock_bot.state.api_client.call_method.side_effect = get_updates
+    process_pool = AsyncMock(spec=ProcessPool)
+    process_pool.feed.side_effect = feed
+    store = MemoryMarkerStore()
+    polling = LongPolling(Dispatcher(), marker_store=store, process_pool=process_pool)
+
+    task = asyncio.create_task(
+        polling.start(mock_bot, auto_close_bot=False, handle_signals=False),
+    )
+    await asyncio.sleep(0.05)
+    polling.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert process_pool.feed.await_count == 2
+    assert await store.get_marker(123) is None
+    assert polling.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_releases_slots_of_queued_updates(mock_bot: Bot) -> None:
+    responses = [
+        UpdateList(
+            updates=[MockUpdate(timestamp=timestamp) for timestamp in range(3)],
+            marker=5,
+        ),
+    ]
+
+    async def get_updates(method: GetUpdates) -> UpdateList:
+        if responses:
+            return responses.pop(0)
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    async def feed_max_update(update: MaxoUpdate[MockUpdate], bot: Bot) -> None:
+        await asyncio.Event().wait()
+
+    mock_bot.state.api_client.call_method.side_effect = get_updates
+    dispatcher = Dispatcher()
+    dispatcher.feed_max_update = AsyncMock(side_effect=feed_max_update)
+    polling = LongPolling(
+        dispatcher,
+        scheduler=ChatOrderedScheduler(workers=1),
+        max_in_flight=10,
+        drain_timeout=0.05,
+    )
+
+    task = asyncio.create_task(
+        polling.start(mock_bot, auto_close_bot=False, handle_signals=False),
+    )
+    await asyncio.sleep(0.05)
+    assert polling.in_flight == 3
+    polling.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert dispatcher.feed_max_update.await_count == 1
+    assert polling.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_marker_waits_for_whole_batch(mock_bot: Bot) -> None:
+    responses = [
+        UpdateList(
+            updates=[MockUpdate(timestamp=timestamp) for timestamp in range(3)],
+            marker=5,
+        ),
+    ]
+
+    async def get_updates(method: GetUpdates) -> UpdateList:
+        if responses:
+            return responses.pop(0)
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    async def feed_max_update(update: MaxoUpdate[MockUpdate], bot: Bot) -> None:
+        if update.update.timestamp == 1:
+            await asyncio.Event().wait()
+
+    mock_bot.state.api_client.call_method.side_effect = get_updates
+    dispatcher = Dispatcher()
+    dispatcher.feed_max_update = AsyncMock(side_effect=feed_max_update)
+    store = MemoryMarkerStore()
+    polling = LongPolling(
+        dispatcher,
+        max_in_flight=1,
+        marker_store=store,
+        drain_timeout=0.05,
+    )
+
+    task = asyncio.create_task(
+        polling.start(mock_bot, auto_close_bot=False, handle_signals=False),
+    )
+    await asyncio.sleep(0.05)
+    # Первый апдейт обработан, второй ещё обрабатывается, третий ждёт слота
+    assert dispatcher.feed_max_update.await_count == 2
+    assert await store.get_marker(123) is None
+
+    polling.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert await store.get_marker(123) is None
+    assert polling.in_flight == 0
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from maxo.transport.markers import FileMarkerStore, MarkerTracker, MemoryMarkerStore
+
+
+def test_tracker_commits_only_finished_prefix() -> None:
+    tracker = MarkerTracker()
+    tracker.track(10)
+    tracker.track(10)
+    tracker.track(20)
+
+    # Пачка 20 завершилась раньше пачки 10 - маркер сдвигать нельзя
+    assert tracker.complete(20) is None
+    assert tracker.committed is None
+
+    assert tracker.complete(10) is None
+    assert tracker.complete(10) == 20
+    assert tracker.committed == 20
+
+
+def test_tracker_commits_in_order() -> None:
+    tracker = MarkerTracker()
+    tracker.track(1)
+    tracker.track(2)
+
+    assert tracker.complete(1) == 1
+    assert tracker.complete(2) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_store() -> None:
+    store = MemoryMarkerStore()
+    assert await store.get_marker(1) is None
+
+    await store.set_marker(1, 42)
+    assert await store.get_marker(1) == 42
+    assert await store.get_marker(2) is None
+
+
+@pytest.mark.asyncio
+async def test_file_store_persists(tmp_path: Path) -> None:
+    path = tmp_path / "state" / "markers.json"
+
+    store = FileMarkerStore(path)
+    assert await store.get_marker(1) is None
+    await store.set_marker(1, 42)
+    await store.set_marker(2, 7)
+    await store.close()
+
+    assert json.loads(path.read_text()) == {"1": 42, "2": 7}
+    assert list(path.parent.iterdir()) == [path]
+
+    reopened = FileMarkerStore(path)
+    assert await reopened.get_marker(1) == 42
+    assert await reopened.get_marker(2) == 7
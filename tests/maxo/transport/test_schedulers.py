@@ -0,0 +1,289 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from maxo.enums import ChatType
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.transport.schedulers import (
+    ChatOrderedScheduler,
+    QueueScheduler,
+    TaskScheduler,
+    chat_key,
+)
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+def make_update(chat_id: int, seq: int = 1) -> MaxoUpdate[MessageCreated]:
+    return MaxoUpdate(
+        update=MessageCreated(
+            message=Message(
+                body=MessageBody(mid=f"{chat_id}:{seq}", seq=seq),
+                recipient=Recipient(chat_type=ChatType.CHAT, chat_id=chat_id),
+                timestamp=datetime.now(UTC),
+                sender=User(
+                    user_id=chat_id * 10,
+                    first_name="Test",
+                    is_bot=False,
+                    last_activity_time=datetime.now(UTC),
+                ),
+            ),
+            timestamp=datetime.now(UTC),
+        ),
+    )
+
+
+def test_chat_key() -> None:
+    assert chat_key(make_update(chat_id=42)) == 42
+
+
+@pytest.mark.asyncio
+async def test_task_scheduler_runs_all_jobs() -> None:
+    scheduler = TaskScheduler()
+    done: list[int] = []
+
+    async def job(i: int) -> None:
+        await asyncio.sleep(0)
+        done.append(i)
+
+    for i in range(5):
+        await scheduler.submit(make_update(chat_id=i), lambda i=i: job(i))
+
+    await scheduler.close()
+
+    assert sorted(done) == list(range(5))
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ordered_scheduler_keeps_chat_order() -> None:
+    scheduler = ChatOrderedScheduler(workers=4)
+    processed: dict[int, list[int]] = {1: [], 2: []}
+
+    async def job(chat_id: int, seq: int) -> None:
+        # Более ранние апдейты "обрабатываются" дольше
+        await asyncio.sleep(0.01 * (5 - seq))
+        processed[chat_id].append(seq)
+
+    for seq in range(5):
+        for chat_id in (1, 2):
+            await scheduler.submit(
+                make_update(chat_id=chat_id, seq=seq),
+                lambda c=chat_id, s=seq: job(c, s),
+            )
+
+    await scheduler.close()
+
+    assert processed == {1: [0, 1, 2, 3, 4], 2: [0, 1, 2, 3, 4]}
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ordered_scheduler_runs_chats_in_parallel() -> None:
+    scheduler = ChatOrderedScheduler(workers=2, key=lambda update: update.marker)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def slow() -> None:
+        started.set()
+        await release.wait()
+        order.append("slow")
+
+    async def fast() -> Any:
+        order.append("fast")
+        release.set()
+
+    await scheduler.submit(MaxoUpdate(update=make_update(1).update, marker=0), slow)
+    await started.wait()
+    await scheduler.submit(MaxoUpdate(update=make_update(2).update, marker=1), fast)
+
+    await asyncio.wait_for(scheduler.close(), timeout=1)
+
+    assert order == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_ordered_scheduler_survives_job_error() -> None:
+    scheduler = ChatOrderedScheduler(workers=1)
+    done: list[str] = []
+
+    async def failing() -> None:
+        raise ValueError("boom")
+
+    async def ok() -> None:
+        done.append("ok")
+
+    await scheduler.submit(make_update(chat_id=1), failing)
+    await scheduler.submit(make_update(chat_id=1), ok)
+    await scheduler.close()
+
+    assert done == ["ok"]
+
+
+async def submit_with_slow_job(scheduler: Any, done: list[int]) -> None:
+    async def job(seq: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        done.append(seq)
+
+    for seq, delay in enumerate((0, 10, 0)):
+        await scheduler.submit(
+            make_update(chat_id=1, seq=seq),
+            lambda s=seq, d=delay: job(s, d),
+        )
+
+
+@pytest.mark.asyncio
+async def test_task_scheduler_drain_cancels_after_timeout() -> None:
+    scheduler = TaskScheduler()
+    done: list[int] = []
+    await submit_with_slow_job(scheduler, done)
+
+    dropped = await scheduler.drain(timeout=0.05)
+
+    assert sorted(done) == [0, 2]
+    assert [update.update.message.body.seq for update in dropped] == [1]
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ordered_scheduler_drain_cancels_after_timeout() -> None:
+    scheduler = ChatOrderedScheduler(workers=1)
+    done: list[int] = []
+    await submit_with_slow_job(scheduler, done)
+
+    dropped = await scheduler.drain(timeout=0.05)
+
+    assert done == [0]
+    # Выполнявшийся апдейт и апдейт, до которого не дошла очередь
+    assert [update.update.message.body.seq for update in dropped] == [1, 2]
+    assert scheduler.pending == 0
+
+
+def test_ordered_scheduler_invalid_workers() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        ChatOrderedScheduler(workers=0)
+
+
+@pytest.mark.asyncio
+async def test_queue_scheduler_rejects_when_full() -> None:
+    scheduler = QueueScheduler(workers=1, max_size=1)
+    release = asyncio.Event()
+    done: list[int] = []
+
+    async def job(i: int) -> None:
+        await release.wait()
+        done.append(i)
+
+    assert await scheduler.try_submit(make_update(chat_id=1), lambda: job(0))
+    await asyncio.sleep(0)  # воркер забирает первый апдейт
+    assert await scheduler.try_submit(make_update(chat_id=2), lambda: job(1))
+    assert not await scheduler.try_submit(make_update(chat_id=3), lambda: job(2))
+
+    assert scheduler.depth == 1
+    assert scheduler.pending == 2
+    assert scheduler.rejected == 1
+
+    release.set()
+    await scheduler.close()
+
+    assert done == [0, 1]
+    assert scheduler.pending == 0
+    assert scheduler.max_wait_time >= scheduler.wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_queue_scheduler_drain_cancels_after_timeout() -> None:
+    scheduler = QueueScheduler(workers=1)
+    done: list[int] = []
+    await submit_with_slow_job(scheduler, done)
+
+    dropped = await scheduler.drain(timeout=0.05)
+
+    assert done == [0]
+    assert [update.update.message.body.seq for update in dropped] == [1, 2]
+    assert scheduler.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ordered_scheduler_try_submit_rejects_when_full() -> None:
+    scheduler = ChatOrderedScheduler(workers=1, queue_size=1)
+    release = asyncio.Event()
+
+    assert await scheduler.try_submit(make_update(chat_id=1), release.wait)
+    await asyncio.sleep(0)
+    assert await scheduler.try_submit(make_update(chat_id=1), release.wait)
+    assert not await scheduler.try_submit(make_update(chat_id=1), release.wait)
+    assert scheduler.pending == 2
+
+    release.set()
+    await scheduler.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "scheduler",
+    [ChatOrderedScheduler(workers=1), QueueScheduler(workers=1)],
+    ids=["ordered", "queue"],
+)
+async def test_drain_calls_on_drop_for_queued_jobs(scheduler: Any) -> None:
+    dropped_jobs: list[int] = []
+
+    for seq in range(3):
+        await scheduler.submit(
+            make_update(chat_id=1, seq=seq),
+            asyncio.Event().wait,
+            lambda s=seq: dropped_jobs.append(s),
+        )
+    await asyncio.sleep(0)
+
+    await scheduler.drain(timeout=0.01)
+
+    # Выполнявшаяся задача освобождает ресурсы сама
+    assert dropped_jobs == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_task_scheduler_calls_on_drop_for_unstarted_jobs() -> None:
+    scheduler = TaskScheduler()
+    dropped_jobs: list[int] = []
+
+    for seq in range(2):
+        await scheduler.submit(
+            make_update(chat_id=seq),
+            asyncio.Event().wait,
+            lambda s=seq: dropped_jobs.append(s),
+        )
+        if not seq:
+            await asyncio.sleep(0)
+
+    # Вторая задача отменяется до начала выполнения
+    for task in list(scheduler._tasks):
+        task.cancel()
+    await scheduler.drain()
+
+    assert dropped_jobs == [1]
+
+
+@pytest.mark.asyncio
+async def test_task_scheduler_logs_job_error() -> None:
+    scheduler = TaskScheduler()
+    error = ValueError("boom")
+
+    async def failing() -> None:
+        raise error
+
+    with patch("maxo.transport.schedulers.task.loggers.dispatcher") as mock_logger:
+        update = MaxoUpdate(update=make_update(chat_id=1).update, marker=7)
+        await scheduler.submit(update, failing)
+        await scheduler.close()
+
+    mock_logger.error.assert_called_once_with(
+        "Update processing failed. Update type=%r marker=%r",
+        "MessageCreated",
+        7,
+        exc_info=error,
+    )
@@ -0,0 +1,233 @@
+import asyncio
+import pickle
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from maxo import Dispatcher
+from maxo.enums import ChatType
+from maxo.routing.signals.update import MaxoUpdate
+from maxo.routing.updates.message_created import MessageCreated
+from maxo.transport.workers import ProcessPool, WorkerLost
+from maxo.transport.workers.worker import UPDATE_MESSAGE, _Worker
+from maxo.types import Message, MessageBody, Recipient, User
+
+
+def make_update(chat_id: int, seq: int = 1) -> MaxoUpdate[MessageCreated]:
+    return MaxoUpdate(
+        update=MessageCreated(
+            message=Message(
+                body=MessageBody(mid=f"{chat_id}:{seq}", seq=seq),
+                recipient=Recipient(chat_type=ChatType.CHAT, chat_id=chat_id),
+                timestamp=datetime.now(UTC),
+                sender=User(
+                    user_id=chat_id * 10,
+                    first_name="Test",
+                    is_bot=False,
+                    last_activity_time=datetime.now(UTC),
+                ),
+            ),
+            timestamp=datetime.now(UTC),
+        ),
+        marker=seq,
+    )
+
+
+def test_same_chat_same_worker() -> None:
+    pool = ProcessPool(Dispatcher, workers=4)
+
+    shards = {pool.shard(make_update(chat_id=7, seq=seq)) for seq in range(10)}
+
+    assert len(shards) == 1
+
+
+def test_chats_spread_over_workers() -> None:
+    pool = ProcessPool(Dispatcher, workers=4)
+
+    shards = {pool.shard(make_update(chat_id=chat_id)) for chat_id in range(16)}
+
+    assert shards == {0, 1, 2, 3}
+
+
+def test_update_is_picklable() -> None:
+    update = make_update(chat_id=1, seq=3)
+
+    restored = pickle.loads(pickle.dumps(update))  # noqa: S301
+
+    assert restored.marker == 3
+    assert restored.update.message.body.mid == "1:3"
+    assert restored.update.message.recipient.chat_id == 1
+
+
+@pytest.mark.asyncio
+async def test_feed_requires_start() -> None:
+    pool = ProcessPool(Dispatcher, workers=1)
+
+    with pytest.raises(RuntimeError):
+        await pool.feed(make_update(chat_id=1), bot=None)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": -1}, {"max_pending": 0}])
+def test_invalid_arguments(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError, match="should be greater than 0"):
+        ProcessPool(Dispatcher, **kwargs)
+
+
+class FakeQueue(list[Any]):
+    def put(self, item: Any) -> None:
+        self.append(item)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeProcess:
+    pid = 1
+    exitcode = 0
+
+    def join(self, timeout: float | None = None) -> None:
+        pass
+
+    def is_alive(self) -> bool:
+        return False
+
+
+class FakeBot:
+    token = "token"  # noqa: S105
+    defaults = None
+
+
+def fake_pool(monkeypatch: pytest.MonkeyPatch) -> ProcessPool:
+    pool = ProcessPool(Dispatcher, workers=1, max_pending=1)
+
+    def spawn(handle: Any) -> None:
+        handle.inbox = FakeQueue()
+        handle.bots = set()
+        handle.process = FakeProcess()
+        handle.accepting.set()
+
+    monkeypatch.setattr(pool, "_spawn", spawn)
+    pool._spawn(pool._handles[0])
+    pool._running = True
+    return pool
+
+
+def fed_seqs(inbox: list[Any]) -> list[Any]:
+    return [
+        item[1] if item else item
+        for item in inbox
+        if item is None or item[0] == UPDATE_MESSAGE
+    ]
+
+
+@pytest.mark.asyncio
+async def test_restart_while_feed_waits_for_slot(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool = fake_pool(monkeypatch)
+    handle = pool._handles[0]
+    old_inbox = handle.inbox
+
+    first = asyncio.create_task(pool.feed(make_update(chat_id=1), FakeBot()))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    second = asyncio.create_task(pool.feed(make_update(chat_id=1), FakeBot()))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    restart = asyncio.create_task(pool.restart())
+    await asyncio.sleep(0)
+
+    # Первый апдейт обработан, место освобождается во время остановки
+    pool._complete(0, 0)
+    await asyncio.wait_for(restart, timeout=1)
+    await first
+    await asyncio.sleep(0)
+
+    assert fed_seqs(old_inbox) == [0, None]
+    assert fed_seqs(handle.inbox) == [1]
+    assert not second.done()
+
+    pool._complete(0, 1)
+    await asyncio.wait_for(second, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_lost_updates_fail_feed(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = fake_pool(monkeypatch)
+
+    feed = asyncio.create_task(pool.feed(make_update(chat_id=1), FakeBot()))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    pool._drop_pending(pool._handles[0])
+
+    with pytest.raises(WorkerLost):
+        await feed
+
+
+def test_adding_worker_moves_few_chats() -> None:
+    pool = ProcessPool(Dispatcher, workers=4)
+    bigger_pool = ProcessPool(Dispatcher, workers=5)
+
+    moved = [
+        chat_id
+        for chat_id in range(1000)
+        if pool.shard(make_update(chat_id)) != bigger_pool.shard(make_update(chat_id))
+    ]
+
+    # Переезжают только чаты нового процесса, примерно пятая часть
+    assert 100 < len(moved) < 300
+    assert {bigger_pool.shard(make_update(chat_id)) for chat_id in moved} == {4}
+
+
+@pytest.mark.asyncio
+async def test_unprocessed_update_fails_feed(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = fake_pool(monkeypatch)
+
+    feed = asyncio.create_task(pool.feed(make_update(chat_id=1), FakeBot()))  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    pool._complete(0, 0, processed=False)
+
+    with pytest.raises(WorkerLost):
+        await feed
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_update_without_bot() -> None:
+    results = FakeQueue()
+    worker = _Worker(
+        index=0,
+        dispatcher=Dispatcher(),
+        inbox=FakeQueue(),  # type: ignore[arg-type]
+        results=results,  # type: ignore[arg-type]
+        concurrency=1,
+    )
+
+    await worker._process_update(7, "token", make_update(chat_id=1))
+
+    assert results == [(0, 7, False)]
+
+
+@pytest.mark.asyncio
+async def test_stop_timeout_is_shared(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = fake_pool(monkeypatch)
+    pool._stop_timeout = 0.05
+    handle = pool._handles[0]
+    joins: list[float | None] = []
+
+    class StuckProcess(FakeProcess):
+        def join(self, timeout: float | None = None) -> None:
+            joins.append(timeout)
+
+        def is_alive(self) -> bool:
+            return not joins or joins[-1] is not None
+
+        def terminate(self) -> None:
+            pass
+
+    handle.process = StuckProcess()
+    handle.pending[0] = asyncio.get_running_loop().create_future()
+
+    await pool._stop(handle)
+
+    # Ожидание апдейтов уже заняло почти весь `stop_timeout`
+    assert joins[0] is not None
+    assert joins[0] < 0.01
+    assert joins[1] is None
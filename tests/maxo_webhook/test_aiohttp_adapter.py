@@ -1,8 +1,11 @@
+from json import JSONDecodeError
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from aiohttp import web
 
+from maxo.errors import PayloadTooLargeError
 from maxo.transport.webhook.adapters.aiohttp.adapter import (
     AiohttpBoundRequest,
     AiohttpWebAdapter,
@@ -36,3 +39,64 @@ async def test_adapter(aiohttp_client, aiohttp_app):
     request = engine.call_args.args[0]
     assert isinstance(request, AiohttpBoundRequest)
     assert await request.json() == {"foo": "bar"}
+
+
+def make_bound_request(
+    body: bytes,
+    content_length: int | None,
+    content_type: str = "application/json",
+) -> AiohttpBoundRequest:
+    request = MagicMock()
+    request.content_length = content_length
+    request.content_type = content_type
+    request.read = AsyncMock(return_value=body)
+    return AiohttpBoundRequest(request)
+
+
+@pytest.mark.asyncio
+async def test_json_uses_custom_loads():
+    loads = MagicMock(return_value={"foo": "bar"})
+    request = make_bound_request(b'{"foo": "bar"}', content_length=14)
+
+    assert await request.json(loads=loads) == {"foo": "bar"}
+    loads.assert_called_once_with(b'{"foo": "bar"}')
+
+
+@pytest.mark.asyncio
+async def test_json_wraps_loader_errors():
+    def loads(_: bytes) -> Any:
+        raise ValueError("invalid")
+
+    request = make_bound_request(b"{", content_length=1)
+
+    with pytest.raises(JSONDecodeError):
+        await request.json(loads=loads)
+
+
+@pytest.mark.asyncio
+async def test_read_rejects_large_body():
+    request = make_bound_request(b"{}", content_length=100)
+
+    with pytest.raises(PayloadTooLargeError):
+        await request.read(max_size=10)
+    request.request.read.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_rejects_non_json_content_type():
+    request = make_bound_request(b"{}", content_length=2, content_type="text/plain")
+
+    with pytest.raises(JSONDecodeError):
+        await request.read()
+    request.request.read.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_accepts_json_suffix_content_type():
+    request = make_bound_request(
+        b"{}",
+        content_length=2,
+        content_type="application/vnd.api+json",
+    )
+
+    assert await request.read() == b"{}"
@@ -0,0 +1,139 @@
+import json
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from maxo.errors import PayloadTooLargeError
+from maxo.transport.webhook.adapters.asgi import (
+    AsgiApp,
+    AsgiBoundRequest,
+    AsgiRequest,
+    AsgiResponse,
+    AsgiWebAdapter,
+)
+
+
+def make_scope(
+    path: str = "/webhook",
+    method: str = "POST",
+    headers: list[tuple[bytes, bytes]] | None = None,
+    query_string: bytes = b"",
+) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": headers or [],
+        "query_string": query_string,
+        "client": ("127.0.0.1", 12345),
+    }
+
+
+def make_receive(*chunks: bytes) -> Any:
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0)
+
+    return receive
+
+
+async def call(app: AsgiApp, scope: dict[str, Any], *chunks: bytes) -> Any:
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app(scope, make_receive(*chunks), send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.mark.asyncio
+async def test_register_and_handle():
+    adapter = AsgiWebAdapter()
+    app = AsgiApp()
+    seen: list[AsgiBoundRequest] = []
+
+    async def handler(request: AsgiBoundRequest) -> AsgiResponse:
+        seen.append(request)
+        assert await request.json() == {"foo": "bar"}
+        return adapter.create_json_response(status=200, payload={})
+
+    adapter.register(app, "/webhook/{bot_token}", handler)
+
+    scope = make_scope(
+        path="/webhook/abc",
+        headers=[(b"X-Secret", b"s")],
+        query_string=b"a=1&a=2",
+    )
+    assert await call(app, scope, b'{"foo":', b' "bar"}') == (200, {})
+
+    request = seen[0]
+    assert request.path_params == {"bot_token": "abc"}
+    assert request.headers.get("x-secret") == "s"
+    assert request.query_params.getlist("a") == ["1", "2"]
+    assert request.client_ip == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_not_found_and_method_not_allowed():
+    app = AsgiApp()
+    AsgiWebAdapter().register(app, "/webhook", AsyncMock())
+
+    assert (await call(app, make_scope(path="/other"), b""))[0] == 404
+    assert (await call(app, make_scope(method="GET"), b""))[0] == 405
+
+
+@pytest.mark.asyncio
+async def test_read_rejects_large_body():
+    request = AsgiBoundRequest(
+        AsgiRequest(make_scope(), make_receive(b"12345", b"67890"), {}),
+    )
+
+    with pytest.raises(PayloadTooLargeError):
+        await request.read(max_size=8)
+
+
+def test_static_responses_are_reused():
+    adapter = AsgiWebAdapter()
+
+    first = adapter.create_json_response(status=403, payload={"detail": "Forbidden"})
+    second = adapter.create_json_response(status=403, payload={"detail": "Forbidden"})
+
+    assert first is second
+    assert first.status == 403
+    assert json.loads(first.body) == {"detail": "Forbidden"}
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_callbacks():
+    app = AsgiApp()
+    on_startup, on_shutdown = AsyncMock(), AsyncMock()
+    AsgiWebAdapter().register(
+        app,
+        "/webhook",
+        AsyncMock(),
+        on_startup=on_startup,
+        on_shutdown=on_shutdown,
+    )
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await app({"type": "lifespan"}, receive, send)
+
+    on_startup.assert_awaited_once_with(app)
+    on_shutdown.assert_awaited_once_with(app)
+    assert [message["type"] for message in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
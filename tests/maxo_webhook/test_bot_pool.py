@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from maxo import Bot
+from maxo.transport.webhook.bot_pool import BotPool
+
+
+@pytest.fixture
+def bot_start():
+    async def start() -> None:
+        await asyncio.sleep(0)
+
+    with (
+        patch.object(Bot, "start", AsyncMock(side_effect=start)) as start_mock,
+        patch.object(Bot, "close", AsyncMock()),
+    ):
+        yield start_mock
+
+
+@pytest.mark.asyncio
+async def test_bot_is_started_once(bot_start: AsyncMock) -> None:
+    pool = BotPool()
+
+    first, second = await asyncio.gather(
+        pool.acquire(pool.create("42:A")),
+        pool.acquire(pool.create("42:A")),
+    )
+
+    assert first is second
+    assert pool.get("42:A") is first
+    bot_start.assert_awaited_once()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_bots_share_resources(bot_start: AsyncMock) -> None:
+    pool = BotPool()
+
+    first = pool.create("42:A")
+    second = pool.create("42:B")
+
+    assert first.retort is second.retort
+    assert first._connector is second._connector
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_waits_for_release(bot_start: AsyncMock) -> None:
+    pool = BotPool(max_size=1)
+
+    first = await pool.acquire(pool.create("42:A"))
+    second = await pool.acquire(pool.create("42:B"))
+    await asyncio.sleep(0)
+
+    assert "42:A" not in pool
+    assert "42:B" in pool
+    # Первый бот ещё обрабатывает апдейт
+    first.close.assert_not_awaited()
+
+    pool.release(first)
+    await asyncio.sleep(0)
+    first.close.assert_awaited()
+
+    pool.release(second)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_bots_are_evicted(bot_start: AsyncMock) -> None:
+    pool = BotPool(idle_timeout=0)
+
+    bot = await pool.acquire(pool.create("42:A"))
+    pool.release(bot)
+    await pool.acquire(pool.create("42:B"))
+
+    assert "42:A" not in pool
+    assert len(pool) == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_bots_are_evicted_without_traffic(bot_start: AsyncMock) -> None:
+    pool = BotPool(idle_timeout=0.01)
+
+    bot = await pool.acquire(pool.create("42:A"))
+    pool.release(bot)
+    assert "42:A" in pool
+
+    await asyncio.sleep(0.05)
+
+    assert len(pool) == 0
+    bot.close.assert_awaited()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_start(bot_start: AsyncMock) -> None:
+    pool = BotPool()
+    bot_start.side_effect = ValueError("invalid token")
+
+    assert await pool.acquire(pool.create("42:A")) is None
+    assert len(pool) == 0
+    await pool.close()
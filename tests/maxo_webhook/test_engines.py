@@ -1,8 +1,11 @@
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from maxo.bot.bot import Bot
+from maxo.errors import PayloadTooLargeError
 from maxo.routing.dispatcher import Dispatcher
 from maxo.routing.signals import (
     AfterShutdown,
@@ -10,8 +13,17 @@ from maxo.routing.signals import (
     BeforeShutdown,
     BeforeStartup,
 )
+from maxo.routing.updates import Updates
+from maxo.transport.webhook.adapters.base_adapter import RawBodyBoundRequest
 from maxo.transport.webhook.engines.simple import SimpleEngine
 
+from .fixtures import DummyBoundRequest
+
+
+class JsonOnlyBoundRequest(DummyBoundRequest):
+    async def json(self) -> dict[str, Any]:
+        return {"update_type": "bot_started", "timestamp": 1}
+
 
 class TestSimpleEngine:
     @pytest.fixture
@@ -109,3 +121,119 @@ class TestSimpleEngine:
             dispatcher.feed_signal.await_args_list[1].args[0],
             AfterShutdown,
         )
+
+    @pytest.mark.asyncio
+    async def test_on_shutdown_drains_updates_before_closing_bot(
+        self,
+        engine: SimpleEngine,
+        dispatcher: Dispatcher,
+        bot: MagicMock,
+        web_adapter: MagicMock,
+    ):
+        dispatcher.feed_signal = AsyncMock()
+        bot.close = AsyncMock()
+        closed_before_job: list[bool] = []
+
+        async def job() -> None:
+            await asyncio.sleep(0.01)
+            closed_before_job.append(bot.close.await_count > 0)
+
+        await engine.scheduler.submit(MagicMock(), job)
+        await engine.on_shutdown(app=MagicMock())
+
+        assert closed_before_job == [False]
+        bot.close.assert_awaited_once()
+
+        await engine.handle_request(MagicMock())
+        web_adapter.create_json_response.assert_called_once_with(
+            status=503,
+            payload={"detail": "Shutting down"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_overflow_status_when_scheduler_is_full(
+        self,
+        dispatcher: Dispatcher,
+        bot: MagicMock,
+        web_adapter: MagicMock,
+        routing: MagicMock,
+    ):
+        scheduler = MagicMock()
+        scheduler.try_submit = AsyncMock(return_value=False)
+        engine = SimpleEngine(
+            dispatcher,
+            bot,
+            web_adapter=web_adapter,
+            routing=routing,
+            scheduler=scheduler,
+            overflow_status=429,
+        )
+        bound_request = MagicMock()
+        bound_request.json = AsyncMock(
+            return_value={"update_type": "bot_started", "timestamp": 1},
+        )
+
+        await engine.handle_request(bound_request)
+
+        scheduler.try_submit.assert_awaited_once()
+        web_adapter.create_json_response.assert_called_once_with(
+            status=429,
+            payload={"detail": "Too many requests"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_payload_too_large(
+        self,
+        dispatcher: Dispatcher,
+        bot: MagicMock,
+        web_adapter: MagicMock,
+        routing: MagicMock,
+    ):
+        engine = SimpleEngine(
+            dispatcher,
+            bot,
+            web_adapter=web_adapter,
+            routing=routing,
+            max_body_size=10,
+        )
+        bound_request = MagicMock(spec=RawBodyBoundRequest)
+        bound_request.read = AsyncMock(
+            side_effect=PayloadTooLargeError(size=100, max_size=10),
+        )
+
+        await engine.handle_request(bound_request)
+
+        bound_request.read.assert_awaited_once_with(10)
+        bot.retort.load.assert_not_called()
+        web_adapter.create_json_response.assert_called_once_with(
+            status=413,
+            payload={"detail": "Payload too large"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_json_only_bound_request(
+        self,
+        dispatcher: Dispatcher,
+        bot: MagicMock,
+        web_adapter: MagicMock,
+        routing: MagicMock,
+    ):
+        dispatcher.feed_max_update = AsyncMock(return_value=None)
+        engine = SimpleEngine(
+            dispatcher,
+            bot,
+            web_adapter=web_adapter,
+            routing=routing,
+            handle_in_background=False,
+        )
+
+        await engine.handle_request(JsonOnlyBoundRequest())
+
+        bot.retort.load.assert_called_once_with(
+            {"update_type": "bot_started", "timestamp": 1},
+            Updates,
+        )
+        web_adapter.create_json_response.assert_called_once_with(
+            status=200,
+            payload={},
+        )